@@ -4,6 +4,7 @@ Proxies to the unified database configuration in the project root.
 """
 import sys
 from pathlib import Path
+from typing import AsyncIterator, Iterator
 
 # Ensure project root is in sys.path so we can import from root
 root_dir = Path(__file__).resolve().parent.parent
@@ -11,7 +12,8 @@ if str(root_dir) not in sys.path:
     sys.path.insert(0, str(root_dir))
 
 # Import the unified database configuration and type
-from database import get_db_session, db, StandaloneSession
+from database import get_db_session, db_manager, session_factory, StandaloneSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as SessionType
 
 # Ensure all models are registered in the SQLAlchemy metadata for relationships
@@ -21,5 +23,20 @@ import model.entity
 # It will now correctly fall back to StandaloneSession when outside Flask context
 
 
+def get_request_db_session() -> Iterator[SessionType]:
+    """FastAPI dependency: a Session for the request, closed when the request ends.
 
+    Unlike the thread-scoped StandaloneSession, the session (and its identity
+    map) never outlives the request and is never shared across threads.
+    """
+    session: SessionType = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
 
+
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: an AsyncSession for the request, closed when the request ends."""
+    async with db_manager.async_session_factory() as session:
+        yield session
@@ -1,11 +1,38 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
+
+from routes import stream_types, radio_sources, health, search, metrics
+from database import db_manager
+from api.services.readiness_service import readiness
+from service.metrics_service import metrics_store
+
+
+async def warm_up() -> None:
+    """Open the first database connection and build the catalog caches (on their own threads)."""
+    try:
+        async with db_manager.async_session_factory() as session:
+            await session.execute(text("SELECT 1"))
+        # NumPy is imported off the event loop (the catalog index module loads it)
+        await asyncio.to_thread(readiness.warm_up)
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup runs before the server binds its port: only start the warm-up here, never wait for it.
+    # /api/v1/ready answers 503 until the caches are built.
+    task = asyncio.create_task(warm_up())
+    yield
+    task.cancel()
 
-from routes import stream_types, radio_sources, health
 
 # create FastAPI app
-app = FastAPI(title="RadioChWeb API", version="0.1.0", 
+app = FastAPI(title="RadioChWeb API", version="0.1.0", lifespan=lifespan,
               openapi_tags=[ {"name": "sources", "description": "Radio sources read-only API"}, 
                              {"name": "health", "description": "Health check and diagnostics"},])
 
@@ -19,9 +46,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# outermost, so CORS preflights are timed too; exposed at /metrics
+metrics_store.app_name = "api"
+app.add_middleware(metrics.MetricsMiddleware)
 
 # register router
 app.include_router(stream_types.router, prefix="/api/v1/stream_types") 
 app.include_router(radio_sources.router, prefix="/api/v1/sources") 
+app.include_router(search.router, prefix="/api/v1")
 app.include_router(health.router, prefix="/api/v1")
+app.include_router(metrics.router)
 
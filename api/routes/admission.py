@@ -0,0 +1,27 @@
+"""
+Admission control for API routes that spawn ffprobe (see service.admission_control_service).
+
+Rejections are raised as HTTPException so they cost no database or probe
+work: 429 when the client is over its rate, 503 when the process already
+runs its cap of probe requests, both with Retry-After.
+"""
+from fastapi import HTTPException, Request
+
+from service.admission_control_service import Admission, probe_admission
+
+
+def client_key(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+
+def admit_probe(request: Request, cost: int = 1) -> Admission:
+    """
+    Admit a probe-backed request or fail fast; use the result as a context manager to release it.
+
+    `cost` streams may be probed: the request holds up to that many in-flight slots
+    and must not run more probes at once than the admission's `slots`.
+    """
+    admission = probe_admission.try_acquire(client_key(request), cost, probes=cost)
+    if not admission.admitted:
+        raise HTTPException(status_code=admission.status_code, detail=admission.message, headers=admission.headers)
+    return admission
@@ -0,0 +1,124 @@
+"""
+Conditional GET helpers for catalog endpoints.
+
+ETags are derived from the catalog version (bumped by every radio source
+write) plus whatever selects the representation (path, query string), so a
+client revalidation is answered with `304 Not Modified` after a single
+scalar query, without loading any ORM objects.
+
+Catalog list and export bodies also negotiate their format from `Accept`:
+JSON by default, MessagePack or CBOR when the client asks for them.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+from api.services import binary_format_service
+from api.services.binary_format_service import CBOR, MEDIA_TYPES, MSGPACK
+
+# Clients may reuse a response for a minute, then must revalidate with If-None-Match
+CATALOG_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
+def catalog_etag(version: int, *parts: object) -> str:
+    """Strong ETag for a representation of catalog version `version`."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+    return f'"v{version}-{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match matches `etag` (weak comparison, as RFC 9110 requires)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag)
+    return response
+
+
+# Accept media ranges per format; JSON also takes the wildcards
+_FORMAT_MEDIA_RANGES = {
+    "json": ("application/json", "application/*", "*/*"),
+    MSGPACK: ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack"),
+    CBOR: ("application/cbor",),
+}
+
+
+def _q_value(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate_format(request: Request) -> str:
+    """
+    "json", "msgpack" or "cbor" from the Accept header.
+
+    A binary format is chosen only when named explicitly with a q-value at
+    least as high as JSON's; anything else (no header, wildcards, browsers)
+    gets JSON.
+    """
+    quality = {fmt: 0.0 for fmt in _FORMAT_MEDIA_RANGES}
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, _, params = media_range.strip().partition(";")
+        media_type = media_type.strip().lower()
+        for fmt, ranges in _FORMAT_MEDIA_RANGES.items():
+            if media_type in ranges:
+                quality[fmt] = max(quality[fmt], _q_value(params))
+    best = max((MSGPACK, CBOR), key=lambda fmt: quality[fmt])
+    return best if quality[best] > 0 and quality[best] >= quality["json"] else "json"
+
+
+def format_etag(version: int, fmt: str, *parts: object) -> str:
+    """`catalog_etag` of the `fmt` representation (JSON keeps the plain catalog ETag)."""
+    return catalog_etag(version, *parts) if fmt == "json" else catalog_etag(version, fmt, *parts)
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def json_bytes_response(request: Request, body: bytes, gzip_body: bytes, etag: str, fmt: str = "json") -> Response:
+    """Serve a pre-serialized body (JSON or `fmt`), choosing the pre-compressed variant when the client accepts gzip."""
+    compressed = accepts_gzip(request)
+    return encoded_response(gzip_body if compressed else body, compressed, etag, fmt)
+
+
+def encoded_response(content: bytes, compressed: bool, etag: str, fmt: str = "json") -> Response:
+    """Serve a pre-serialized body (JSON or `fmt`), gzip-compressed when `compressed`."""
+    response = Response(content=content, media_type=MEDIA_TYPES[fmt])
+    if compressed:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept, Accept-Encoding"
+    set_cache_headers(response, etag)
+    return response
+
+
+def binary_response(fmt: str, document: Any, etag: str) -> Response:
+    """Encode a JSON-compatible document (e.g. `model.model_dump(mode="json")`) as MessagePack or CBOR."""
+    response = Response(content=binary_format_service.encode(fmt, document), media_type=MEDIA_TYPES[fmt])
+    response.headers["Vary"] = "Accept"
+    set_cache_headers(response, etag)
+    return response
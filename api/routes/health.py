@@ -1,7 +1,27 @@
-from fastapi import APIRouter 
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from deps import get_async_db_session
+from api.schemas.health import ReadinessOut
+from api.services.readiness_service import ReadinessService, readiness
 
 router = APIRouter()
 
+
+def get_readiness_service() -> ReadinessService:
+    return readiness
+
+
 @router.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadinessOut, responses={503: {"model": ReadinessOut}})
+async def ready(response: Response, session: AsyncSession = Depends(get_async_db_session),
+                service: ReadinessService = Depends(get_readiness_service)) -> ReadinessOut:
+    """Whether this worker should receive traffic: 503 while warming its caches, saturated or without database"""
+    report = await service.check_async(session)
+    response.status_code = 200 if report.ready else 503
+    response.headers["Cache-Control"] = "no-store"
+    return report
@@ -0,0 +1,50 @@
+"""
+Request metrics for the API (see service.metrics_service) and the Prometheus `/metrics` endpoint.
+
+MetricsMiddleware is plain ASGI so streamed responses are timed until their
+last chunk. Requests are labelled by path template (`/api/v1/sources/{source_id}`),
+rebuilt from the matched path parameters after routing, so label cardinality
+stays bounded; unmatched paths share one label.
+"""
+from fastapi import APIRouter, Response
+
+from service.metrics_service import PROMETHEUS_CONTENT_TYPE, metrics_store, request_finished, request_started
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus text exposition of the API metrics, summed over every worker."""
+    return Response(metrics_store.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def route_label(scope) -> str:
+    if "route" not in scope:
+        return "<unmatched>"
+    names = {str(value): "{" + name + "}" for name, value in scope.get("path_params", {}).items()}
+    return "/".join(names.get(segment, segment) for segment in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics_scope = request_started()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_finished(metrics_scope, scope["method"], route_label(scope), status)
@@ -1,44 +1,245 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional, Union
 
-from api.schemas.radio_source import RadioSourceListenMetadata, RadioSourceOut, RadioSourceList
-from api.services.radio_source_api_service import RadioSourceAPIService
-from api.schemas.stream_metadata import StreamMetadataOut
+from deps import get_async_db_session, get_request_db_session
+from api.routes.admission import admit_probe
+from api.routes.caching import (accepts_gzip, binary_response, catalog_etag, encoded_response, format_etag,
+                                is_not_modified, json_bytes_response, negotiate_format, not_modified,
+                                set_cache_headers)
+from api.schemas.radio_source import (RadioSourceBatchIn, RadioSourceBatchOut, RadioSourceChangeList,
+                                      RadioSourceListenMetadata, RadioSourceOut, RadioSourceList,
+                                      RadioSourceFacets, RadioSourceSuggestion, RadioSourceSuggestList)
+from api.services.radio_source_api_service import RadioSourceAPIService, parse_fields
+from api.services.binary_format_service import MEDIA_TYPES
+from api.services.catalog_snapshot_service import catalog_snapshot
+from api.services.facet_cache_service import facet_cache
+from api.services.suggest_index_service import suggest_index
+from api.schemas.stream_metadata import StreamMetadataBatchOut, StreamMetadataOut
+from api.schemas.track_history import TrackHistoryList
 
-service = RadioSourceAPIService()
 # Router has no prefix here; `main.py` includes this router with prefix (`/api/v1/sources`).
 router = APIRouter(tags=["sources"])
 
-@router.get("/", response_model=RadioSourceList)
-def list_sources(q: Optional[str] = Query(None), stream_type: Optional[int] = Query(None), 
-                 country: Optional[str] = Query(None), page: int = 1, page_size: int = 20) -> RadioSourceList:
-    """List radio sources with optional filters"""
+# Upper bound on ids accepted by batch endpoints
+MAX_BATCH_IDS = 100
 
-    # Phase 1: read all sources wihothout filtering/pagination
-    all_sources: RadioSourceList = service.get_all_radio_sources()
-    print(f"Total sources before filtering: {len(all_sources.items)}")
-    return all_sources
+
+def get_radio_source_api_service(session: Session = Depends(get_request_db_session)) -> RadioSourceAPIService:
+    """Per-request service bound to the request's Session (sync routes)."""
+    return RadioSourceAPIService(session)
+
+
+async def get_catalog_api_service() -> RadioSourceAPIService:
+    """Per-request service for the async routes, which pass their AsyncSession to every call."""
+    return RadioSourceAPIService()
+
+
+def parse_ids(ids: str) -> list[int]:
+    """Parse a comma separated id list, keeping request order and dropping duplicates."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of integers")
+    return check_ids(parsed)
+
+
+def check_ids(ids: list[int]) -> list[int]:
+    """Drop duplicate ids (keeping request order) and enforce the batch size limits."""
+    parsed = list(dict.fromkeys(ids))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="at least one id is required")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH_IDS} ids per request")
+    return parsed
+
+@router.get("/", response_model=Union[RadioSourceList, RadioSourceBatchOut])
+async def list_sources(request: Request, response: Response, q: Optional[str] = Query(None), stream_type: Optional[int] = Query(None), 
+                 country: Optional[str] = Query(None), page: int = Query(1, ge=1),
+                 page_size: int = Query(20, ge=1, le=100),
+                 sort: str = Query("name", description="name, created_at or id; prefix with '-' for descending"),
+                 cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                 fields: Optional[str] = Query(None, description="comma separated fields to return, e.g. id,name,stream_url,stream_type.display_name"),
+                 ids: Optional[str] = Query(None, description=f"comma separated source ids (at most {MAX_BATCH_IDS}); returns a batch lookup, other parameters are ignored"),
+                 session: AsyncSession = Depends(get_async_db_session),
+                 service: RadioSourceAPIService = Depends(get_catalog_api_service)) -> RadioSourceList | RadioSourceBatchOut | Response:
+    """List radio sources with optional filters, or look up many sources by id (JSON, MessagePack or CBOR per Accept)"""
+    fmt = negotiate_format(request)
+    if ids is None and fields is None and q is None and stream_type is None and country is None and cursor is None and sort == "name":
+        # unfiltered catalog in default order: served from the pre-serialized snapshot
+        snapshot = await catalog_snapshot.get_async(session)
+        etag = format_etag(snapshot.version, fmt, "sources", request.url.query)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        compressed = accepts_gzip(request)
+        return encoded_response(snapshot.page(page, page_size, fmt, compressed), compressed, etag, fmt)
+
+    etag = format_etag(await service.get_catalog_version_async(session), fmt, "sources", request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    response.headers["Vary"] = "Accept"
+    result: RadioSourceList | RadioSourceBatchOut
+    try:
+        if ids is not None:
+            result = await service.get_radio_sources_async(session, parse_ids(ids))
+        elif fields is not None:
+            # sparse fieldset: selected columns only, serialized without the response model
+            body = await service.list_source_fields_async(session, parse_fields(fields), q=q, stream_type=stream_type,
+                                                          country=country, page=page, page_size=page_size,
+                                                          sort=sort, cursor=cursor, fmt=fmt)
+            sparse = Response(content=body, media_type=MEDIA_TYPES[fmt], headers={"Vary": "Accept"})
+            set_cache_headers(sparse, etag)
+            return sparse
+        else:
+            result = await service.list_sources_async(session, q=q, stream_type=stream_type, country=country,
+                                                      page=page, page_size=page_size, sort=sort, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt != "json":
+        return binary_response(fmt, result.model_dump(mode="json"), etag)
+    return result
+
+@router.post("/batch", response_model=RadioSourceBatchOut)
+async def get_radio_sources_batch(batch: RadioSourceBatchIn, session: AsyncSession = Depends(get_async_db_session),
+                                  service: RadioSourceAPIService = Depends(get_catalog_api_service)) -> RadioSourceBatchOut:
+    """Look up many sources by id in one query; items follow the request order, null for unknown ids"""
+    return await service.get_radio_sources_async(session, check_ids(batch.ids))
+
+@router.get("/metadata", response_model=StreamMetadataBatchOut)
+def get_stream_metadata_batch(request: Request, ids: str = Query(..., description="comma separated source ids"),
+                              timeout: int = Query(10, ge=1, le=30),
+                              service: RadioSourceAPIService = Depends(get_radio_source_api_service)) -> StreamMetadataBatchOut:
+    """Resolve live metadata of many sources in parallel; `timeout` is the deadline for the whole batch"""
+    source_ids = parse_ids(ids)
+    with admit_probe(request, cost=len(source_ids)) as admission:
+        return service.get_stream_metadata_many(source_ids, timeout, cached_only=admission.brownout,
+                                                max_parallel=admission.slots)
+
+@router.get("/facets", response_model=RadioSourceFacets)
+async def get_facets(request: Request, response: Response, q: Optional[str] = Query(None),
+                     stream_type: Optional[int] = Query(None), country: Optional[str] = Query(None),
+                     session: AsyncSession = Depends(get_async_db_session)) -> RadioSourceFacets | Response:
+    """Counts per stream type, country, security, codec and bitrate bucket for the sources matching the filters"""
+    version, facets = await facet_cache.get_async(session, q, stream_type, country)
+    # the bitrate counts change without a catalog write: the ETag covers the counts themselves
+    etag = catalog_etag(version, "facets", request.url.query, facets.model_dump_json())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    return facets
+
+@router.get("/suggest", response_model=RadioSourceSuggestList)
+async def suggest_sources(prefix: str = Query(..., min_length=1, max_length=100),
+                          limit: int = Query(10, ge=1, le=50),
+                          session: AsyncSession = Depends(get_async_db_session)) -> RadioSourceSuggestList:
+    """Type-ahead suggestions: stations whose name, or a word of it, starts with `prefix`"""
+    try:
+        suggestions = await suggest_index.suggest_async(session, prefix, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    items = [RadioSourceSuggestion(id=source_id, name=name) for source_id, name in suggestions]
+    return RadioSourceSuggestList(prefix=prefix, items=items)
+
+@router.get("/export.json", response_model=RadioSourceList)
+async def export_catalog(request: Request, session: AsyncSession = Depends(get_async_db_session)):
+    """Whole catalog in one document, served from the pre-serialized snapshot"""
+    snapshot = await catalog_snapshot.get_async(session)
+    etag = catalog_etag(snapshot.version, "export")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    body, gzip_body = snapshot.export()
+    return json_bytes_response(request, body, gzip_body, etag)
+
+@router.get("/export", response_model=RadioSourceList)
+async def export_catalog_negotiated(request: Request, session: AsyncSession = Depends(get_async_db_session)):
+    """Whole catalog in one document as JSON, MessagePack or CBOR per Accept (pre-encoded per catalog version)"""
+    snapshot = await catalog_snapshot.get_async(session)
+    fmt = negotiate_format(request)
+    etag = format_etag(snapshot.version, fmt, "export")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    body, gzip_body = snapshot.export(fmt)
+    return json_bytes_response(request, body, gzip_body, etag, fmt)
+
+@router.get("/export.ndjson")
+async def export_catalog_ndjson(request: Request, session: AsyncSession = Depends(get_async_db_session),
+                                service: RadioSourceAPIService = Depends(get_catalog_api_service)):
+    """Whole catalog as newline-delimited JSON (one source per line), streamed with constant memory"""
+    etag = catalog_etag(await service.get_catalog_version_async(session), "export.ndjson")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response = StreamingResponse(service.export_ndjson_async(), media_type="application/x-ndjson")
+    set_cache_headers(response, etag)
+    return response
+
+@router.get("/changes", response_model=RadioSourceChangeList)
+async def list_changes(request: Request, response: Response,
+                       since: int = Query(0, ge=0, description="catalog version of the last sync (`version` of the previous page)"),
+                       limit: int = Query(500, ge=1, le=1000),
+                       session: AsyncSession = Depends(get_async_db_session),
+                       service: RadioSourceAPIService = Depends(get_catalog_api_service)) -> RadioSourceChangeList | Response:
+    """Sources upserted or deleted after catalog version `since`, oldest first"""
+    etag = catalog_etag(await service.get_catalog_version_async(session), "changes", since, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    return await service.get_changes_async(session, since, limit)
 
 @router.get("/{source_id}", response_model=RadioSourceOut)
-def get_radio_source(source_id: int):
+async def get_radio_source(source_id: int, request: Request, response: Response,
+                           session: AsyncSession = Depends(get_async_db_session),
+                           service: RadioSourceAPIService = Depends(get_catalog_api_service)):
     """List single radio source"""
+    version = await service.get_catalog_version_async(session)
+    etag = catalog_etag(version, "source", source_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    snapshot = catalog_snapshot.current
+    if snapshot is not None and snapshot.version == version:
+        # the snapshot is up to date: serve the pre-serialized source without querying it
+        body = snapshot.source(source_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="radio source not found")
+        cached = Response(content=body, media_type="application/json")
+        set_cache_headers(cached, etag)
+        return cached
+    set_cache_headers(response, etag)
     # raise 404 if not found
-    radio_source: RadioSourceOut = service.get_radio_source(source_id)
+    radio_source: RadioSourceOut | None = await service.get_radio_source_async(session, source_id)
     if not radio_source:
         raise HTTPException(status_code=404, detail="radio source not found")
     return radio_source
 
 
 @router.get("/{source_id}/listen")
-def listen_source(source_id: int):
+async def listen_source(source_id: int, session: AsyncSession = Depends(get_async_db_session),
+                        service: RadioSourceAPIService = Depends(get_catalog_api_service)):
     """Return minimal metadata for the client to open stream"""
-    listen_metadata: RadioSourceListenMetadata | None = service.get_listen_metadata(source_id)
+    listen_metadata: RadioSourceListenMetadata | None = await service.get_listen_metadata_async(session, source_id)
     if not listen_metadata:
         raise HTTPException(status_code=404, detail="radio source not found")
     return listen_metadata  
 
 
 @router.get("/{source_id}/metadata", response_model=StreamMetadataOut)
-def get_stream_metadata_from_source(source_id: int, timeout: int = Query(10, ge=5, le=30)) -> StreamMetadataOut:
-    metadata = service.get_stream_metadata(source_id, timeout)
+def get_stream_metadata_from_source(request: Request, source_id: int, timeout: int = Query(10, ge=5, le=30),
+                                    service: RadioSourceAPIService = Depends(get_radio_source_api_service)) -> StreamMetadataOut:
+    """Live stream metadata; under load (brownout) only cached values are returned"""
+    with admit_probe(request) as admission:
+        metadata = service.get_stream_metadata(source_id, timeout, cached_only=admission.brownout)
     return StreamMetadataOut.model_validate(metadata.model_dump())
+
+
+@router.get("/{source_id}/history", response_model=TrackHistoryList)
+def get_track_history(source_id: int, since: Optional[datetime] = Query(None),
+                      limit: int = Query(100, ge=1, le=500),
+                      service: RadioSourceAPIService = Depends(get_radio_source_api_service)) -> TrackHistoryList:
+    """Return the tracks played on a radio source after `since`, oldest first"""
+    history: TrackHistoryList | None = service.get_track_history(source_id, since, limit)
+    if history is None:
+        raise HTTPException(status_code=404, detail="radio source not found")
+    return history
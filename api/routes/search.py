@@ -1,29 +1,26 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from deps import get_db_session
-from api.services.radio_source_service import list_sources
-from schemas.radio_source import RadioSourceList
+from deps import get_async_db_session
+from api.routes.radio_sources import get_catalog_api_service
+from api.schemas.radio_source import RadioSourceList
+from api.services.radio_source_api_service import RadioSourceAPIService
 
-router = APIRouter()
+# Router has no prefix here; `main.py` includes this router with prefix (`/api/v1`).
+router = APIRouter(tags=["sources"])
 
 
 @router.get("/search", response_model=RadioSourceList)
-def search(q: str, db: Session = Depends(get_db_session)):
-    items, total = list_sources(db, q=q, page=1, page_size=20)
-    return {
-        "items": items,
-        "total": total,
-        "page": 1,
-        "page_size": 20,
-    }
+async def search(q: str = Query(..., min_length=1, description="words to find in name, description, country or genre"),
+                 page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=100),
+                 session: AsyncSession = Depends(get_async_db_session),
+                 service: RadioSourceAPIService = Depends(get_catalog_api_service)) -> RadioSourceList:
+    """Full-text search over the catalog, best match first"""
+    return await service.search_sources_async(session, q, page=page, page_size=page_size)
+
+
 @router.get("/latest", response_model=RadioSourceList)
-def latest(db: Session = Depends(get_db_session)):
-    items = list_sources(db, page=1, page_size=10)[0]
-    total = len(items)
-    return {
-        "items": items,
-        "total": total,
-        "page": 1,
-        "page_size": 10,
-    }   
\ No newline at end of file
+async def latest(session: AsyncSession = Depends(get_async_db_session),
+                 service: RadioSourceAPIService = Depends(get_catalog_api_service)) -> RadioSourceList:
+    """The ten most recently added radio sources"""
+    return await service.list_sources_async(session, sort="-created_at", page_size=10)
@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from deps import get_async_db_session
+from api.routes.caching import catalog_etag, is_not_modified, not_modified, set_cache_headers
 from api.services.stream_type_api_service import StreamTypeAPIService
 from api.schemas.stream_type import StreamTypeList, StreamTypeOut
 
@@ -7,16 +11,32 @@ from api.schemas.stream_type import StreamTypeList, StreamTypeOut
 # the desired prefix (`/api/v1/stream_types`). Avoid duplicating
 # the prefix to prevent double-routing and 404s.
 router = APIRouter(tags=["stream_types"])
-service = StreamTypeAPIService()
 
-@router.get("")
-@router.get("/")
-def get_stream_types() -> StreamTypeList:
-    return service.get_all_stream_types()
+
+async def get_stream_type_api_service() -> StreamTypeAPIService:
+    """Per-request service for the async routes, which pass their AsyncSession to every call."""
+    return StreamTypeAPIService()
+
+@router.get("", response_model=StreamTypeList)
+@router.get("/", response_model=StreamTypeList)
+async def get_stream_types(request: Request, response: Response,
+                           session: AsyncSession = Depends(get_async_db_session),
+                           service: StreamTypeAPIService = Depends(get_stream_type_api_service)) -> StreamTypeList | Response:
+    etag = catalog_etag(await service.get_catalog_version_async(session), "stream_types")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    return await service.get_all_stream_types_async(session)
 
 @router.get("/{stream_type_id}", response_model=StreamTypeOut)
-def get_stream_type(stream_type_id: int) -> StreamTypeOut:
-    stream_type: StreamTypeOut | None = service.get_stream_type(stream_type_id)
+async def get_stream_type(stream_type_id: int, request: Request, response: Response,
+                          session: AsyncSession = Depends(get_async_db_session),
+                          service: StreamTypeAPIService = Depends(get_stream_type_api_service)) -> StreamTypeOut | Response:
+    etag = catalog_etag(await service.get_catalog_version_async(session), "stream_type", stream_type_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    stream_type: StreamTypeOut | None = await service.get_stream_type_async(session, stream_type_id)
     if not stream_type:
         raise HTTPException(status_code=404, detail="Stream type not found")
     return stream_type
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class DatabaseCheck(BaseModel):
+    """Round trip of a trivial query on the request's connection."""
+    ok: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ProbeCheck(BaseModel):
+    """Probe binaries and the admission controller's load (see Load shedding)."""
+    ffprobe: bool
+    ffmpeg: bool
+    in_flight: int
+    max_in_flight: int
+    brownout: bool
+
+
+class CacheCheck(BaseModel):
+    """Warm state of the in-process caches; versions are the catalog versions they were built from."""
+    catalog_snapshot_version: Optional[int] = None
+    suggest_index_version: Optional[int] = None
+    facets_version: Optional[int] = None
+    catalog_index_version: Optional[int] = None
+    warm: bool
+
+
+ReadinessStatus = Literal["ready", "degraded", "warming", "saturated", "unavailable"]
+
+
+class ReadinessOut(BaseModel):
+    """Readiness of this worker; served with 503 unless `ready`."""
+    status: ReadinessStatus
+    ready: bool
+    catalog_version: Optional[int] = None
+    database: DatabaseCheck
+    probes: ProbeCheck
+    caches: CacheCheck
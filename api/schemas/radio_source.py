@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 
 from schemas.stream_type import StreamTypeOut
@@ -27,8 +27,18 @@ class RadioSourceList(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
     model_config = ConfigDict(from_attributes=True) 
 
+class RadioSourceBatchIn(BaseModel):
+    """Schema for a bulk lookup request."""
+    ids: List[int]
+
+class RadioSourceBatchOut(BaseModel):
+    """Schema for a bulk lookup: one item per requested id, in request order, null when not found."""
+    items: List[Optional[RadioSourceOut]]
+    missing: List[int] = []
+
 class RadioSourceListenMetadata(BaseModel):
     """Schema for Radiosource listen metadata entity."""
     id: int
@@ -37,3 +47,45 @@ class RadioSourceListenMetadata(BaseModel):
     website_url: Optional[str] = None
     name: str
     model_config = ConfigDict(from_attributes=True)
+
+class RadioSourceSuggestion(BaseModel):
+    """Schema for a type-ahead suggestion."""
+    id: int
+    name: str
+
+class RadioSourceSuggestList(BaseModel):
+    """Schema for type-ahead suggestions of a prefix."""
+    prefix: str
+    items: List[RadioSourceSuggestion]
+
+ChangeOp = Literal["upsert", "delete"]
+
+class RadioSourceChangeOut(BaseModel):
+    """Schema for one change feed entry: the current source for an upsert, no source for a delete."""
+    version: int
+    op: ChangeOp
+    id: int
+    source: Optional[RadioSourceOut] = None
+
+class RadioSourceChangeList(BaseModel):
+    """Schema for a page of the change feed; pass `version` as the next `since`."""
+    since: int
+    version: int
+    reset: bool = False
+    has_more: bool = False
+    changes: List[RadioSourceChangeOut]
+
+class FacetCount(BaseModel):
+    """Schema for the number of sources sharing one facet value."""
+    value: Union[bool, int, str, None]
+    label: Optional[str] = None
+    count: int
+
+class RadioSourceFacets(BaseModel):
+    """Schema for facet counts of the sources matching a filter set."""
+    total: int
+    stream_type: List[FacetCount]
+    country: List[FacetCount]
+    is_secure: List[FacetCount]
+    codec: List[FacetCount]
+    bitrate: List[FacetCount]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 
 
@@ -7,5 +7,20 @@ class StreamMetadataOut(BaseModel):
     bitrate: Optional[int] = None
     genre: Optional[str] = None
     current_track: Optional[str] = None
+    format: Optional[str] = None
+    listeners: Optional[int] = None
     error_message: Optional[str] = None
     model_config = ConfigDict(from_attributes=True) 
+
+
+class SourceStreamMetadataOut(StreamMetadataOut):
+    """Stream metadata of one radio source in a batch response."""
+    source_id: int
+
+
+class StreamMetadataBatchOut(BaseModel):
+    """Batch metadata response: resolved items plus ids not found or not resolved in time."""
+    items: List[SourceStreamMetadataOut]
+    missing: List[int] = []
+    pending: List[int] = []
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+
+
+class TrackHistoryOut(BaseModel):
+    """Schema for a now-playing history entry."""
+    title: str
+    played_at: datetime
+    genre: Optional[str] = None
+    bitrate: Optional[int] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class TrackHistoryList(BaseModel):
+    """Schema for the now-playing history of a radio source."""
+    source_id: int
+    items: List[TrackHistoryOut]
+    total: int
+    model_config = ConfigDict(from_attributes=True)
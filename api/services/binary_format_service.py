@@ -0,0 +1,136 @@
+"""
+BinaryFormatService - MessagePack and CBOR encodings of catalog responses.
+
+Small receivers parse JSON slowly; both formats carry the same documents
+(the JSON data model: null, booleans, integers, floats, strings, arrays
+and string-keyed maps) in fewer bytes and without text parsing. Only the
+encoders are needed server side, and they are small enough not to pull in
+msgpack/cbor2.
+
+Arrays are written as a header followed by their encoded elements, so a
+list body can be assembled from per-source fragments encoded once per
+catalog version, the same way the JSON snapshot is.
+"""
+
+import struct
+from typing import Any, Callable, Dict, List, Optional
+
+MSGPACK = "msgpack"
+CBOR = "cbor"
+BINARY_FORMATS = (MSGPACK, CBOR)
+
+MEDIA_TYPES = {"json": "application/json", MSGPACK: "application/msgpack", CBOR: "application/cbor"}
+
+
+def _msgpack_int(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return bytes((value,))
+    if -32 <= value < 0:
+        return struct.pack(">b", value)
+    if value >= 0:
+        for marker, fmt, limit in ((0xcc, ">B", 1 << 8), (0xcd, ">H", 1 << 16), (0xce, ">I", 1 << 32), (0xcf, ">Q", 1 << 64)):
+            if value < limit:
+                return bytes((marker,)) + struct.pack(fmt, value)
+    else:
+        for marker, fmt, limit in ((0xd0, ">b", 1 << 7), (0xd1, ">h", 1 << 15), (0xd2, ">i", 1 << 31), (0xd3, ">q", 1 << 63)):
+            if value >= -limit:
+                return bytes((marker,)) + struct.pack(fmt, value)
+    raise OverflowError(f"integer out of MessagePack range: {value}")
+
+
+def _msgpack_sized(length: int, fix_marker: int, fix_limit: int, markers: tuple) -> bytes:
+    """Header of a str/array/map of `length` entries: fix form, then 8/16/32-bit length forms."""
+    if length < fix_limit:
+        return bytes((fix_marker | length,))
+    for marker, fmt, limit in zip(markers, (">B", ">H", ">I"), (1 << 8, 1 << 16, 1 << 32)):
+        if marker is not None and length < limit:
+            return bytes((marker,)) + struct.pack(fmt, length)
+    raise OverflowError(f"length out of MessagePack range: {length}")
+
+
+def msgpack_array_header(length: int) -> bytes:
+    return _msgpack_sized(length, 0x90, 16, (None, 0xdc, 0xdd))
+
+
+def msgpack_map_header(length: int) -> bytes:
+    return _msgpack_sized(length, 0x80, 16, (None, 0xde, 0xdf))
+
+
+def encode_msgpack(value: Any) -> bytes:
+    if value is None:
+        return b"\xc0"
+    if value is True:
+        return b"\xc3"
+    if value is False:
+        return b"\xc2"
+    if isinstance(value, int):
+        return _msgpack_int(value)
+    if isinstance(value, float):
+        return b"\xcb" + struct.pack(">d", value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _msgpack_sized(len(data), 0xa0, 32, (0xd9, 0xda, 0xdb)) + data
+    if isinstance(value, (list, tuple)):
+        return msgpack_array_header(len(value)) + b"".join(encode_msgpack(item) for item in value)
+    if isinstance(value, dict):
+        return msgpack_map_header(len(value)) + b"".join(
+            encode_msgpack(key) + encode_msgpack(item) for key, item in value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def _cbor_head(major: int, argument: int) -> bytes:
+    if argument < 24:
+        return bytes((major << 5 | argument,))
+    for info, fmt, limit in ((24, ">B", 1 << 8), (25, ">H", 1 << 16), (26, ">I", 1 << 32), (27, ">Q", 1 << 64)):
+        if argument < limit:
+            return bytes((major << 5 | info,)) + struct.pack(fmt, argument)
+    raise OverflowError(f"integer out of CBOR range: {argument}")
+
+
+def cbor_array_header(length: int) -> bytes:
+    return _cbor_head(4, length)
+
+
+def cbor_map_header(length: int) -> bytes:
+    return _cbor_head(5, length)
+
+
+def encode_cbor(value: Any) -> bytes:
+    if value is None:
+        return b"\xf6"
+    if value is True:
+        return b"\xf5"
+    if value is False:
+        return b"\xf4"
+    if isinstance(value, int):
+        return _cbor_head(0, value) if value >= 0 else _cbor_head(1, -1 - value)
+    if isinstance(value, float):
+        return b"\xfb" + struct.pack(">d", value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _cbor_head(3, len(data)) + data
+    if isinstance(value, (list, tuple)):
+        return cbor_array_header(len(value)) + b"".join(encode_cbor(item) for item in value)
+    if isinstance(value, dict):
+        return cbor_map_header(len(value)) + b"".join(
+            encode_cbor(key) + encode_cbor(item) for key, item in value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not CBOR serializable")
+
+
+_ENCODERS: Dict[str, Callable[[Any], bytes]] = {MSGPACK: encode_msgpack, CBOR: encode_cbor}
+_ARRAY_HEADERS: Dict[str, Callable[[int], bytes]] = {MSGPACK: msgpack_array_header, CBOR: cbor_array_header}
+_MAP_HEADERS: Dict[str, Callable[[int], bytes]] = {MSGPACK: msgpack_map_header, CBOR: cbor_map_header}
+
+
+def encode(fmt: str, value: Any) -> bytes:
+    """Encode a JSON-compatible value (e.g. `model_dump(mode="json")`) as `fmt`."""
+    return _ENCODERS[fmt](value)
+
+
+def list_body(fmt: str, fragments: List[bytes], total: int, page: int, page_size: int,
+              next_cursor: Optional[str]) -> bytes:
+    """RadioSourceList-shaped document around items already encoded as `fmt`."""
+    enc = _ENCODERS[fmt]
+    return (_MAP_HEADERS[fmt](5) + enc("items") + _ARRAY_HEADERS[fmt](len(fragments)) + b"".join(fragments)
+            + enc("total") + enc(total) + enc("page") + enc(page) + enc("page_size") + enc(page_size)
+            + enc("next_cursor") + enc(next_cursor))
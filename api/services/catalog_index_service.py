@@ -0,0 +1,354 @@
+"""
+CatalogIndexService - In-process columnar index of the catalog for filtered listings.
+
+`/api/v1/sources` with filters, another order or a cursor used to run a
+filtered, ordered, paginated query plus a COUNT per request. The columns
+those queries touch are small, so they are kept in NumPy arrays, one entry
+per source: id, name and country (both dictionary-encoded), stream type,
+is_secure, latest bitrate and created_at. Names are coded by their position
+in the sorted list of distinct names, so the name order is an integer sort
+and `q` is matched once per distinct name. The sort orders are computed
+once per catalog version.
+
+A listing is then a boolean mask over the rows, gathered in the precomputed
+order, with the keyset cursor found by binary search; the database only
+loads the sources of the page by primary key. When the catalog version
+changes, the rows upserted or deleted since the index's version are read
+from the change feed and applied, unless the feed was compacted past it or
+too many rows changed, in which case the index is rebuilt. Concurrent
+callers wait for that one update instead of each running their own.
+
+Filters follow `RadioSourceRepository.filter_criteria`: `q` is a
+case-insensitive (ASCII, like SQLite's LIKE) substring of the name. A `q`
+holding the LIKE wildcards `%` or `_` is left to SQL.
+"""
+
+import logging
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import session_factory as default_session_factory
+from model.entity.catalog_change import CHANGE_UPSERT
+from model.repository.catalog_change_repository import CatalogChangeRepository
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
+from model.repository.radio_source_repository import SORTABLE_COLUMNS, RadioSourceRepository
+
+logger = logging.getLogger(__name__)
+
+# Above this share of changed sources a rebuild is cheaper than applying the changes
+FULL_REBUILD_RATIO = 0.2
+
+# created_at of rows without one: first in ascending order, like NULL in SQLite
+_NO_DATE = np.datetime64("0001-01-01T00:00:00", "us")
+
+COLUMNS = ("ids", "name_codes", "stream_type_ids", "country_codes", "is_secure", "bitrates", "created_at")
+
+# (id, name, stream_type_id, country, is_secure, created_at, bitrate), see RadioSourceRepository.find_index_rows
+IndexRow = Tuple[Any, ...]
+
+
+def lower_names(names: List[str]) -> np.ndarray:
+    """`names` as UTF-8 bytes with ASCII letters lowercased (like SQLite's LIKE)."""
+    return np.strings.lower(np.strings.encode(np.array(names, dtype=np.str_), "utf-8"))
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite keeps created_at without its time zone; compare the stored wall-clock values
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo is not None else value
+
+
+class CatalogIndex:
+    """Immutable columnar index of the catalog at one catalog version."""
+
+    def __init__(self, version: int, columns: Dict[str, np.ndarray], names: List[str], names_lower: np.ndarray,
+                 countries: List[str]):
+        self.version = version
+        self.ids: np.ndarray = columns["ids"]
+        # dictionary encoding: code = position in the sorted list of distinct names
+        self.name_codes: np.ndarray = columns["name_codes"]
+        self.names = names
+        # the names as UTF-8 with ASCII letters lowercased, for the `q` match
+        self._names_lower = names_lower
+        self.stream_type_ids: np.ndarray = columns["stream_type_ids"]
+        # dictionary encoding: code = position in self.countries, -1 for no country
+        self.country_codes: np.ndarray = columns["country_codes"]
+        self.countries = countries
+        self._country_codes = {country: code for code, country in enumerate(countries)}
+        self.is_secure: np.ndarray = columns["is_secure"]
+        self.bitrates: np.ndarray = columns["bitrates"]
+        self.created_at: np.ndarray = columns["created_at"]
+        self.total = len(self.ids)
+        # per sort column: rows in ascending (value, id) order and the values in that order;
+        # the id order doubles as the id -> row map
+        self._orders: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for sort_name, values in (("name", self.name_codes), ("created_at", self.created_at), ("id", self.ids)):
+            order = np.lexsort((self.ids, values))
+            self._orders[sort_name] = order
+            self._sorted[sort_name] = values[order]
+
+    @classmethod
+    def from_rows(cls, version: int, rows: Sequence[IndexRow]) -> "CatalogIndex":
+        """Index of every row of the catalog."""
+        names = sorted({row[1] for row in rows})
+        countries: List[str] = []
+        columns = cls._columns(rows, names, countries)
+        return cls(version, columns, names, lower_names(names), countries)
+
+    @staticmethod
+    def _columns(rows: Sequence[IndexRow], names: List[str], countries: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Column arrays of `rows`; `names` (sorted) holds every name of `rows`.
+
+        Countries missing from `countries` are appended to it.
+        """
+        ids, row_names, stream_types, row_countries, secure, created, bitrates = zip(*rows) if rows else ([],) * 7
+        country_codes = {country: code for code, country in enumerate(countries)}
+        for country in row_countries:
+            if country and country not in country_codes:
+                country_codes[country] = len(countries)
+                countries.append(country)
+        return {
+            "ids": np.array(ids, dtype=np.int64),
+            "name_codes": np.array([bisect_left(names, name) for name in row_names], dtype=np.int32),
+            "stream_type_ids": np.array(stream_types, dtype=np.int64),
+            "country_codes": np.array([country_codes.get(country, -1) for country in row_countries], dtype=np.int32),
+            "is_secure": np.array(secure, dtype=bool),
+            "bitrates": np.array([-1 if bitrate is None else bitrate for bitrate in bitrates], dtype=np.int64),
+            "created_at": np.array([_naive(value) or _NO_DATE for value in created], dtype="datetime64[us]"),
+        }
+
+    def with_changes(self, version: int, upserted: Sequence[IndexRow], deleted_ids: Sequence[int]) -> "CatalogIndex":
+        """
+        Index at `version`: this one with `upserted` rows replaced or added and `deleted_ids` dropped.
+
+        The arrays are filtered and extended, not rebuilt from rows; names no
+        longer used keep their entry until the next full build.
+        """
+        replaced = np.array([row[0] for row in upserted] + list(deleted_ids), dtype=np.int64)
+        keep = ~np.isin(self.ids, replaced)
+        columns = {name: getattr(self, name)[keep] for name in COLUMNS}
+
+        names, names_lower = self.names, self._names_lower
+        new_names = sorted({row[1] for row in upserted if not self._has_name(row[1])})
+        if new_names:
+            # every new name shifts the codes of the names sorted after it
+            slots = np.array([bisect_left(self.names, name) for name in new_names], dtype=np.int64)
+            shift = np.cumsum(np.bincount(slots, minlength=len(self.names) + 1))[:len(self.names)]
+            columns["name_codes"] = (np.arange(len(self.names)) + shift).astype(np.int32)[columns["name_codes"]]
+            new_lower = lower_names(new_names)
+            width = max(names_lower.dtype.itemsize, new_lower.dtype.itemsize)
+            names_lower = np.insert(names_lower.astype(f"S{width}"), slots, new_lower)
+            names = list(self.names)
+            for name in reversed(new_names):
+                names.insert(bisect_left(names, name), name)
+
+        countries = list(self.countries)
+        added = self._columns(upserted, names, countries)
+        columns = {name: np.concatenate((columns[name], added[name])) for name in COLUMNS}
+        return CatalogIndex(version, columns, names, names_lower, countries)
+
+    def _has_name(self, name: str) -> bool:
+        code = bisect_left(self.names, name)
+        return code < len(self.names) and self.names[code] == name
+
+    def row_of(self, source_id: int) -> Optional[int]:
+        sorted_ids = self._sorted["id"]
+        position = int(np.searchsorted(sorted_ids, source_id))
+        if position < self.total and sorted_ids[position] == source_id:
+            return int(self._orders["id"][position])
+        return None
+
+    def supports(self, q: Optional[str]) -> bool:
+        return not q or ("%" not in q and "_" not in q)
+
+    def mask(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+             country: Optional[str] = None) -> np.ndarray:
+        """Rows matching the catalog filters."""
+        mask = np.ones(self.total, dtype=bool)
+        if q:
+            # matched once per distinct name, then spread to the rows through the name codes
+            matches = np.strings.find(self._names_lower, q.encode("utf-8").lower()) >= 0
+            mask &= matches[self.name_codes]
+        if stream_type_id is not None:
+            mask &= self.stream_type_ids == stream_type_id
+        if country:
+            code = self._country_codes.get(country)
+            if code is None:
+                return np.zeros(self.total, dtype=bool)
+            mask &= self.country_codes == code
+        return mask
+
+    def find_page(self, q: Optional[str] = None, stream_type_id: Optional[int] = None, country: Optional[str] = None,
+                  sort: str = "name", limit: int = 20, cursor: Optional[str] = None,
+                  offset: int = 0) -> Tuple[List[int], int, Optional[str]]:
+        """
+        `RadioSourceRepository.find_page` over the index.
+
+        Returns:
+            (ids of the page in order, total matching the filters, cursor of the next page or None)
+
+        Raises:
+            ValueError: if `sort` or `cursor` is invalid
+        """
+        descending = sort.startswith("-")
+        sort_name = sort.lstrip("-")
+        if sort_name not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort field: {sort_name}")
+
+        order = self._orders[sort_name]
+        mask = self.mask(q, stream_type_id, country)
+        total = int(np.count_nonzero(mask))
+        # positions, in the ascending order, of the matching rows
+        positions = np.flatnonzero(mask[order])
+        if cursor:
+            bound = self._cursor_position(sort_name, cursor, after=not descending)
+            split = np.searchsorted(positions, bound)
+            positions = positions[:split] if descending else positions[split:]
+            offset = 0
+        if descending:
+            positions = positions[::-1]
+
+        page_rows = order[positions[offset:offset + limit]]
+        ids = [int(source_id) for source_id in self.ids[page_rows]]
+        next_cursor = None
+        if len(positions) > offset + limit and len(page_rows):
+            last = page_rows[-1]
+            next_cursor = RadioSourceRepository.encode_cursor_value(self._cursor_value(sort_name, last), ids[-1])
+        return ids, total, next_cursor
+
+    def _cursor_value(self, sort_name: str, row: int) -> Any:
+        if sort_name == "name":
+            return self.names[self.name_codes[row]]
+        if sort_name == "created_at":
+            value = self.created_at[row]
+            return None if value == _NO_DATE else value.astype(datetime)
+        return int(self.ids[row])
+
+    def _cursor_position(self, sort_name: str, cursor: str, after: bool) -> int:
+        """Position in the ascending order of the first row after (or, with `after` False, at) the cursor key."""
+        value, last_id = RadioSourceRepository.decode_cursor(cursor, sort_name)
+        side: Literal["left", "right"] = "right" if after else "left"
+        sorted_values = self._sorted[sort_name]
+        if sort_name == "id":
+            return int(np.searchsorted(sorted_values, last_id, side=side))
+        if sort_name == "name":
+            code = bisect_left(self.names, value)
+            if not self._has_name(value):
+                # the name is gone: the cursor falls between the names around it
+                return int(np.searchsorted(sorted_values, code, side="left"))
+            value = code
+        else:
+            value = np.datetime64(_naive(value), "us") if value is not None else _NO_DATE
+        start = int(np.searchsorted(sorted_values, value, side="left"))
+        end = int(np.searchsorted(sorted_values, value, side="right"))
+        # equal values are ordered by id
+        order = self._orders[sort_name]
+        return start + int(np.searchsorted(self.ids[order[start:end]], last_id, side=side))
+
+
+class CatalogIndexService:
+    """Keeps the CatalogIndex in step with the catalog version."""
+
+    def __init__(self, session_factory: Callable[[], Session] = default_session_factory):
+        self.session_factory = session_factory
+        self.index: Optional[CatalogIndex] = None
+        self._lock = threading.Lock()
+        # held while an index is built, so concurrent callers wait for one build instead of each running their own
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-index")
+
+    @property
+    def version(self) -> Optional[int]:
+        index = self.index
+        return index.version if index is not None else None
+
+    def get(self, session: Optional[Session] = None) -> CatalogIndex:
+        """Index at the current catalog version, applying the changes since the previous one."""
+        own_session = session is None
+        session = session or self.session_factory()
+        try:
+            version = CatalogVersionRepository(session).get_version()
+            index = self.index
+            if index is not None and index.version == version:
+                return index
+            with self._build_lock:
+                # another caller may have caught up while this one waited
+                index = self.index
+                if index is not None and index.version >= version:
+                    return index
+                return self._swap(self._build(session, index, version))
+        finally:
+            if own_session:
+                session.close()
+
+    async def get_async(self, session: AsyncSession) -> CatalogIndex:
+        """
+        `get` for async routes: the version check runs on the request's AsyncSession.
+
+        A cold or outdated index is brought up to date on the threadpool before answering,
+        one build at a time: the listing, its total and its ETag then describe the same version.
+        """
+        index = self.index
+        if index is not None and await AsyncCatalogVersionRepository(session).get_version() == index.version:
+            return index
+        return await run_in_threadpool(self.get)
+
+    def schedule_refresh(self) -> None:
+        """Refresh on the background thread unless a refresh is already running (e.g. to warm the index)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._executor.submit(self._refresh_in_background)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.get()
+        except Exception:
+            logger.exception("Catalog index refresh failed")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _build(self, session: Session, index: Optional[CatalogIndex], version: int) -> CatalogIndex:
+        """Index at `version`: `index` with the changes since its version applied, or a full build."""
+        repo = RadioSourceRepository(session)
+        if index is None or CatalogVersionRepository(session).get_compacted_version() > index.version:
+            return CatalogIndex.from_rows(version, repo.find_index_rows())
+        changes = CatalogChangeRepository(session).find_since(index.version, self._max_changes(index) + 1)
+        if len(changes) > self._max_changes(index):
+            return CatalogIndex.from_rows(version, repo.find_index_rows())
+        upsert_ids = [change.radio_source_id for change in changes if change.op == CHANGE_UPSERT]
+        rows = repo.find_index_rows(upsert_ids) if upsert_ids else []
+        return self._changed(index, version, changes, rows)
+
+    @staticmethod
+    def _max_changes(index: CatalogIndex) -> int:
+        return max(1, int(FULL_REBUILD_RATIO * index.total))
+
+    @staticmethod
+    def _changed(index: CatalogIndex, version: int, changes: List[Any], rows: List[IndexRow]) -> CatalogIndex:
+        found = {row[0] for row in rows}
+        # an upserted source missing from `rows` was deleted in the meantime
+        deleted = [change.radio_source_id for change in changes if change.radio_source_id not in found]
+        return index.with_changes(version, rows, deleted)
+
+    def _swap(self, index: CatalogIndex) -> CatalogIndex:
+        with self._lock:
+            if self.index is None or index.version >= self.index.version:
+                self.index = index
+            return self.index
+
+
+# Shared by every request in this process
+catalog_index = CatalogIndexService()
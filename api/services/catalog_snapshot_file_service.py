@@ -0,0 +1,192 @@
+"""
+CatalogSnapshotFileService - Catalog snapshot shared by the workers of one host.
+
+With several uvicorn workers each one would build and keep its own copy of
+the catalog snapshot. Instead, the snapshot is written once per catalog
+version to `CATALOG_SNAPSHOT_DIR/catalog.snapshot` and every worker memory-maps
+it read-only: the pages live once in the OS page cache, and serving a page,
+the export or a single source reads the map without touching SQLite.
+
+File layout (little endian):
+
+    header       magic, catalog version, row count, section offsets
+    exports      per format: offset/length of the export body and its gzip
+    records      per row (default order): id, then offset/length of the
+                 JSON, MessagePack and CBOR encodings and the cursor
+    id index     (id, row) sorted by id
+    strings      every encoded body and string, referenced by the above
+
+The file is written to a temporary name and renamed over the previous one
+(then the directory is synced, so the rename survives a crash): a worker
+always maps a complete file, and maps of the previous file stay
+valid until the worker drops them. Only one worker rebuilds at a time (an
+exclusive lock on `catalog.lock`); the others map its result.
+"""
+
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Iterator, List, Optional, Tuple
+
+from api.services.catalog_snapshot_service import CatalogSnapshot
+
+SNAPSHOT_FILE_NAME = "catalog.snapshot"
+LOCK_FILE_NAME = "catalog.lock"
+
+MAGIC = b"RCWCAT02"
+FORMATS = ("json", "msgpack", "cbor")
+
+# magic, version, rows, records/id index/strings offsets
+_HEADER = struct.Struct("<8sqI3Q")
+# per format: body offset, body length, gzip offset, gzip length
+_EXPORT = struct.Struct("<QQQQ")
+# id, then (offset, length) of the three encodings and the cursor
+_RECORD = struct.Struct("<q" + "QI" * (len(FORMATS) + 1))
+_ID_ENTRY = struct.Struct("<qI")
+
+_CURSOR_FIELD = len(FORMATS)
+
+
+def write_snapshot_file(path: str, snapshot: CatalogSnapshot) -> None:
+    """Write `snapshot` (with ids and all formats) to `path`, atomically replacing the previous file."""
+    strings = bytearray()
+
+    def add(data: bytes) -> Tuple[int, int]:
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    exports = b""
+    for fmt in FORMATS:
+        body, gzip_body = snapshot.export(fmt)
+        exports += _EXPORT.pack(*add(body), *add(gzip_body))
+
+    encoded = [snapshot.fragments(fmt) for fmt in FORMATS]
+    records = bytearray()
+    for row, source_id in enumerate(snapshot.ids):
+        refs: List[int] = []
+        for column in encoded:
+            refs.extend(add(column[row]))
+        refs.extend(add(snapshot.cursor(row).encode("utf-8")))
+        records.extend(_RECORD.pack(source_id, *refs))
+    id_index = b"".join(_ID_ENTRY.pack(source_id, row)
+                        for source_id, row in sorted((source_id, row) for row, source_id in enumerate(snapshot.ids)))
+
+    records_offset = _HEADER.size + len(exports)
+    ids_offset = records_offset + len(records)
+    strings_offset = ids_offset + len(id_index)
+    header = _HEADER.pack(MAGIC, snapshot.version, len(snapshot.ids), records_offset, ids_offset, strings_offset)
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for section in (header, exports, records, id_index, strings):
+                f.write(section)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist the rename: without it a crash may leave the directory pointing at the previous file."""
+    if not hasattr(os, "O_DIRECTORY"):  # Windows cannot open a directory
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MappedCatalogSnapshot(CatalogSnapshot):
+    """CatalogSnapshot read from a memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        (magic, self.version, self.total, self._records_offset, self._ids_offset,
+         self._strings_offset) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or self._strings_offset > len(self._map):
+            raise ValueError(f"{path} is not a catalog snapshot")
+        self._init_page_cache()
+
+    @property
+    def formats(self) -> Tuple[str, ...]:
+        return FORMATS
+
+    def cursor(self, row: int) -> str:
+        return self._field(row, _CURSOR_FIELD).decode("utf-8")
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_offset + offset
+        return self._map[start:start + length]
+
+    def _field(self, row: int, field: int) -> bytes:
+        record = _RECORD.unpack_from(self._map, self._records_offset + row * _RECORD.size)
+        return self._string(record[1 + 2 * field], record[2 + 2 * field])
+
+    def fragments(self, fmt: str, start: int = 0, end: Optional[int] = None) -> List[bytes]:
+        field = FORMATS.index(fmt)
+        return [self._field(row, field) for row in range(*slice(start, end).indices(self.total))]
+
+    def export(self, fmt: str = "json") -> Tuple[bytes, bytes]:
+        body_offset, body_length, gzip_offset, gzip_length = _EXPORT.unpack_from(
+            self._map, _HEADER.size + FORMATS.index(fmt) * _EXPORT.size)
+        return self._string(body_offset, body_length), self._string(gzip_offset, gzip_length)
+
+    def _lower_bound(self, index_offset: int, entry: struct.Struct, key: int) -> int:
+        """First position of a sorted (key, row) index whose key is >= `key`."""
+        lo, hi = 0, self.total
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entry.unpack_from(self._map, index_offset + mid * entry.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _row_of_id(self, source_id: int) -> Optional[int]:
+        position = self._lower_bound(self._ids_offset, _ID_ENTRY, source_id)
+        if position < self.total:
+            entry_id, row = _ID_ENTRY.unpack_from(self._map, self._ids_offset + position * _ID_ENTRY.size)
+            if entry_id == source_id:
+                return row
+        return None
+
+    def source(self, source_id: int, fmt: str = "json") -> Optional[bytes]:
+        row = self._row_of_id(source_id)
+        return self._field(row, FORMATS.index(fmt)) if row is not None else None
+
+
+def open_snapshot_file(path: str) -> Optional[MappedCatalogSnapshot]:
+    """Map the snapshot file, None when it does not exist yet or is not a snapshot."""
+    try:
+        return MappedCatalogSnapshot(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+@contextlib.contextmanager
+def build_lock(directory: str) -> Iterator[None]:
+    """Exclusive lock among the workers sharing `directory`, held while one of them rebuilds."""
+    if sys.platform == "win32":  # every worker may rebuild, the rename keeps the file consistent
+        yield
+        return
+    import fcntl
+    with open(os.path.join(directory, LOCK_FILE_NAME), "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,268 @@
+"""
+CatalogSnapshotService - Pre-serialized JSON snapshot of the whole catalog.
+
+The unfiltered catalog is what most clients ask for, and it changes only a
+few times a day. Instead of loading ORM objects, converting them to DTOs and
+API schemas and serializing them on every request, the catalog is serialized
+once per catalog version: one JSON fragment per source (default order, name
+then id) plus the full export body, plain and gzip-compressed. The same
+fragments and export bodies are kept in MessagePack and CBOR for clients
+that negotiate a binary format.
+
+When a request sees a newer catalog version the snapshot is rebuilt on a
+background thread while the previous one keeps being served (with its own
+version in the ETag, so clients revalidate once the new one is ready). On a
+cold worker every request waits for the same single build.
+
+With `CATALOG_SNAPSHOT_DIR` set, the snapshot is shared by the workers of
+the host through a memory-mapped file (`catalog_snapshot_file_service`).
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import session_factory as default_session_factory
+from api.schemas.radio_source import RadioSourceOut
+from api.services import binary_format_service
+from api.services.binary_format_service import BINARY_FORMATS
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
+from model.repository.radio_source_repository import RadioSourceRepository
+from service.metrics_service import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Page bodies kept per snapshot, least recently used dropped first; each format and
+# its gzip variant is an entry of its own (the export bodies are always kept)
+MAX_CACHED_PAGES = 256
+# Pages are compressed per request, so a cheaper level than the export's (built once)
+PAGE_GZIP_LEVEL = 6
+
+
+class CatalogSnapshot:
+    """Immutable serialized catalog for one catalog version."""
+
+    def __init__(self, version: int, fragments: List[bytes], cursors: List[str],
+                 binary_fragments: Optional[Dict[str, List[bytes]]] = None,
+                 ids: Optional[List[int]] = None):
+        self.version = version
+        self.total = len(fragments)
+        # format ("json", "msgpack", "cbor") -> one encoded source per catalog entry
+        self._fragments: Dict[str, List[bytes]] = {"json": fragments, **(binary_fragments or {})}
+        self._cursors = cursors
+        self.ids = ids or []
+        self._rows = {source_id: row for row, source_id in enumerate(self.ids)}
+        export_body = self._list_body(fragments, page=1, page_size=self.total, next_cursor=None)
+        self._exports: Dict[str, Tuple[bytes, bytes]] = {"json": (export_body, gzip.compress(export_body))}
+        for fmt in binary_fragments or {}:
+            body = self._encode_list(fmt, self._fragments[fmt], 1, self.total, None)
+            self._exports[fmt] = (body, gzip.compress(body))
+        self._init_page_cache()
+
+    def _init_page_cache(self) -> None:
+        self._pages: "OrderedDict[Tuple[str, int, int, bool], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def formats(self) -> Tuple[str, ...]:
+        return tuple(self._fragments)
+
+    @property
+    def export_body(self) -> bytes:
+        return self.export("json")[0]
+
+    @property
+    def export_gzip(self) -> bytes:
+        return self.export("json")[1]
+
+    def cursor(self, row: int) -> str:
+        """Keyset cursor (`next_cursor`) pointing after `row`."""
+        return self._cursors[row]
+
+    def fragments(self, fmt: str, start: int = 0, end: Optional[int] = None) -> List[bytes]:
+        """Encoded sources of rows [start, end) in `fmt`."""
+        return self._fragments[fmt][start:end]
+
+    def export(self, fmt: str = "json") -> Tuple[bytes, bytes]:
+        """Whole-catalog body in `fmt`, plain and gzip-compressed."""
+        return self._exports[fmt]
+
+    def source(self, source_id: int, fmt: str = "json") -> Optional[bytes]:
+        """One encoded source by id, None when it is not in this snapshot."""
+        row = self._rows.get(source_id)
+        return self._fragments[fmt][row] if row is not None else None
+
+    def page(self, page: int, page_size: int, fmt: str = "json", compressed: bool = False) -> bytes:
+        """Body of an unfiltered `/api/v1/sources` page in `fmt`, gzip-compressed when `compressed`."""
+        key = (fmt, page, page_size, compressed)
+        cached = self._cached_page(key)
+        record_cache("catalog_pages", cached is not None)
+        if cached is not None:
+            return cached
+
+        if compressed:
+            # only clients accepting gzip pay for the compression
+            body = gzip.compress(self.page(page, page_size, fmt), compresslevel=PAGE_GZIP_LEVEL)
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            next_cursor = self.cursor(end - 1) if end < self.total else None
+            body = self._encode_list(fmt, self.fragments(fmt, start, end), page, page_size, next_cursor)
+        with self._lock:
+            self._pages[key] = body
+            if len(self._pages) > MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        return body
+
+    def _cached_page(self, key: Tuple[str, int, int, bool]) -> Optional[bytes]:
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+            return body
+
+    def _encode_list(self, fmt: str, fragments: List[bytes], page: int, page_size: int,
+                     next_cursor: Optional[str]) -> bytes:
+        if fmt == "json":
+            return self._list_body(fragments, page, page_size, next_cursor)
+        return binary_format_service.list_body(fmt, fragments, self.total, page, page_size, next_cursor)
+
+    def _list_body(self, fragments: List[bytes], page: int, page_size: int, next_cursor: Optional[str]) -> bytes:
+        # Same layout as RadioSourceList.model_dump_json()
+        cursor = b"null" if next_cursor is None else b'"' + next_cursor.encode() + b'"'
+        return (b'{"items":[' + b",".join(fragments) + b'],"total":' + str(self.total).encode()
+                + b',"page":' + str(page).encode() + b',"page_size":' + str(page_size).encode()
+                + b',"next_cursor":' + cursor + b"}")
+
+
+class CatalogSnapshotService:
+    """Keeps the current CatalogSnapshot and rebuilds it off-request when the catalog version changes."""
+
+    def __init__(self, session_factory: Callable[[], Session] = default_session_factory,
+                 snapshot_dir: Optional[str] = None):
+        self.session_factory = session_factory
+        # shared snapshot file directory, None to keep the snapshot in this process only
+        self.snapshot_dir = snapshot_dir
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        # rebuild queued or running on the executor, None when idle
+        self._pending: Optional["Future[CatalogSnapshot]"] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-snapshot")
+
+    @property
+    def version(self) -> Optional[int]:
+        """Catalog version of the snapshot being served, None until the first build."""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    def get(self) -> CatalogSnapshot:
+        """Current snapshot; only a cold worker waits, for the one build every caller shares."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._submit_rebuild().result()
+        if self.current_version() != snapshot.version:
+            self.schedule_rebuild()
+        return snapshot
+
+    async def get_async(self, session: AsyncSession) -> CatalogSnapshot:
+        """`get` for async routes: the version check runs on the request's AsyncSession."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await asyncio.wrap_future(self._submit_rebuild())
+        if await AsyncCatalogVersionRepository(session).get_version() != snapshot.version:
+            self.schedule_rebuild()
+        return snapshot
+
+    def current_version(self) -> int:
+        session = self.session_factory()
+        try:
+            return CatalogVersionRepository(session).get_version()
+        finally:
+            session.close()
+
+    def schedule_rebuild(self) -> None:
+        """Rebuild on the background thread unless a rebuild is already running."""
+        self._submit_rebuild()
+
+    def _submit_rebuild(self) -> "Future[CatalogSnapshot]":
+        """The pending rebuild, submitted to the background thread when there is none."""
+        with self._lock:
+            if self._pending is None:
+                self._pending = self._executor.submit(self._rebuild_in_background)
+            return self._pending
+
+    def _rebuild_in_background(self) -> CatalogSnapshot:
+        try:
+            return self.rebuild()
+        except Exception:
+            logger.exception("Catalog snapshot rebuild failed")
+            raise
+        finally:
+            with self._lock:
+                self._pending = None
+
+    @property
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Snapshot being served, without checking the catalog version."""
+        return self._snapshot
+
+    def rebuild(self) -> CatalogSnapshot:
+        snapshot = self.build() if self.snapshot_dir is None else self._load_shared(self.snapshot_dir)
+        with self._lock:
+            if self._snapshot is None or snapshot.version >= self._snapshot.version:
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def _load_shared(self, snapshot_dir: str) -> CatalogSnapshot:
+        """Map the shared snapshot file in `snapshot_dir`, rebuilding it first when it is older than the catalog."""
+        from api.services.catalog_snapshot_file_service import (SNAPSHOT_FILE_NAME, build_lock, open_snapshot_file,
+                                                                write_snapshot_file)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        path = os.path.join(snapshot_dir, SNAPSHOT_FILE_NAME)
+        version = self.current_version()
+        mapped = open_snapshot_file(path)
+        if mapped is not None and mapped.version >= version:
+            return mapped
+        with build_lock(snapshot_dir):
+            # another worker may have written it while this one waited for the lock
+            mapped = open_snapshot_file(path)
+            if mapped is None or mapped.version < version:
+                write_snapshot_file(path, self.build())
+                mapped = open_snapshot_file(path)
+        if mapped is None:
+            raise RuntimeError(f"catalog snapshot file {path} could not be read back")
+        return mapped
+
+    def build(self) -> CatalogSnapshot:
+        """Serialize the whole catalog: a single pass from entities to JSON and binary fragments."""
+        session = self.session_factory()
+        try:
+            # read the version first: a write racing the build only makes the snapshot look older
+            version = CatalogVersionRepository(session).get_version()
+            repo = RadioSourceRepository(session)
+            sources = repo.find_all_by_name()
+            fragments: List[bytes] = []
+            binary_fragments: Dict[str, List[bytes]] = {fmt: [] for fmt in BINARY_FORMATS}
+            for source in sources:
+                out = RadioSourceOut.model_validate(source)
+                fragments.append(out.model_dump_json().encode())
+                document = out.model_dump(mode="json")
+                for fmt, encoded in binary_fragments.items():
+                    encoded.append(binary_format_service.encode(fmt, document))
+            cursors = [repo.encode_cursor(source, "name") for source in sources]
+            ids = [source.id for source in sources]
+        finally:
+            session.close()
+        return CatalogSnapshot(version, fragments, cursors, binary_fragments, ids=ids)
+
+
+# Shared by every request in this process
+catalog_snapshot = CatalogSnapshotService(snapshot_dir=os.getenv("CATALOG_SNAPSHOT_DIR"))
@@ -0,0 +1,81 @@
+"""
+FacetCacheService - Facet counts cached per catalog version.
+
+The filter sidebar asks for the same few filter combinations over and over
+while the catalog changes a few times a day. Counts are computed with one
+grouped query (`RadioSourceRepository.count_facets`) and kept per filter set
+until the catalog version changes. The bitrate facet comes from the track
+history, whose writes do not move the catalog version, so entries are also
+recomputed once they are `max_age_seconds` old.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.radio_source import FacetCount, RadioSourceFacets
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository
+from model.repository.radio_source_repository import AsyncRadioSourceRepository
+from service.metrics_service import record_cache
+
+# Filter sets kept for the current catalog version (least recently used dropped first)
+MAX_CACHED_FILTER_SETS = 256
+# Bound on how stale the bitrate facet (track history) may get
+MAX_AGE_SECONDS = 60.0
+
+FilterKey = Tuple[Optional[str], Optional[int], Optional[str]]
+
+
+class FacetCacheService:
+    """LRU of RadioSourceFacets per filter set, emptied whenever the catalog version moves."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_FILTER_SETS, max_age_seconds: float = MAX_AGE_SECONDS):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.version: Optional[int] = None
+        # filter set -> (time.monotonic() when computed, facets)
+        self._entries: "OrderedDict[FilterKey, Tuple[float, RadioSourceFacets]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get_async(self, session: AsyncSession, q: Optional[str] = None, stream_type: Optional[int] = None,
+                        country: Optional[str] = None) -> Tuple[int, RadioSourceFacets]:
+        """(catalog version, facets) for the filter set; a cache hit costs one scalar query."""
+        version = await AsyncCatalogVersionRepository(session).get_version()
+        key: FilterKey = (q, stream_type, country)
+        with self._lock:
+            entry = self._entries.get(key) if version == self.version else None
+            if entry is not None and time.monotonic() - entry[0] < self.max_age_seconds:
+                self._entries.move_to_end(key)
+                record_cache("facets", True)
+                return version, entry[1]
+
+        record_cache("facets", False)
+        computed_at = time.monotonic()
+        counts = await AsyncRadioSourceRepository(session).count_facets(q, stream_type, country)
+        facets = RadioSourceFacets(
+            total=sum(count for _, _, count in counts["is_secure"]),
+            **{facet: [FacetCount(value=value, label=label, count=count) for value, label, count in entries]
+               for facet, entries in counts.items()},
+        )
+        self.put(version, key, facets, computed_at)
+        return version, facets
+
+    def put(self, version: int, key: FilterKey, facets: RadioSourceFacets,
+            computed_at: Optional[float] = None) -> None:
+        with self._lock:
+            if self.version is not None and version < self.version:
+                return  # computed from an older catalog than what is already cached
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            self._entries[key] = (time.monotonic() if computed_at is None else computed_at, facets)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared by every request in this process
+facet_cache = FacetCacheService()
@@ -1,59 +1,159 @@
-from typing import List, Optional, Any
-from deps import get_db_session
+import json
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from deps import db_manager, get_db_session
 
 # Avoid importing heavy application modules at import time. Import them lazily
 # inside methods to keep this module safe to import from the main venv.
-from api.schemas.radio_source import RadioSourceList, RadioSourceListenMetadata, RadioSourceOut
+from api.schemas.radio_source import (ChangeOp, RadioSourceBatchOut, RadioSourceChangeList, RadioSourceChangeOut,
+                                      RadioSourceList, RadioSourceListenMetadata, RadioSourceOut)
+from api.schemas.stream_metadata import SourceStreamMetadataOut, StreamMetadataBatchOut
+from api.schemas.track_history import TrackHistoryList, TrackHistoryOut
+from api.services import binary_format_service
 from model.dto.radio_source import RadioSourceDTO
 from model.dto.stream_metadata import StreamMetadataDTO
+from model.entity.catalog_change import CHANGE_DELETE, CHANGE_UPSERT
 from model.entity.radio_source import RadioSource
-from model.repository.proposal_repository import ProposalRepository
-from model.repository.radio_source_repository import RadioSourceRepository
+from model.repository.catalog_change_repository import AsyncCatalogChangeRepository
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
+from model.repository.radio_source_repository import PROJECTABLE_COLUMNS, AsyncRadioSourceRepository, RadioSourceRepository
 from model.repository.stream_type_repository import StreamTypeRepository
-from service.auth_service import AuthService
-from service.radio_source_service import RadioSourceService
+from model.repository.track_history_repository import TrackHistoryRepository
+from service.server_status_service import ServerStatusService
 from service.stream_metadata_service import StreamMetadataService
 from service.stream_type_service import StreamTypeService
-from service.proposal_service import ProposalService
+from service.track_history_service import TrackHistoryService
+
+if TYPE_CHECKING:
+    # write-side collaborators, imported on first use: the read API never loads Flask-Login or passlib
+    from model.repository.proposal_repository import ProposalRepository  # pragma: no cover
+    from service.auth_service import AuthService  # pragma: no cover
+    from service.proposal_service import ProposalService  # pragma: no cover
+    from service.radio_source_service import RadioSourceService  # pragma: no cover
+
+# Process-wide collaborators: the metadata cache must outlive the per-request API services
+stream_metadata_service = StreamMetadataService()
+server_status_service = ServerStatusService()
+
+# `?fields=` shorthands expanding to several projectable fields
+FIELD_GROUPS = {"stream_type": ["stream_type.id", "stream_type.display_name"]}
+
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Parse a comma separated `?fields=` list into PROJECTABLE_COLUMNS keys, keeping request order.
+
+    Raises:
+        ValueError: on an empty list or an unknown field
+    """
+    parsed: List[str] = []
+    for part in (part.strip() for part in fields.split(",")):
+        if not part:
+            continue
+        expanded = FIELD_GROUPS.get(part, [part])
+        unknown = [field for field in expanded if field not in PROJECTABLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unsupported field: {part}")
+        parsed.extend(expanded)
+    if not parsed:
+        raise ValueError("fields must name at least one field")
+    return list(dict.fromkeys(parsed))
+
+
+def sparse_list_body(rows: List[Dict[str, Any]], total: int, page: int, page_size: int,
+                     next_cursor: Optional[str], fmt: str = "json") -> bytes:
+    """
+    Serialize projected rows straight to a RadioSourceList-shaped document, skipping RadioSourceOut validation.
+
+    Dotted fields become nested objects ("stream_type.display_name" -> {"stream_type": {"display_name": ...}}).
+    `fmt` is "json" or one of binary_format_service.BINARY_FORMATS.
+    """
+    items: List[Dict[str, Any]] = []
+    for row in rows:
+        item: Dict[str, Any] = {}
+        for field, value in row.items():
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            parent, _, child = field.partition(".")
+            if child:
+                item.setdefault(parent, {})[child] = value
+            else:
+                item[field] = value
+        items.append(item)
+    body = {"items": items, "total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor}
+    if fmt != "json":
+        return binary_format_service.encode(fmt, body)
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def ndjson_line(source: RadioSource) -> bytes:
+    """One NDJSON export line: the source as RadioSourceOut JSON plus a newline."""
+    return RadioSourceOut.model_validate(source).model_dump_json().encode() + b"\n"
+
 
 class RadioSourceAPIService:
     """API-facing service for radio sources.
 
-    Supports dependency injection: callers may pass pre-built service instances
-    to the constructor to avoid importing application internals at module
-    import time. When dependencies are not provided they are created lazily
-    using local imports.
+    Built per request (see `get_radio_source_api_service` in the routes) around
+    the request's Session, so repositories never outlive the request. Without a
+    session it falls back to `get_db_session()`. Collaborators are created on
+    first use, so constructing the service is cheap.
     """
 
-    def __init__(self): 
-        self._radio_source_service: RadioSourceService = self.get_radio_source_service()
-        self._metadata_service: Optional[StreamMetadataService] = None
+    def __init__(self, db_session: Optional[Session] = None):
+        self.db_session: Optional[Session] = db_session
+        self._radio_source_service: Optional["RadioSourceService"] = None
+
+    def _session(self) -> Session:
+        return self.db_session if self.db_session is not None else get_db_session()
+
+    @property
+    def radio_source_service(self) -> "RadioSourceService":
+        if self._radio_source_service is None:
+            self._radio_source_service = self.get_radio_source_service()
+        return self._radio_source_service
 
     # Repository and service initialization functions (lazily imported)
     def get_stream_type_repo(self) -> StreamTypeRepository:
         from model.repository.stream_type_repository import StreamTypeRepository
-        return StreamTypeRepository(get_db_session())
+        return StreamTypeRepository(self._session())
 
-    def get_proposal_repo(self) -> ProposalRepository:
+    def get_proposal_repo(self) -> "ProposalRepository":
         from model.repository.proposal_repository import ProposalRepository
-        return ProposalRepository(get_db_session())
+        return ProposalRepository(self._session())
 
     def get_radio_source_repo(self) -> RadioSourceRepository:
         from model.repository.radio_source_repository import RadioSourceRepository
-        return RadioSourceRepository(get_db_session())
+        return RadioSourceRepository(self._session())
+
+    def get_track_history_repo(self) -> TrackHistoryRepository:
+        from model.repository.track_history_repository import TrackHistoryRepository
+        return TrackHistoryRepository(self._session())
+
+    def get_catalog_version_repo(self) -> CatalogVersionRepository:
+        from model.repository.catalog_version_repository import CatalogVersionRepository
+        return CatalogVersionRepository(self._session())
 
-    def get_auth_service(self) -> AuthService:
+    def get_auth_service(self) -> "AuthService":
+        from model.repository.user_repository import UserRepository
         from service.auth_service import AuthService
-        return AuthService()
+        auth_service = AuthService()
+        auth_service.user_repo = UserRepository(self._session())
+        return auth_service
 
     def get_stream_type_service(self) -> StreamTypeService:
         from service.stream_type_service import StreamTypeService
         return StreamTypeService(stream_type_repository=self.get_stream_type_repo())
 
-    def get_proposal_service(self) -> ProposalService:
+    def get_proposal_service(self) -> "ProposalService":
+        from service.proposal_service import ProposalService
         return ProposalService(self.get_proposal_repo())
 
-    def get_radio_source_service(self) -> RadioSourceService:
+    def get_radio_source_service(self) -> "RadioSourceService":
+        from service.radio_source_service import RadioSourceService
         return RadioSourceService(
             proposal_repo=self.get_proposal_repo(),
             radio_source_repo=self.get_radio_source_repo(),
@@ -62,14 +162,26 @@ class RadioSourceAPIService:
             stream_type_service=self.get_stream_type_service()
         )
 
+    def get_server_status_service(self) -> ServerStatusService:
+        return server_status_service
+
+    def get_track_history_service(self) -> TrackHistoryService:
+        from service.track_history_service import TrackHistoryService
+        return TrackHistoryService(self.get_track_history_repo())
+
     def get_stream_metadata_service(self) -> StreamMetadataService:
-        if self._metadata_service is None:
-            self._metadata_service = StreamMetadataService()
-        return self._metadata_service
+        return stream_metadata_service
             
+    def get_catalog_version(self) -> int:
+        """Current catalog version, used to build ETags for conditional GETs."""
+        return self.get_catalog_version_repo().get_version()
+
+    # Stations per NDJSON chunk (and per fetch from the database cursor)
+    EXPORT_BATCH_SIZE: int = 500
+
     def get_all_radio_sources(self) -> RadioSourceList:
         """GET /api/v1/sources/all"""
-        all_items: List[RadioSource] = self._radio_source_service.get_all_radio_sources()
+        all_items: List[RadioSource] = self.radio_source_service.get_all_radio_sources()
         if not all_items:
             return RadioSourceList(items=[], total=0, page=1, page_size=0)
         
@@ -78,38 +190,100 @@ class RadioSourceAPIService:
         return RadioSourceList(items=all_items_out, total=len(all_items_out), page=1, page_size=len(all_items_out))
 
 
+    def export_ndjson(self) -> Iterator[bytes]:
+        """Whole catalog as NDJSON chunks, one RadioSourceOut per line, in catalog order.
+
+        Rows are fetched `EXPORT_BATCH_SIZE` at a time, so memory stays flat
+        however large the catalog is.
+        """
+        lines: List[bytes] = []
+        for source in self.get_radio_source_repo().iter_all_by_name(self.EXPORT_BATCH_SIZE):
+            lines.append(ndjson_line(source))
+            if len(lines) >= self.EXPORT_BATCH_SIZE:
+                yield b"".join(lines)
+                lines = []
+        if lines:
+            yield b"".join(lines)
+
     def list_sources(self,
         q: str | None = None,
         stream_type: int | None = None,
         country: str | None = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> Optional[tuple[List[RadioSourceOut], int]]:
-        """GET /api/v1/sources"""
+        sort: str = "name",
+        cursor: str | None = None,
+    ) -> RadioSourceList:
+        """GET /api/v1/sources
 
-        all_items: List[RadioSource] = self._radio_source_service.get_all_radio_sources()
-        if not all_items:
-            return None
-        
-        if q:
-            all_items = [item for item in all_items if q.lower() in item.name.lower()]
-        if stream_type:
-            all_items = [item for item in all_items if item.stream_type.id == stream_type]
-        if country:
-            all_items = [item for item in all_items if item.country == country]
-        total = len(all_items)
-        start = (page - 1) * page_size
-        end = start + page_size
+        Filtering, ordering and pagination run on the in-process columnar
+        catalog index (`catalog_index_service`); only the page's sources are
+        loaded, by id. With `cursor` the page continues after the last row of
+        the previous page (keyset pagination), otherwise `page` selects an
+        offset page. A `q` with SQL LIKE wildcards is filtered in SQL.
 
-        # prepare out for API (RadioSourceOut)
-        all_items_out: List[RadioSourceOut] = [RadioSourceOut.model_validate(item) for item in all_items]
-        paged_items: List[RadioSourceOut] = all_items_out[start:end]  
-        return RadioSourceList(items=paged_items, total=total, page=page, page_size=page_size)
+        Raises:
+            ValueError: on unsupported sort field or invalid cursor
+        """
+        from api.services.catalog_index_service import catalog_index
+        repo = self.get_radio_source_repo()
+        index = catalog_index.get(self._session())
+        total: Optional[int]
+        if index.supports(q):
+            ids, total, next_cursor = index.find_page(q=q, stream_type_id=stream_type, country=country, sort=sort,
+                                                      limit=page_size, cursor=cursor, offset=(page - 1) * page_size)
+            items = repo.find_by_ids_in_order(ids)
+        else:
+            items, total, next_cursor = repo.find_page(
+                q=q,
+                stream_type_id=stream_type,
+                country=country,
+                sort=sort,
+                limit=page_size,
+                cursor=cursor,
+                offset=(page - 1) * page_size,
+            )
+        items_out: List[RadioSourceOut] = [RadioSourceOut.model_validate(item) for item in items]
+        return RadioSourceList(items=items_out, total=total or 0, page=page, page_size=page_size, next_cursor=next_cursor)
+
+    def list_source_fields(self, fields: List[str],
+        q: str | None = None,
+        stream_type: int | None = None,
+        country: str | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        sort: str = "name",
+        cursor: str | None = None,
+        fmt: str = "json",
+    ) -> bytes:
+        """GET /api/v1/sources?fields=... : only `fields` are selected and serialized (JSON, MessagePack or CBOR body).
+
+        Raises:
+            ValueError: on unknown field, unsupported sort field or invalid cursor
+        """
+        rows, total, next_cursor = self.get_radio_source_repo().find_page_fields(
+            fields,
+            q=q,
+            stream_type_id=stream_type,
+            country=country,
+            sort=sort,
+            limit=page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
+        )
+        return sparse_list_body(rows, total or 0, page, page_size, next_cursor, fmt)
+
+    def search_sources(self, q: str, page: int = 1, page_size: int = 20) -> RadioSourceList:
+        """GET /api/v1/search (FTS5, best match first)"""
+        repo = self.get_radio_source_repo()
+        items = repo.search(q, limit=page_size, offset=(page - 1) * page_size)
+        items_out: List[RadioSourceOut] = [RadioSourceOut.model_validate(item) for item in items]
+        return RadioSourceList(items=items_out, total=repo.count_search(q), page=page, page_size=page_size)
 
 
     def get_radio_source(self, source_id: int) -> Optional[RadioSourceOut]:
         """GET /api/v1/sources/{id}"""
-        source: RadioSourceDTO = self._radio_source_service.get_radio_source_by_id(source_id)
+        source: RadioSourceDTO = self.radio_source_service.get_radio_source_by_id(source_id)
         if not source:
             return None
         try:
@@ -121,7 +295,7 @@ class RadioSourceAPIService:
 
 
     def get_listen_metadata(self, source_id: int) -> Optional[RadioSourceListenMetadata]:
-        source: RadioSourceDTO = self._radio_source_service.get_radio_source_by_id(source_id)
+        source: RadioSourceDTO = self.radio_source_service.get_radio_source_by_id(source_id)
         if not source:
             return None
         try:
@@ -131,13 +305,221 @@ class RadioSourceAPIService:
             return None
         return RadioSourceListenMetadata.model_validate(target)
 
-    def get_stream_metadata(self, source_id: int, timeout_seconds: int = 10) -> StreamMetadataDTO:
-        source: RadioSourceDTO | None = self._radio_source_service.get_radio_source_by_id(source_id)
+    def get_stream_metadata(self, source_id: int, timeout_seconds: int = 10, cached_only: bool = False) -> StreamMetadataDTO:
+        """GET /api/v1/sources/{id}/metadata; with `cached_only` (brownout) no ffprobe is started."""
+        source: RadioSourceDTO | None = self.radio_source_service.get_radio_source_by_id(source_id)
         if not source or not source.stream_url:
             return StreamMetadataDTO(available=False, error_message="radio source not found or missing stream URL")
         metadata_service = self.get_stream_metadata_service()
         if not metadata_service.is_available:
             return StreamMetadataDTO(available=False, error_message="ffprobe is not installed")
-        return metadata_service.get_metadata(source.stream_url, timeout_seconds)
+        if cached_only:
+            cached = metadata_service.get_cached_metadata(source.stream_url)
+            return cached or StreamMetadataDTO(available=False, error_message="live metadata is paused while the server is busy")
+        metadata: StreamMetadataDTO = metadata_service.get_metadata(source.stream_url, timeout_seconds)
+        self.get_track_history_service().record(source.id, metadata)
+        return metadata
+
+    def get_stream_metadata_many(self, source_ids: List[int], timeout_seconds: int = 10,
+                                 cached_only: bool = False, max_parallel: Optional[int] = None) -> StreamMetadataBatchOut:
+        """
+        GET /api/v1/sources/metadata?ids=...; with `cached_only` (brownout) uncached ids are reported pending.
+
+        At most `max_parallel` ffprobes run at once for this batch (the admission's in-flight slots).
+        """
+        sources: List[RadioSource] = self.get_radio_source_repo().find_by_ids(source_ids)
+        url_by_id: dict[int, str] = {source.id: source.stream_url for source in sources if source.stream_url}
+        missing: List[int] = [source_id for source_id in source_ids if source_id not in url_by_id]
+
+        metadata_service = self.get_stream_metadata_service()
+        if not metadata_service.is_available:
+            unavailable = [SourceStreamMetadataOut(source_id=source_id, available=False,
+                                                   error_message="ffprobe is not installed")
+                           for source_id in url_by_id]
+            return StreamMetadataBatchOut(items=unavailable, missing=missing)
+
+        by_url: dict[str, StreamMetadataDTO]
+        if cached_only:
+            by_url = {url: cached for url in url_by_id.values()
+                      if (cached := metadata_service.get_cached_metadata(url)) is not None}
+        else:
+            # one deadline for both steps: ffprobe gets what the status pages left of it
+            deadline = time.monotonic() + timeout_seconds
+            self._harvest_server_status(sources, metadata_service, timeout_seconds)
+            by_url = metadata_service.get_metadata_many(url_by_id.values(), max(0.0, deadline - time.monotonic()),
+                                                        max_parallel=max_parallel)
+
+        history_service = self.get_track_history_service()
+        items: List[SourceStreamMetadataOut] = []
+        pending: List[int] = []
+        for source_id in source_ids:
+            if source_id not in url_by_id:
+                continue
+            metadata = by_url.get(url_by_id[source_id])
+            if metadata is None:
+                pending.append(source_id)
+                continue
+            history_service.record(source_id, metadata)
+            items.append(SourceStreamMetadataOut(source_id=source_id, **metadata.model_dump()))
+        return StreamMetadataBatchOut(items=items, missing=missing, pending=pending)
+
+    def _harvest_server_status(self, sources: List[RadioSource], metadata_service: StreamMetadataService,
+                               timeout_seconds: float) -> None:
+        """Prime the metadata cache from Icecast/Shoutcast status pages (one request per server)."""
+        stations = [
+            (source.id, source.stream_url, source.stream_type.metadata_type)
+            for source in sources
+            if source.stream_type is not None and metadata_service.get_cached_metadata(source.stream_url) is None
+        ]
+        if not stations:
+            return
+        # leave at least half of the deadline to the ffprobe fallback
+        harvest_timeout = timeout_seconds / 2
+        url_by_id = {source.id: source.stream_url for source in sources}
+        for source_id, metadata in self.get_server_status_service().harvest(stations, harvest_timeout).items():
+            metadata_service.prime_cache(url_by_id[source_id], metadata)
+
+    def get_track_history(self, source_id: int, since: Optional[datetime] = None, limit: int = 100) -> Optional[TrackHistoryList]:
+        """GET /api/v1/sources/{id}/history"""
+        if self.get_radio_source_repo().find_by_id(source_id) is None:
+            return None
+        history = self.get_track_history_service().get_history(source_id, since, limit)
+        items: List[TrackHistoryOut] = [TrackHistoryOut.model_validate(entry) for entry in history]
+        return TrackHistoryList(source_id=source_id, items=items, total=len(items))
         
 
+    # Async read path: repositories on the request's AsyncSession (deps.get_async_db_session)
+
+    async def get_catalog_version_async(self, session: AsyncSession) -> int:
+        return await AsyncCatalogVersionRepository(session).get_version()
+
+    async def list_sources_async(self, session: AsyncSession,
+        q: str | None = None,
+        stream_type: int | None = None,
+        country: str | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        sort: str = "name",
+        cursor: str | None = None,
+    ) -> RadioSourceList:
+        """Async `list_sources`."""
+        from api.services.catalog_index_service import catalog_index
+        repo = AsyncRadioSourceRepository(session)
+        index = await catalog_index.get_async(session)
+        total: Optional[int]
+        if index.supports(q):
+            ids, total, next_cursor = index.find_page(q=q, stream_type_id=stream_type, country=country, sort=sort,
+                                                      limit=page_size, cursor=cursor, offset=(page - 1) * page_size)
+            items = await repo.find_by_ids_in_order(ids)
+        else:
+            items, total, next_cursor = await repo.find_page(
+                q=q,
+                stream_type_id=stream_type,
+                country=country,
+                sort=sort,
+                limit=page_size,
+                cursor=cursor,
+                offset=(page - 1) * page_size,
+            )
+        items_out: List[RadioSourceOut] = [RadioSourceOut.model_validate(item) for item in items]
+        return RadioSourceList(items=items_out, total=total or 0, page=page, page_size=page_size, next_cursor=next_cursor)
+
+    async def export_ndjson_async(self) -> AsyncIterator[bytes]:
+        """Async `export_ndjson` for a StreamingResponse.
+
+        Opens its own AsyncSession: the body is streamed after the route has
+        returned, so it cannot rely on the request-scoped session.
+        """
+        async with db_manager.async_session_factory() as session:
+            lines: List[bytes] = []
+            async for source in AsyncRadioSourceRepository(session).iter_all_by_name(self.EXPORT_BATCH_SIZE):
+                lines.append(ndjson_line(source))
+                if len(lines) >= self.EXPORT_BATCH_SIZE:
+                    yield b"".join(lines)
+                    lines = []
+            if lines:
+                yield b"".join(lines)
+
+    async def list_source_fields_async(self, session: AsyncSession, fields: List[str],
+        q: str | None = None,
+        stream_type: int | None = None,
+        country: str | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        sort: str = "name",
+        cursor: str | None = None,
+        fmt: str = "json",
+    ) -> bytes:
+        """Async `list_source_fields`."""
+        rows, total, next_cursor = await AsyncRadioSourceRepository(session).find_page_fields(
+            fields,
+            q=q,
+            stream_type_id=stream_type,
+            country=country,
+            sort=sort,
+            limit=page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
+        )
+        return sparse_list_body(rows, total or 0, page, page_size, next_cursor, fmt)
+
+    async def get_changes_async(self, session: AsyncSession, since: int, limit: int = 500) -> RadioSourceChangeList:
+        """GET /api/v1/sources/changes: what changed after catalog version `since`, oldest first.
+
+        Each changed source appears once, with its latest state. When `since`
+        predates the compacted tombstones the page has `reset` set: the client
+        drops its copy and rebuilds it from the changes (starting at version 0).
+        A reset page holds every entry up to the compacted version whatever
+        `limit` (at most one per source), so its `version` never sends the
+        client into another reset.
+        """
+        compacted = await AsyncCatalogVersionRepository(session).get_compacted_version()
+        feed = AsyncCatalogChangeRepository(session)
+        reset = since < compacted
+        changes = await feed.find_since(0, None, until=compacted) if reset else []
+        start = compacted if reset else since
+        remaining = max(limit - len(changes), 0)
+        newer = await feed.find_since(start, remaining + 1)
+        has_more = len(newer) > remaining
+        newer = newer[:remaining]
+        changes += newer
+
+        upsert_ids = [change.radio_source_id for change in changes if change.op == CHANGE_UPSERT]
+        sources = {source.id: source for source in await AsyncRadioSourceRepository(session).find_by_ids(upsert_ids)}
+        items: List[RadioSourceChangeOut] = []
+        for change in changes:
+            source = sources.get(change.radio_source_id) if change.op == CHANGE_UPSERT else None
+            # a source deleted while this page was read is reported as deleted
+            op: ChangeOp = CHANGE_UPSERT if source is not None else CHANGE_DELETE
+            items.append(RadioSourceChangeOut(version=change.version, op=op, id=change.radio_source_id,
+                                              source=RadioSourceOut.model_validate(source) if source else None))
+        version = newer[-1].version if newer else start
+        return RadioSourceChangeList(since=since, version=version, reset=reset, has_more=has_more, changes=items)
+
+    async def search_sources_async(self, session: AsyncSession, q: str, page: int = 1, page_size: int = 20) -> RadioSourceList:
+        """Async `search_sources`."""
+        repo = AsyncRadioSourceRepository(session)
+        items = await repo.search(q, limit=page_size, offset=(page - 1) * page_size)
+        items_out: List[RadioSourceOut] = [RadioSourceOut.model_validate(item) for item in items]
+        return RadioSourceList(items=items_out, total=await repo.count_search(q), page=page, page_size=page_size)
+
+    async def get_radio_source_async(self, session: AsyncSession, source_id: int) -> Optional[RadioSourceOut]:
+        """Async `get_radio_source`."""
+        source: RadioSource | None = await AsyncRadioSourceRepository(session).find_by_id(source_id)
+        if not source:
+            return None
+        return RadioSourceOut.model_validate(source)
+
+    async def get_radio_sources_async(self, session: AsyncSession, source_ids: List[int]) -> RadioSourceBatchOut:
+        """GET /api/v1/sources?ids= and POST /api/v1/sources/batch: one IN query, results in request order."""
+        found = {source.id: RadioSourceOut.model_validate(source)
+                 for source in await AsyncRadioSourceRepository(session).find_by_ids(source_ids)}
+        return RadioSourceBatchOut(items=[found.get(source_id) for source_id in source_ids],
+                                   missing=[source_id for source_id in source_ids if source_id not in found])
+
+    async def get_listen_metadata_async(self, session: AsyncSession, source_id: int) -> Optional[RadioSourceListenMetadata]:
+        """Async `get_listen_metadata`."""
+        target: RadioSourceOut | None = await self.get_radio_source_async(session, source_id)
+        if not target:
+            return None
+        return RadioSourceListenMetadata.model_validate(target)
@@ -0,0 +1,115 @@
+"""
+ReadinessService - Deep readiness check for load balancers.
+
+`/api/v1/health` only says the process answers. Readiness also says whether
+this worker should get traffic: the database answers, the catalog snapshot,
+suggest index and catalog index are built (a cold worker serves its first
+catalog request with a full synchronous build), and the probe admission controller still has
+room. A cold worker starts warming its caches in the background on the first
+check, so the load balancer's polling is enough to bring it into rotation.
+
+Missing ffprobe/ffmpeg only degrades the worker: the catalog is still
+served, metadata endpoints answer `available: false`.
+"""
+
+import shutil
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.health import CacheCheck, DatabaseCheck, ProbeCheck, ReadinessOut, ReadinessStatus
+from api.services.catalog_snapshot_service import CatalogSnapshotService, catalog_snapshot
+from api.services.facet_cache_service import FacetCacheService, facet_cache
+from api.services.radio_source_api_service import stream_metadata_service
+from api.services.suggest_index_service import SuggestIndexService, suggest_index
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository
+from service.admission_control_service import AdmissionController, probe_admission
+
+if TYPE_CHECKING:
+    from api.services.catalog_index_service import CatalogIndexService
+
+
+class ReadinessService:
+    """Checks the database, probe capacity and cache state of this worker."""
+
+    def __init__(
+        self,
+        snapshot_service: CatalogSnapshotService = catalog_snapshot,
+        suggest_service: SuggestIndexService = suggest_index,
+        facet_service: FacetCacheService = facet_cache,
+        admission: AdmissionController = probe_admission,
+        index_service: Optional["CatalogIndexService"] = None,
+    ):
+        self.snapshot_service = snapshot_service
+        self.suggest_service = suggest_service
+        self.facet_service = facet_service
+        self.admission = admission
+        self._index_service = index_service
+
+    @property
+    def index_service(self) -> "CatalogIndexService":
+        if self._index_service is None:
+            # imported here: NumPy stays off the startup path
+            from api.services.catalog_index_service import catalog_index
+            self._index_service = catalog_index
+        return self._index_service
+
+    async def check_async(self, session: AsyncSession) -> ReadinessOut:
+        database, catalog_version = await self._check_database(session)
+        probes = ProbeCheck(
+            ffprobe=stream_metadata_service.is_available,
+            ffmpeg=shutil.which("ffmpeg") is not None,
+            in_flight=self.admission.in_flight,
+            max_in_flight=self.admission.max_in_flight,
+            brownout=self.admission.brownout,
+        )
+        caches = CacheCheck(
+            catalog_snapshot_version=self.snapshot_service.version,
+            suggest_index_version=self.suggest_service.version if self.suggest_service.index is not None else None,
+            facets_version=self.facet_service.version,
+            catalog_index_version=self.index_service.version,
+            warm=(self.snapshot_service.version is not None and self.suggest_service.index is not None
+                  and self.index_service.version is not None),
+        )
+        if database.ok and not caches.warm:
+            self.warm_up()
+
+        status: ReadinessStatus
+        if not database.ok:
+            status = "unavailable"
+        elif not caches.warm:
+            status = "warming"
+        elif probes.in_flight >= probes.max_in_flight:
+            status = "saturated"
+        elif probes.brownout or not (probes.ffprobe and probes.ffmpeg):
+            status = "degraded"
+        else:
+            status = "ready"
+        return ReadinessOut(status=status, ready=status in ("ready", "degraded"), catalog_version=catalog_version,
+                            database=database, probes=probes, caches=caches)
+
+    def warm_up(self) -> None:
+        """Build whatever cache is still cold, on the caches' own background threads."""
+        if self.snapshot_service.version is None:
+            self.snapshot_service.schedule_rebuild()
+        if self.suggest_service.index is None:
+            self.suggest_service.schedule_refresh()
+        if self.index_service.version is None:
+            self.index_service.schedule_refresh()
+
+    @staticmethod
+    async def _check_database(session: AsyncSession) -> Tuple[DatabaseCheck, Optional[int]]:
+        started = time.perf_counter()
+        try:
+            await session.execute(text("SELECT 1"))
+            latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            version = await AsyncCatalogVersionRepository(session).get_version()
+        except Exception as e:
+            return DatabaseCheck(ok=False, error=str(e)), None
+        return DatabaseCheck(ok=True, latency_ms=latency_ms), version
+
+
+# Shared by every request in this process
+readiness = ReadinessService()
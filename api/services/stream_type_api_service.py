@@ -1,9 +1,13 @@
 from typing import Dict, Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
 from deps import get_db_session
 from model.dto.stream_type import StreamTypeDTO
 from service.stream_type_service import StreamTypeService
-from model.repository.stream_type_repository import StreamTypeRepository
+from model.repository.stream_type_repository import AsyncStreamTypeRepository, StreamTypeRepository
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
 from schemas.stream_type import StreamTypeList, StreamTypeOut
 
 
@@ -11,26 +15,38 @@ from schemas.stream_type import StreamTypeList, StreamTypeOut
 class StreamTypeAPIService:
     """API-facing service for stream types.
 
-    Supports dependency injection and lazy imports to avoid importing
-    application internals at module import time.
+    Built per request around the request's Session (falls back to
+    `get_db_session()`); construction runs no query.
     """
 
-    def __init__(self):
-        self._stream_type_repo : StreamTypeRepository = self.get_stream_type_repo()
-        self._stream_type_service: StreamTypeService = self.get_stream_type_service()
-        self._predefined_types: Dict[str, int] = self._get_predefined_types_map()
+    def __init__(self, db_session: Optional[Session] = None):
+        self.db_session: Optional[Session] = db_session
+        self._stream_type_service: Optional[StreamTypeService] = None
+
+    @property
+    def stream_type_service(self) -> StreamTypeService:
+        if self._stream_type_service is None:
+            self._stream_type_service = self.get_stream_type_service()
+        return self._stream_type_service
+
+    def _session(self) -> Session:
+        return self.db_session if self.db_session is not None else get_db_session()
 
     def get_stream_type_repo(self) -> StreamTypeRepository:
-        return StreamTypeRepository(get_db_session())
+        return StreamTypeRepository(self._session())
 
     def get_stream_type_service(self) -> StreamTypeService:
         return StreamTypeService(stream_type_repository=self.get_stream_type_repo())
 
+    def get_catalog_version(self) -> int:
+        """Current catalog version, used to build ETags for conditional GETs."""
+        return CatalogVersionRepository(self._session()).get_version()
+
     def _get_predefined_types_map(self) -> Dict[str, int]:
-        return self._stream_type_service.get_predefined_types_map()
+        return self.stream_type_service.get_predefined_types_map()
 
     def get_stream_type(self, id: int) -> Optional[StreamTypeOut]:
-        stream_type_dto: StreamTypeDTO = self._stream_type_service.get_stream_type(id)
+        stream_type_dto: StreamTypeDTO = self.stream_type_service.get_stream_type(id)
         if stream_type_dto:
             # Accept DTOs that may be simple namespaces or objects by
             # converting to a mapping first (tests provide SimpleNamespace).
@@ -39,9 +55,22 @@ class StreamTypeAPIService:
         return None
 
     def get_all_stream_types(self) -> StreamTypeList:
-        raw_items = self._stream_type_service.get_all_stream_types()
+        raw_items = self.stream_type_service.get_all_stream_types()
         items: list[StreamTypeOut] = []
         for item in raw_items:
             data = vars(item) if hasattr(item, "__dict__") else item
             items.append(StreamTypeOut.model_validate(data))
-        return StreamTypeList(items=items, total=len(items), page=1, page_size=len(items))
\ No newline at end of file
+        return StreamTypeList(items=items, total=len(items), page=1, page_size=len(items))
+
+    # Async read path: repositories on the request's AsyncSession (deps.get_async_db_session)
+
+    async def get_catalog_version_async(self, session: AsyncSession) -> int:
+        return await AsyncCatalogVersionRepository(session).get_version()
+
+    async def get_stream_type_async(self, session: AsyncSession, id: int) -> Optional[StreamTypeOut]:
+        stream_type = await AsyncStreamTypeRepository(session).find_by_id(id)
+        return StreamTypeOut.model_validate(stream_type) if stream_type else None
+
+    async def get_all_stream_types_async(self, session: AsyncSession) -> StreamTypeList:
+        items = [StreamTypeOut.model_validate(item) for item in await AsyncStreamTypeRepository(session).find_all()]
+        return StreamTypeList(items=items, total=len(items), page=1, page_size=len(items))
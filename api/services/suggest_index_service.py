@@ -0,0 +1,301 @@
+"""
+SuggestIndexService - In-process prefix index for type-ahead station suggestions.
+
+Station names are normalized (case folded, diacritics and punctuation
+removed) and kept in two sorted indexes: full names, and aliases made of
+every word-boundary suffix of the name ("radio paradise" -> "paradise").
+Each index is flat arrays (the key bytes in one buffer, offsets, lengths and
+ids in typed arrays), not a Python object per key. A prefix lookup is two
+binary searches plus at most `limit` steps, with no SQL on the keystroke
+path. The catalog version is checked at most once per
+`refresh_interval_seconds`; when it changed, only the stations written
+since are read from the change feed and applied to the arrays.
+"""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import session_factory as default_session_factory
+from model.entity.catalog_change import CHANGE_UPSERT
+from model.repository.catalog_change_repository import CatalogChangeRepository
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
+from model.repository.radio_source_repository import RadioSourceRepository
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Above this share of changed stations a full rebuild is cheaper than array insertions
+FULL_REBUILD_RATIO = 0.2
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold, strip diacritics and collapse everything but letters and digits to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    ascii_only = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", ascii_only).strip()
+
+
+def name_aliases(normalized: str) -> List[str]:
+    """Word-boundary suffixes of a normalized name, excluding the full name itself."""
+    words = normalized.split(" ")
+    return [" ".join(words[i:]) for i in range(1, len(words))]
+
+
+class SortedKeys:
+    """
+    Sorted (key, id) pairs in flat arrays: the UTF-8 bytes of every key in one
+    buffer and, per sorted position, the key's offset and length and the id.
+
+    Keys are appended to the buffer and never moved, so adding or removing a
+    pair only shifts the position arrays. Removed keys leave their bytes behind
+    until half of the buffer is unused, then the buffer is compacted.
+    """
+
+    def __init__(self, pairs: Optional[List[Tuple[str, int]]] = None):
+        self._data = bytearray()
+        self._offsets = array("I")
+        self._lengths = array("H")
+        self.ids = array("q")
+        self._unused = 0
+        for key, source_id in sorted(pairs or []):
+            encoded = key.encode("utf-8")
+            self._offsets.append(len(self._data))
+            self._lengths.append(len(encoded))
+            self.ids.append(source_id)
+            self._data.extend(encoded)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def key(self, position: int) -> bytes:
+        offset = self._offsets[position]
+        return bytes(self._data[offset:offset + self._lengths[position]])
+
+    def _lower_bound(self, key: bytes) -> int:
+        """First position whose key is >= `key`."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, key: str, source_id: int) -> None:
+        encoded = key.encode("utf-8")
+        position = self._lower_bound(encoded)
+        while position < len(self) and self.key(position) == encoded and self.ids[position] < source_id:
+            position += 1
+        self._offsets.insert(position, len(self._data))
+        self._lengths.insert(position, len(encoded))
+        self.ids.insert(position, source_id)
+        self._data.extend(encoded)
+
+    def remove(self, key: str, source_id: int) -> None:
+        encoded = key.encode("utf-8")
+        position = self._lower_bound(encoded)
+        while position < len(self) and self.key(position) == encoded:
+            if self.ids[position] == source_id:
+                del self._offsets[position]
+                del self._lengths[position]
+                del self.ids[position]
+                self._unused += len(encoded)
+                if self._unused * 2 > len(self._data):
+                    self._compact()
+                return
+            position += 1
+
+    def _compact(self) -> None:
+        """Rewrite the buffer with the live keys only, in sorted order."""
+        data = bytearray()
+        offsets = array("I")
+        for position in range(len(self)):
+            offsets.append(len(data))
+            data.extend(self.key(position))
+        self._data, self._offsets, self._unused = data, offsets, 0
+
+    def prefix_ids(self, prefix: str, limit: int, exclude: set) -> List[int]:
+        """Ids of keys starting with `prefix`, in key order, skipping `exclude`."""
+        encoded = prefix.encode("utf-8")
+        found: List[int] = []
+        position = self._lower_bound(encoded)
+        while position < len(self) and len(found) < limit and self.key(position).startswith(encoded):
+            source_id = self.ids[position]
+            if source_id not in exclude:
+                exclude.add(source_id)
+                found.append(source_id)
+            position += 1
+        return found
+
+
+class SuggestIndex:
+    """Full-name and alias prefix indexes over the station names."""
+
+    def __init__(self, names: Optional[Dict[int, str]] = None):
+        self.names: Dict[int, str] = dict(names or {})
+        full: List[Tuple[str, int]] = []
+        aliases: List[Tuple[str, int]] = []
+        for source_id, name in self.names.items():
+            normalized = normalize_name(name)
+            full.append((normalized, source_id))
+            aliases.extend((alias, source_id) for alias in name_aliases(normalized))
+        self.full = SortedKeys(full)
+        self.aliases = SortedKeys(aliases)
+
+    def add(self, source_id: int, name: str) -> None:
+        normalized = normalize_name(name)
+        self.full.add(normalized, source_id)
+        for alias in name_aliases(normalized):
+            self.aliases.add(alias, source_id)
+        self.names[source_id] = name
+
+    def remove(self, source_id: int) -> None:
+        name = self.names.pop(source_id, None)
+        if name is None:
+            return
+        normalized = normalize_name(name)
+        self.full.remove(normalized, source_id)
+        for alias in name_aliases(normalized):
+            self.aliases.remove(alias, source_id)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """Top `limit` (id, name) pairs: names starting with `prefix` first, then names with a word starting with it."""
+        normalized = normalize_name(prefix)
+        if not normalized:
+            return []
+        seen: set = set()
+        ids = self.full.prefix_ids(normalized, limit, seen)
+        if len(ids) < limit:
+            ids.extend(self.aliases.prefix_ids(normalized, limit - len(ids), seen))
+        return [(source_id, self.names[source_id]) for source_id in ids]
+
+
+class SuggestIndexService:
+    """Keeps the SuggestIndex in step with the catalog version."""
+
+    def __init__(self, session_factory: Callable[[], Session] = default_session_factory,
+                 refresh_interval_seconds: float = 1.0):
+        self.session_factory = session_factory
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.index: Optional[SuggestIndex] = None
+        self.version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # held for a whole refresh, so two refreshes never apply the same changes side by side
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="suggest-index")
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        self.refresh_if_due()
+        return self._suggest(prefix, limit)
+
+    async def suggest_async(self, session: AsyncSession, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        `suggest` for async routes: the catalog version is read on the request's AsyncSession.
+
+        Only the very first call waits for the index (built on the threadpool); after a
+        catalog change the previous index answers until the background refresh is done.
+
+        Raises:
+            RuntimeError: if the index could not be built (e.g. the database is unavailable)
+        """
+        if self.index is None:
+            try:
+                await run_in_threadpool(self.refresh)
+            except Exception:
+                logger.exception("Suggest index build failed")
+        elif time.monotonic() - self._checked_at >= self.refresh_interval_seconds:
+            self._checked_at = time.monotonic()
+            if await AsyncCatalogVersionRepository(session).get_version() != self.version:
+                self.schedule_refresh()
+        return self._suggest(prefix, limit)
+
+    def _suggest(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        with self._lock:
+            if self.index is None:
+                raise RuntimeError("Suggest index is not available yet")
+            return self.index.suggest(prefix, limit)
+
+    def refresh_if_due(self) -> None:
+        if self.index is not None and time.monotonic() - self._checked_at < self.refresh_interval_seconds:
+            return
+        self.refresh()
+
+    def schedule_refresh(self) -> None:
+        """Refresh on the background thread unless a refresh is already running (e.g. to warm the index)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._executor.submit(self._refresh_in_background)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Suggest index refresh failed")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> bool:
+        """Apply catalog changes to the index. Returns True when the index changed."""
+        with self._refresh_lock:
+            session = self.session_factory()
+            try:
+                return self._refresh(session)
+            finally:
+                session.close()
+
+    def _refresh(self, session: Session) -> bool:
+        version = CatalogVersionRepository(session).get_version()
+        self._checked_at = time.monotonic()
+        index, indexed_version = self.index, self.version
+        if index is not None and indexed_version is not None and version == indexed_version:
+            return False
+        sources = RadioSourceRepository(session)
+        if index is None or indexed_version is None \
+                or CatalogVersionRepository(session).get_compacted_version() > indexed_version:
+            self._rebuild(version, dict(sources.find_names()))
+            return True
+        max_changes = max(1, int(FULL_REBUILD_RATIO * len(index.names)))
+        changes = CatalogChangeRepository(session).find_since(indexed_version, max_changes + 1)
+        if len(changes) > max_changes:
+            self._rebuild(version, dict(sources.find_names()))
+            return True
+        upsert_ids = [change.radio_source_id for change in changes if change.op == CHANGE_UPSERT]
+        names = dict(sources.find_names(upsert_ids)) if upsert_ids else {}
+        # an upserted station missing from `names` was deleted in the meantime
+        removed = [change.radio_source_id for change in changes if change.radio_source_id not in names]
+        changed = [(source_id, name) for source_id, name in names.items() if index.names.get(source_id) != name]
+        with self._lock:
+            for source_id in removed:
+                index.remove(source_id)
+            for source_id, name in changed:
+                index.remove(source_id)
+                index.add(source_id, name)
+            self.version = version
+        return True
+
+    def _rebuild(self, version: int, names: Dict[int, str]) -> None:
+        # sorting every name is the slow part: build before taking the lock so lookups keep being answered
+        rebuilt = SuggestIndex(names)
+        with self._lock:
+            self.index = rebuilt
+            self.version = version
+
+# Shared by every request in this process
+suggest_index = SuggestIndexService()
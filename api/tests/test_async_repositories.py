@@ -0,0 +1,34 @@
+import asyncio
+
+from deps import db_manager, get_db_session
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository, CatalogVersionRepository
+from model.repository.radio_source_repository import AsyncRadioSourceRepository, RadioSourceRepository
+from model.repository.stream_type_repository import AsyncStreamTypeRepository, StreamTypeRepository
+
+
+async def _read_async(work):
+    async with db_manager.async_session_factory() as session:
+        return await work(session)
+
+
+def test_async_reads_match_sync_reads():
+    sync_repo = RadioSourceRepository(get_db_session())
+    items, total, next_cursor = sync_repo.find_page(sort="-id", limit=2)
+
+    async def work(session):
+        repo = AsyncRadioSourceRepository(session)
+        return (await repo.find_page(sort="-id", limit=2),
+                await repo.find_by_id(items[0].id) if items else None,
+                await repo.find_names(),
+                await AsyncStreamTypeRepository(session).find_all(),
+                await AsyncCatalogVersionRepository(session).get_version())
+
+    (async_items, async_total, async_cursor), by_id, names, stream_types, version = asyncio.run(_read_async(work))
+
+    assert [r.id for r in async_items] == [r.id for r in items]
+    assert (async_total, async_cursor) == (total, next_cursor)
+    if items:
+        assert by_id.id == items[0].id and by_id.stream_type is not None
+    assert sorted(names) == sorted(sync_repo.find_names())
+    assert len(stream_types) == StreamTypeRepository(get_db_session()).count()
+    assert version == CatalogVersionRepository(get_db_session()).get_version()
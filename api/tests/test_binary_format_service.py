@@ -0,0 +1,45 @@
+import pytest
+
+from api.services.binary_format_service import encode, encode_cbor, encode_msgpack, list_body
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "c0"), (True, "c3"), (False, "c2"),
+    (0, "00"), (127, "7f"), (128, "cc80"), (65535, "cdffff"), (2 ** 32, "cf0000000100000000"),
+    (-1, "ff"), (-32, "e0"), (-33, "d0df"), (-129, "d1ff7f"),
+    (1.5, "cb3ff8000000000000"),
+    ("a", "a161"), ("x" * 32, "d920" + "78" * 32),
+    ([1, [2, 3]], "9201920203"), ({"a": 1}, "81a16101"),
+    (list(range(16)), "dc0010" + "".join(f"{i:02x}" for i in range(16))),
+])
+def test_msgpack_spec_vectors(value, expected):
+    assert encode_msgpack(value).hex() == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "f6"), (True, "f5"), (False, "f4"),
+    (0, "00"), (23, "17"), (24, "1818"), (1000, "1903e8"), (1000000, "1a000f4240"),
+    (-1, "20"), (-100, "3863"),
+    (1.1, "fb3ff199999999999a"),
+    ("", "60"), ("IETF", "6449455446"), ("ü", "62c3bc"),
+    ([1, [2, 3]], "8201820203"), ({"a": 1, "b": [2, 3]}, "a26161016162820203"),
+])
+def test_cbor_spec_vectors(value, expected):
+    assert encode_cbor(value).hex() == expected
+
+
+def test_unsupported_values_are_rejected():
+    with pytest.raises(TypeError):
+        encode("msgpack", object())
+    with pytest.raises(TypeError):
+        encode("cbor", b"raw")
+
+
+@pytest.mark.parametrize("fmt", ["msgpack", "cbor"])
+def test_list_body_matches_encoding_the_whole_document(fmt):
+    items = [{"id": 1, "name": "Radio 1"}, {"id": 2, "name": "Radio 2"}]
+    fragments = [encode(fmt, item) for item in items]
+
+    body = list_body(fmt, fragments, total=7, page=1, page_size=2, next_cursor="c1")
+
+    assert body == encode(fmt, {"items": items, "total": 7, "page": 1, "page_size": 2, "next_cursor": "c1"})
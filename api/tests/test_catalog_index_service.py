@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.catalog_index_service import CatalogIndex, CatalogIndexService
+from deps import get_db_session
+from model.repository.radio_source_repository import RadioSourceRepository
+
+START = datetime(2024, 1, 1)
+NAMES = ["Radio Paradise", "radio swiss jazz", "FIP", "Radio Paradise", "Jazz FM", "Rádio Comercial", "BBC Radio 1"]
+
+
+def _rows():
+    # (id, name, stream_type_id, country, is_secure, created_at, bitrate)
+    return [(source_id, NAMES[i % len(NAMES)], 1 + i % 3, [None, "CH", "FR", "GB"][i % 4], i % 2 == 0,
+             START + timedelta(hours=i % 5), 128000 if i % 3 else None)
+            for i, source_id in enumerate(range(40, 0, -1))]
+
+
+def _expected(rows, q=None, stream_type_id=None, country=None, sort="name"):
+    name = sort.lstrip("-")
+    column = {"id": 0, "name": 1, "created_at": 5}[name]
+    matching = [row for row in rows if (not q or q.lower() in row[1].lower())
+                and (stream_type_id is None or row[2] == stream_type_id) and (not country or row[3] == country)]
+    matching.sort(key=lambda row: (row[column], row[0]), reverse=sort.startswith("-"))
+    return [row[0] for row in matching]
+
+
+@pytest.mark.parametrize("filters", [{}, {"q": "radio"}, {"q": "JAZZ", "country": "CH"}, {"stream_type_id": 2},
+                                     {"country": "XX"}, {"q": "rádio"}])
+@pytest.mark.parametrize("sort", ["name", "-name", "created_at", "-created_at", "id", "-id"])
+def test_cursor_pages_walk_the_filtered_order(filters, sort):
+    rows = _rows()
+    index = CatalogIndex.from_rows(1, rows)
+    expected = _expected(rows, sort=sort, **filters)
+
+    seen, cursor = [], None
+    while True:
+        ids, total, cursor = index.find_page(sort=sort, limit=3, cursor=cursor, **filters)
+        assert total == len(expected)
+        seen.extend(ids)
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # offset pages agree with the cursor walk
+    assert index.find_page(sort=sort, limit=3, offset=3, **filters)[0] == expected[3:6]
+
+
+def test_changes_are_applied_without_a_rebuild():
+    rows = _rows()
+    index = CatalogIndex.from_rows(1, rows)
+    renamed = (40, "Zeta Radio", 3, "IT", True, START, 64000)
+    added = (99, "Jazz FM", 1, "IT", False, START, None)
+    inserted = (98, "Alpha Radio", 2, None, False, START, None)
+
+    changed = index.with_changes(2, [renamed, added, inserted], deleted_ids=[39])
+
+    expected_rows = [row for row in rows if row[0] not in (40, 39)] + [renamed, added, inserted]
+    assert changed.version == 2 and changed.total == len(rows) + 1
+    for sort in ("name", "-name", "id"):
+        assert changed.find_page(sort=sort, limit=100)[0] == _expected(expected_rows, sort=sort)
+    assert changed.find_page(q="radio", limit=100)[0] == _expected(expected_rows, q="radio")
+    assert changed.find_page(country="IT", limit=100)[0] == [99, 40]
+    assert changed.row_of(39) is None and changed.ids[changed.row_of(99)] == 99
+    # the previous index is untouched
+    assert index.row_of(39) is not None and index.find_page(country="IT")[1] == 0
+
+
+def test_invalid_sort_or_cursor_is_rejected():
+    index = CatalogIndex.from_rows(1, _rows())
+    with pytest.raises(ValueError):
+        index.find_page(sort="description")
+    with pytest.raises(ValueError):
+        index.find_page(cursor="not-a-cursor")
+    assert not index.supports("100%") and index.supports("radio")
+
+
+def test_service_applies_the_change_feed(monkeypatch):
+    state = SimpleNamespace(version=1, compacted=0, rows=_rows()[:5], changes=[])
+
+    class Versions:
+        def __init__(self, _session): pass
+        def get_version(self): return state.version
+        def get_compacted_version(self): return state.compacted
+
+    class Changes:
+        def __init__(self, _session): pass
+        def find_since(self, since, limit): return state.changes[:limit]
+
+    class Sources:
+        def __init__(self, _session): pass
+        def find_index_rows(self, ids=None):
+            return [row for row in state.rows if ids is None or row[0] in ids]
+
+    import api.services.catalog_index_service as module
+    monkeypatch.setattr(module, "CatalogVersionRepository", Versions)
+    monkeypatch.setattr(module, "CatalogChangeRepository", Changes)
+    monkeypatch.setattr(module, "RadioSourceRepository", Sources)
+    built = []
+    from_rows = CatalogIndex.from_rows
+    monkeypatch.setattr(CatalogIndex, "from_rows", classmethod(
+        lambda cls, version, rows: built.append((version, len(rows))) or from_rows.__func__(cls, version, rows)))
+    service = CatalogIndexService(session_factory=lambda: SimpleNamespace(close=lambda: None))
+
+    assert service.get().total == 5
+    state.version, state.rows = 2, state.rows[1:]
+    state.changes = [SimpleNamespace(radio_source_id=state.rows[0][0] + 1, op="delete")]
+    assert service.get().total == 4 and service.version == 2
+    assert service.index.find_page(limit=10)[1] == 4
+
+    # the change feed was compacted past the index: rebuilt from every row
+    state.version, state.compacted = 3, 3
+    service.get()
+    # version 2 was applied to the arrays, not built from rows
+    assert built == [(1, 5), (3, 4)]
+
+
+def test_get_async_catches_up_before_answering(monkeypatch):
+    state = SimpleNamespace(version=1, compacted=0, rows=_rows()[:5])
+
+    class Versions:
+        def __init__(self, _session): pass
+        def get_version(self): return state.version
+        def get_compacted_version(self): return state.compacted
+
+    class AsyncVersions(Versions):
+        async def get_version(self): return state.version
+
+    class Sources:
+        def __init__(self, _session): pass
+        def find_index_rows(self, ids=None): return list(state.rows)
+
+    import api.services.catalog_index_service as module
+    monkeypatch.setattr(module, "CatalogVersionRepository", Versions)
+    monkeypatch.setattr(module, "AsyncCatalogVersionRepository", AsyncVersions)
+    monkeypatch.setattr(module, "RadioSourceRepository", Sources)
+    service = CatalogIndexService(session_factory=lambda: SimpleNamespace(close=lambda: None))
+
+    # cold: the first call builds the index (off the event loop)
+    first = asyncio.run(service.get_async(None))
+    assert first.total == 5
+    assert asyncio.run(service.get_async(None)) is first
+
+    # the catalog changed: the index is updated before the request is answered
+    state.version, state.compacted, state.rows = 2, 2, state.rows[1:]
+    current = asyncio.run(service.get_async(None))
+    assert current.version == service.version == 2 and current.total == 4
+
+
+def test_index_pages_match_sql_pages():
+    repo = RadioSourceRepository(get_db_session())
+    index = CatalogIndex.from_rows(0, repo.find_index_rows())
+
+    # created_at keysets are left out: SQLite compares the stored text, see the created_at cases above
+    for sort in ("name", "-name", "id", "-id"):
+        items, total, next_cursor = repo.find_page(sort=sort, limit=2)
+        assert index.find_page(sort=sort, limit=2) == ([item.id for item in items], total, next_cursor)
+        if next_cursor:
+            items, _, _ = repo.find_page(sort=sort, limit=2, cursor=next_cursor)
+            assert index.find_page(sort=sort, limit=2, cursor=next_cursor)[0] == [item.id for item in items]
+
+
+def test_failed_background_refresh_is_logged(caplog):
+    def broken_session():
+        raise ConnectionError("database is gone")
+
+    service = CatalogIndexService(session_factory=broken_session)
+    service._refresh_in_background()
+
+    assert "Catalog index refresh failed" in caplog.text and "database is gone" in caplog.text
+    assert not service._refreshing
@@ -0,0 +1,61 @@
+import gzip
+import json
+
+from api.services.binary_format_service import encode
+from api.services.catalog_snapshot_file_service import (SNAPSHOT_FILE_NAME, MappedCatalogSnapshot, open_snapshot_file,
+                                                        write_snapshot_file)
+from api.services.catalog_snapshot_service import CatalogSnapshot, CatalogSnapshotService
+
+
+def _snapshot(version=7, count=5):
+    documents = [{"id": 10 * (count - i), "name": f"Radio {i}", "stream_url": f"http://example.com/{i}"}
+                 for i in range(count)]
+    fragments = [json.dumps(document).encode() for document in documents]
+    binary = {fmt: [encode(fmt, document) for document in documents] for fmt in ("msgpack", "cbor")}
+    return CatalogSnapshot(version, fragments, [f"c{i}" for i in range(count)], binary,
+                           ids=[document["id"] for document in documents])
+
+
+def test_mapped_snapshot_serves_the_same_bodies(tmp_path):
+    snapshot = _snapshot()
+    path = str(tmp_path / SNAPSHOT_FILE_NAME)
+    write_snapshot_file(path, snapshot)
+
+    mapped = MappedCatalogSnapshot(path)
+
+    assert (mapped.version, mapped.total) == (7, 5)
+    for fmt in ("json", "msgpack", "cbor"):
+        assert mapped.page(2, 2, fmt) == snapshot.page(2, 2, fmt)
+        assert gzip.decompress(mapped.page(2, 2, fmt, compressed=True)) == snapshot.page(2, 2, fmt)
+        assert mapped.export(fmt) == snapshot.export(fmt)
+    assert mapped.export_body == snapshot.export_body
+    assert mapped.source(30) == snapshot.source(30) == b'{"id": 30, "name": "Radio 2", "stream_url": "http://example.com/2"}'
+    assert mapped.source(30, "cbor") == snapshot.source(30, "cbor")
+    assert mapped.source(31) is None
+
+
+def test_missing_or_foreign_file_is_not_mapped(tmp_path):
+    assert open_snapshot_file(str(tmp_path / "missing")) is None
+    foreign = tmp_path / "foreign"
+    foreign.write_bytes(b"not a snapshot" * 10)
+    assert open_snapshot_file(str(foreign)) is None
+
+
+def test_workers_share_one_build(tmp_path, monkeypatch):
+    builds = []
+    workers = [CatalogSnapshotService(session_factory=lambda: None, snapshot_dir=str(tmp_path)) for _ in range(2)]
+    for worker in workers:
+        monkeypatch.setattr(worker, "build", lambda: builds.append(1) or _snapshot(version=3))
+        monkeypatch.setattr(worker, "current_version", lambda: 3)
+
+    first, second = (worker.rebuild() for worker in workers)
+
+    assert len(builds) == 1
+    assert isinstance(second, MappedCatalogSnapshot) and second.version == first.version == 3
+    assert second.page(1, 2) == first.page(1, 2)
+
+    # a newer catalog version rewrites the file; the old map keeps working
+    monkeypatch.setattr(workers[1], "build", lambda: builds.append(1) or _snapshot(version=4, count=2))
+    monkeypatch.setattr(workers[1], "current_version", lambda: 4)
+    assert workers[1].rebuild().total == 2
+    assert len(builds) == 2 and first.total == 5 and first.source(50) is not None
@@ -0,0 +1,108 @@
+import asyncio
+import gzip
+import json
+import time
+
+from api.schemas.radio_source import RadioSourceList
+from api.services.binary_format_service import encode
+from api.services.catalog_snapshot_service import CatalogSnapshot, CatalogSnapshotService
+
+
+def _fragment(i):
+    return json.dumps({
+        "id": i, "stream_url": f"http://example.com/{i}", "name": f"Radio {i}", "is_secure": False,
+        "stream_type": {"id": 1, "protocol": "HTTP", "format": "MP3", "metadata_type": "Icecast", "display_name": "HTTP MP3 Icecast"},
+    }).encode()
+
+
+def test_snapshot_pages_match_list_schema():
+    snapshot = CatalogSnapshot(7, [_fragment(i) for i in range(5)], [f"c{i}" for i in range(5)])
+
+    body = snapshot.page(1, 2)
+    page = RadioSourceList.model_validate_json(body)
+    assert [item.id for item in page.items] == [0, 1]
+    assert (page.total, page.page, page.page_size, page.next_cursor) == (5, 1, 2, "c1")
+    assert gzip.decompress(snapshot.page(1, 2, compressed=True)) == body
+
+    last = RadioSourceList.model_validate_json(snapshot.page(3, 2))
+    assert [item.id for item in last.items] == [4]
+    assert last.next_cursor is None
+
+    export = RadioSourceList.model_validate_json(snapshot.export_body)
+    assert export.total == 5 and len(export.items) == 5
+    assert gzip.decompress(snapshot.export_gzip) == snapshot.export_body
+
+
+def test_snapshot_binary_pages_encode_the_same_document():
+    documents = [json.loads(_fragment(i)) for i in range(3)]
+    binary = {fmt: [encode(fmt, document) for document in documents] for fmt in ("msgpack", "cbor")}
+    snapshot = CatalogSnapshot(7, [_fragment(i) for i in range(3)], [f"c{i}" for i in range(3)], binary)
+
+    for fmt in ("msgpack", "cbor"):
+        body = snapshot.page(1, 2, fmt)
+        assert body == encode(fmt, {"items": documents[:2], "total": 3, "page": 1, "page_size": 2, "next_cursor": "c1"})
+        assert gzip.decompress(snapshot.page(1, 2, fmt, compressed=True)) == body
+        export, _ = snapshot.export(fmt)
+        assert export == encode(fmt, {"items": documents, "total": 3, "page": 1, "page_size": 3, "next_cursor": None})
+
+    # JSON pages are cached apart from the binary ones
+    assert RadioSourceList.model_validate_json(snapshot.page(1, 2)).next_cursor == "c1"
+    assert snapshot.export() == (snapshot.export_body, snapshot.export_gzip)
+
+
+def test_page_cache_keeps_recently_used_pages_and_compresses_lazily(monkeypatch):
+    monkeypatch.setattr("api.services.catalog_snapshot_service.MAX_CACHED_PAGES", 2)
+    snapshot = CatalogSnapshot(7, [_fragment(i) for i in range(5)], [f"c{i}" for i in range(5)])
+    compressions = []
+    compress = gzip.compress
+    monkeypatch.setattr("api.services.catalog_snapshot_service.gzip.compress",
+                        lambda data, compresslevel: compressions.append(compresslevel) or compress(data))
+
+    first = snapshot.page(1, 1)
+    snapshot.page(2, 1)
+    assert snapshot.page(1, 1) is first  # hit: page 1 becomes the most recently used
+    snapshot.page(3, 1)  # evicts page 2, not page 1
+    assert snapshot.page(1, 1) is first
+    assert compressions == []
+
+    assert gzip.decompress(snapshot.page(1, 1, compressed=True)) == first
+    assert compressions == [6]
+
+
+def test_stale_snapshot_is_served_while_rebuilding(monkeypatch):
+    service = CatalogSnapshotService(session_factory=lambda: None)
+    builds = []
+    monkeypatch.setattr(service, "build", lambda: builds.append(1) or CatalogSnapshot(len(builds), [], []))
+    monkeypatch.setattr(service, "current_version", lambda: 2)
+    scheduled = []
+    monkeypatch.setattr(service, "schedule_rebuild", lambda: scheduled.append(1))
+
+    first = service.get()
+    assert first.version == 1 and len(builds) == 1
+
+    # version moved on: the old snapshot is returned and a rebuild is scheduled
+    assert service.get() is first
+    assert scheduled == [1]
+    assert service.rebuild().version == 2
+    assert service.get().version == 2
+
+
+def test_cold_burst_shares_one_build(monkeypatch):
+    service = CatalogSnapshotService(session_factory=lambda: None)
+    builds = []
+
+    def slow_build():
+        builds.append(1)
+        time.sleep(0.05)
+        return CatalogSnapshot(1, [], [])
+
+    monkeypatch.setattr(service, "build", slow_build)
+    monkeypatch.setattr(service, "current_version", lambda: 1)
+
+    async def burst():
+        return await asyncio.gather(*(service.get_async(None) for _ in range(8)))
+
+    snapshots = asyncio.run(burst())
+
+    assert len(builds) == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots) and service.get() is snapshots[0]
@@ -0,0 +1,18 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_importing_the_api_loads_no_flask_and_opens_no_engine():
+    # fresh interpreter: other API tests stub modules in sys.modules
+    code = ("import json, sys, main, database; print(json.dumps({"
+            "'modules': sorted(m for m in ('flask', 'flask_sqlalchemy', 'flask_login', 'passlib') if m in sys.modules), "
+            "'engine': database.db_manager._engine is not None}))")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(API_DIR), str(API_DIR.parent)])}
+    result = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=env, capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {"modules": [], "engine": False}
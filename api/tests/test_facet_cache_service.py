@@ -0,0 +1,60 @@
+import asyncio
+
+from api.schemas.radio_source import RadioSourceFacets
+from api.services.facet_cache_service import FacetCacheService
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository
+from model.repository.radio_source_repository import AsyncRadioSourceRepository
+
+
+def test_facets_cached_per_filter_set_until_version_changes(monkeypatch):
+    version = {"value": 3}
+    queries = []
+
+    async def get_version(self):
+        return version["value"]
+
+    async def count_facets(self, q=None, stream_type_id=None, country=None):
+        queries.append((q, stream_type_id, country))
+        return {"stream_type": [(1, "HTTP MP3 Icecast", 2)], "country": [("IT", None, 2)],
+                "is_secure": [(False, None, 2)], "codec": [("MP3", None, 2)], "bitrate": []}
+
+    monkeypatch.setattr(AsyncCatalogVersionRepository, "get_version", get_version)
+    monkeypatch.setattr(AsyncRadioSourceRepository, "count_facets", count_facets)
+    cache = FacetCacheService(max_entries=2)
+
+    got_version, facets = asyncio.run(cache.get_async(None, country="IT"))
+    assert got_version == 3
+    assert isinstance(facets, RadioSourceFacets) and facets.total == 2
+    asyncio.run(cache.get_async(None, country="IT"))
+    assert queries == [(None, None, "IT")]
+
+    asyncio.run(cache.get_async(None, q="jazz"))
+    assert len(queries) == 2
+
+    # a catalog write invalidates every filter set
+    version["value"] = 4
+    asyncio.run(cache.get_async(None, country="IT"))
+    assert len(queries) == 3
+
+
+def test_facets_are_recomputed_once_too_old(monkeypatch):
+    queries = []
+
+    async def get_version(self):
+        return 3
+
+    async def count_facets(self, q=None, stream_type_id=None, country=None):
+        # the bitrate facet follows the track history, which does not move the catalog version
+        queries.append(q)
+        return {"stream_type": [], "country": [], "is_secure": [(False, None, 2)], "codec": [],
+                "bitrate": [("128-191", None, len(queries))]}
+
+    monkeypatch.setattr(AsyncCatalogVersionRepository, "get_version", get_version)
+    monkeypatch.setattr(AsyncRadioSourceRepository, "count_facets", count_facets)
+    cache = FacetCacheService(max_age_seconds=0)
+
+    _, first = asyncio.run(cache.get_async(None))
+    _, second = asyncio.run(cache.get_async(None))
+
+    assert len(queries) == 2
+    assert (first.bitrate[0].count, second.bitrate[0].count) == (1, 2)
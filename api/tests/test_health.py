@@ -8,3 +8,36 @@ def test_health():
     resp = client.get("/api/v1/health")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
+
+
+def test_metrics_are_labelled_by_route_template():
+    client.get("/api/v1/health")
+    client.get("/api/v1/stream_types/987654")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/health",status="200"}' in resp.text
+    assert 'route="/api/v1/stream_types/{stream_type_id}"' in resp.text
+    assert "987654" not in resp.text
+
+
+def test_ready_returns_503_while_not_ready():
+    from api.schemas.health import CacheCheck, DatabaseCheck, ProbeCheck, ReadinessOut
+    from routes.health import get_readiness_service
+
+    class WarmingService:
+        async def check_async(self, session):
+            return ReadinessOut(status="warming", ready=False, catalog_version=3,
+                                database=DatabaseCheck(ok=True, latency_ms=0.2),
+                                probes=ProbeCheck(ffprobe=True, ffmpeg=True, in_flight=0, max_in_flight=8, brownout=False),
+                                caches=CacheCheck(warm=False))
+
+    app.dependency_overrides[get_readiness_service] = lambda: WarmingService()
+    try:
+        resp = client.get("/api/v1/ready")
+    finally:
+        app.dependency_overrides.pop(get_readiness_service, None)
+
+    assert resp.status_code == 503
+    assert resp.headers["cache-control"] == "no-store"
+    assert resp.json()["status"] == "warming"
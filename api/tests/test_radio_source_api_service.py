@@ -52,4 +52,43 @@ def test_get_stream_type_repo_returns_new_instance_each_call(monkeypatch):
 
     assert repo1 is not repo2
     assert repo1.session is sentinel_session
-    assert repo2.session is sentinel_session
\ No newline at end of file
+    assert repo2.session is sentinel_session
+
+def test_metadata_batch_gives_ffprobe_only_what_the_harvest_left(monkeypatch):
+    from types import SimpleNamespace
+
+    clock = [100.0]
+    monkeypatch.setattr("api.services.radio_source_api_service.time.monotonic", lambda: clock[0])
+    source = SimpleNamespace(id=1, stream_url="http://ice.example:8000/live",
+                             stream_type=SimpleNamespace(metadata_type="Icecast"))
+
+    class FakeRepo:
+        def find_by_ids(self, ids):
+            return [source]
+
+    class FakeMetadataService:
+        is_available = True
+
+        def get_cached_metadata(self, url):
+            return None
+
+        def get_metadata_many(self, urls, timeout_seconds, max_parallel=None):
+            self.timeout_seconds = timeout_seconds
+            return {}
+
+    class SlowServerStatus:
+        def harvest(self, stations, timeout_seconds):
+            clock[0] += 4.0
+            return {}
+
+    metadata_service = FakeMetadataService()
+    svc = RadioSourceAPIService()
+    monkeypatch.setattr(svc, "get_radio_source_repo", lambda: FakeRepo())
+    monkeypatch.setattr(svc, "get_stream_metadata_service", lambda: metadata_service)
+    monkeypatch.setattr(svc, "get_server_status_service", lambda: SlowServerStatus())
+    monkeypatch.setattr(svc, "get_track_history_service", lambda: None)
+
+    result = svc.get_stream_metadata_many([1], timeout_seconds=10)
+
+    assert metadata_service.timeout_seconds == 6.0
+    assert result.pending == [1]
@@ -0,0 +1,111 @@
+import asyncio
+
+from api.services.readiness_service import ReadinessService
+from model.repository.catalog_version_repository import AsyncCatalogVersionRepository
+from service.admission_control_service import AdmissionController
+
+
+class FakeSession:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def execute(self, statement):
+        if self.fail:
+            raise ConnectionError("database is gone")
+
+
+class FakeSnapshotService:
+    def __init__(self, version=None):
+        self.version = version
+        self.rebuilds = 0
+
+    def schedule_rebuild(self):
+        self.rebuilds += 1
+
+
+class FakeSuggestService:
+    def __init__(self, version=None):
+        self.version = version
+        self.index = object() if version is not None else None
+        self.refreshes = 0
+
+    def schedule_refresh(self):
+        self.refreshes += 1
+
+
+class FakeFacetService:
+    version = None
+
+
+class FakeIndexService:
+    def __init__(self, version=None):
+        self.version = version
+        self.refreshes = 0
+
+    def schedule_refresh(self):
+        self.refreshes += 1
+
+
+def _service(snapshot_version=None, suggest_version=None, admission=None, index_version=None):
+    return ReadinessService(FakeSnapshotService(snapshot_version), FakeSuggestService(suggest_version),
+                            FakeFacetService(), admission or AdmissionController(max_in_flight=2),
+                            FakeIndexService(index_version))
+
+
+def _patch_version(monkeypatch, value=7):
+    async def get_version(self):
+        return value
+    monkeypatch.setattr(AsyncCatalogVersionRepository, "get_version", get_version)
+
+
+def test_cold_worker_is_warming_and_starts_warm_up(monkeypatch):
+    _patch_version(monkeypatch)
+    service = _service()
+
+    report = asyncio.run(service.check_async(FakeSession()))
+
+    assert report.status == "warming" and not report.ready
+    assert report.catalog_version == 7
+    assert report.database.ok and report.database.latency_ms is not None
+    assert service.snapshot_service.rebuilds == 1
+    assert service.suggest_service.refreshes == 1
+    assert service.index_service.refreshes == 1
+
+
+def test_cold_catalog_index_keeps_the_worker_warming(monkeypatch):
+    _patch_version(monkeypatch)
+    service = _service(7, 7)
+
+    report = asyncio.run(service.check_async(FakeSession()))
+
+    assert report.status == "warming" and not report.caches.warm
+    assert report.caches.catalog_index_version is None
+    assert service.index_service.refreshes == 1 and service.snapshot_service.rebuilds == 0
+
+
+def test_warm_worker_is_ready_until_probes_saturate(monkeypatch):
+    _patch_version(monkeypatch)
+    admission = AdmissionController(max_in_flight=2, brownout_ratio=1.0)
+    service = _service(7, 7, admission, 7)
+
+    report = asyncio.run(service.check_async(FakeSession()))
+    assert report.ready and report.status in ("ready", "degraded")
+    assert report.caches.warm and report.caches.catalog_snapshot_version == report.caches.catalog_index_version == 7
+    assert service.snapshot_service.rebuilds == 0
+
+    tickets = [admission.try_acquire(f"10.0.0.{i}") for i in range(2)]
+    report = asyncio.run(service.check_async(FakeSession()))
+    assert report.status == "saturated" and not report.ready
+    assert report.probes.in_flight == 2
+
+    for ticket in tickets:
+        ticket.release()
+    assert asyncio.run(service.check_async(FakeSession())).ready
+
+
+def test_database_failure_is_unavailable():
+    report = asyncio.run(_service(7, 7, index_version=7).check_async(FakeSession(fail=True)))
+
+    assert report.status == "unavailable" and not report.ready
+    assert report.database.ok is False
+    assert "database is gone" in report.database.error
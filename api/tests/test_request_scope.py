@@ -0,0 +1,68 @@
+import deps
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from api.main import app
+from api.routes.radio_sources import get_radio_source_api_service
+
+client = TestClient(app)
+
+
+def test_request_db_session_is_closed_at_teardown(monkeypatch):
+    closed = []
+
+    class FakeSession:
+        def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(deps, "session_factory", FakeSession)
+    dependency = deps.get_request_db_session()
+    session = next(dependency)
+    assert isinstance(session, FakeSession) and closed == []
+
+    dependency.close()
+    assert closed == [session]
+
+
+def test_sync_route_uses_a_fresh_session_per_request():
+    sessions = []
+    original = deps.session_factory
+
+    def tracking_session():
+        session = original()
+        sessions.append(session)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[deps.get_request_db_session] = tracking_session
+    try:
+        for _ in range(2):
+            assert client.get("/api/v1/sources/1/history").status_code in (200, 404)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(sessions) == 2 and sessions[0] is not sessions[1]
+
+
+def test_dependencies_of_one_request_share_its_session(monkeypatch):
+    sessions = []
+
+    class FakeSession:
+        def __init__(self):
+            self.closed = False
+            sessions.append(self)
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(deps, "session_factory", FakeSession)
+    probe = FastAPI()
+
+    @probe.get("/probe")
+    def probe_route(service=Depends(get_radio_source_api_service), session=Depends(deps.get_request_db_session)):
+        return {"shared": service.db_session is session, "open": not session.closed}
+
+    assert TestClient(probe).get("/probe").json() == {"shared": True, "open": True}
+    assert len(sessions) == 1 and sessions[0].closed
+
@@ -0,0 +1,55 @@
+import deps
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.main import app
+from api.services.catalog_index_service import catalog_index
+from model.entity.base import Base
+from model.entity.radio_source import RadioSource
+from model.entity.stream_type import StreamType
+from model.repository.radio_source_repository import RadioSourceRepository
+from model.repository.stream_type_repository import StreamTypeRepository
+
+client = TestClient(app)
+
+
+def test_revalidation_after_a_write_gets_the_new_listing(tmp_path, monkeypatch):
+    path = tmp_path / "index.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        stream_type = StreamTypeRepository(session).save(
+            StreamType(protocol="HTTP", format="MP3", metadata_type="Icecast", display_name="HTTP MP3 Icecast"))
+        stream_type_id = stream_type.id
+        repo = RadioSourceRepository(session)
+        for name in ("a", "b"):
+            repo.save(RadioSource(stream_url=f"http://index.example/{name}", name=name,
+                                  stream_type_id=stream_type_id, is_secure=False))
+
+    factory = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+
+    async def temp_session():
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr(catalog_index, "session_factory", sessionmaker(engine))
+    monkeypatch.setattr(catalog_index, "index", None)
+    app.dependency_overrides[deps.get_async_db_session] = temp_session
+    try:
+        first = client.get("/api/v1/sources/?sort=-id")
+        etag = first.headers["etag"]
+        assert [item["name"] for item in first.json()["items"]] == ["b", "a"]
+
+        with Session(engine) as session:
+            RadioSourceRepository(session).save(RadioSource(stream_url="http://index.example/c", name="c",
+                                                            stream_type_id=stream_type_id, is_secure=False))
+
+        revalidated = client.get("/api/v1/sources/?sort=-id", headers={"If-None-Match": etag})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert revalidated.status_code == 200 and revalidated.headers["etag"] != etag
+    assert [item["name"] for item in revalidated.json()["items"]] == ["c", "b", "a"]
+    assert revalidated.json()["total"] == 3
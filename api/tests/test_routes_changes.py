@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import deps
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from api.main import app
+from model.entity.base import Base
+from model.entity.radio_source import RadioSource
+from model.entity.stream_type import StreamType
+from model.repository.catalog_change_repository import CatalogChangeRepository
+from model.repository.radio_source_repository import RadioSourceRepository
+from model.repository.stream_type_repository import StreamTypeRepository
+
+client = TestClient(app)
+
+
+def _source(stream_type, name):
+    return RadioSource(stream_url=f"http://changes.example/{name}", name=name, stream_type_id=stream_type.id,
+                       is_secure=False)
+
+
+def test_client_pages_to_the_end_after_a_compaction(tmp_path):
+    path = tmp_path / "changes.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        stream_type = StreamTypeRepository(session).save(
+            StreamType(protocol="HTTP", format="MP3", metadata_type="Icecast", display_name="HTTP MP3 Icecast"))
+        repo = RadioSourceRepository(session)
+        kept = [repo.save(_source(stream_type, name)).id for name in ("a", "b", "c")]
+        gone = repo.save(_source(stream_type, "gone")).id
+        repo.delete(gone)
+        # drop the tombstone: a client that synced before it must start over
+        CatalogChangeRepository(session).compact(tombstones_before=datetime.now() + timedelta(seconds=1))
+        session.commit()
+        kept.append(repo.save(_source(stream_type, "d")).id)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def temp_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[deps.get_async_db_session] = temp_session
+    try:
+        pages = []
+        since = 1
+        for _ in range(10):
+            data = client.get(f"/api/v1/sources/changes?since={since}&limit=1").json()
+            pages.append(data)
+            since = data["version"]
+            if not data["has_more"]:
+                break
+    finally:
+        app.dependency_overrides.clear()
+
+    assert not pages[-1]["has_more"]
+    assert [page["reset"] for page in pages] == [True] + [False] * (len(pages) - 1)
+    assert [change["id"] for page in pages for change in page["changes"]] == kept
+    assert all(change["op"] == "upsert" for page in pages for change in page["changes"])
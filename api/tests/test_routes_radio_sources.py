@@ -1,3 +1,4 @@
+import json
 import sys
 import types
 from unittest.mock import MagicMock
@@ -18,15 +19,43 @@ class MockRadioSourceList:
 class RadioSourceAPIService:
     def __init__(self, *args, **kwargs):
         pass
+    def get_catalog_version(self):
+        return 0
     def get_all_radio_sources(self):
         return MockRadioSourceList()
+    def list_sources(self, **kwargs):
+        return MockRadioSourceList()
     def get_radio_source(self, _id):
         return None
     def get_listen_metadata(self, _id):
         return None
+    async def get_catalog_version_async(self, _session):
+        return 0
+    async def list_sources_async(self, _session, **kwargs):
+        return MockRadioSourceList()
+    async def list_source_fields_async(self, _session, _fields, **kwargs):
+        return b'{"items":[],"total":0,"page":1,"page_size":20,"next_cursor":null}'
+    async def get_changes_async(self, _session, since, limit=500):
+        return {"since": since, "version": since, "reset": False, "has_more": False, "changes": []}
+    async def export_ndjson_async(self):
+        yield b""
+    async def get_radio_source_async(self, _session, _id):
+        return None
+    async def get_radio_sources_async(self, _session, ids):
+        return {"items": [None for _ in ids], "missing": list(ids)}
+    async def get_listen_metadata_async(self, _session, _id):
+        return None
+
+
+def parse_fields(fields):
+    parsed = [field for field in fields.split(",") if field]
+    if not set(parsed) <= {"id", "name", "stream_url", "stream_type.display_name"}:
+        raise ValueError("Unsupported field")
+    return parsed
 
 
 service_mod.RadioSourceAPIService = RadioSourceAPIService
+service_mod.parse_fields = parse_fields
 sys.modules["api.services.radio_source_api_service"] = service_mod
 # Also stub as 'services.radio_source_api_service' to handle different import styles
 sys.modules["services.radio_source_api_service"] = service_mod
@@ -61,3 +90,117 @@ def test_get_radio_source_found_smoke():
     data = resp.json()
     assert isinstance(data, dict)
 
+
+def test_list_sources_not_modified_smoke():
+    resp = client.get("/api/v1/sources/?page_size=5")
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    assert "max-age" in resp.headers["cache-control"]
+
+    resp = client.get("/api/v1/sources/?page_size=5", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+    # a different representation has a different ETag
+    resp = client.get("/api/v1/sources/?page_size=6", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+def test_list_sources_sparse_fields_smoke():
+    resp = client.get("/api/v1/sources/?fields=id,name,stream_type.display_name&page_size=5")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert resp.headers["etag"]
+    for item in data["items"]:
+        assert set(item) == {"id", "name", "stream_type"}
+        assert set(item["stream_type"]) == {"display_name"}
+
+    resp = client.get("/api/v1/sources/?fields=id,secret")
+    assert resp.status_code == 400
+
+
+def test_export_catalog_smoke():
+    resp = client.get("/api/v1/sources/export.json")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == len(data["items"])
+
+    resp = client.get("/api/v1/sources/export.json", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json()["total"] == data["total"]
+
+    resp = client.get("/api/v1/sources/export.json", headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+
+def test_export_catalog_ndjson_smoke():
+    resp = client.get("/api/v1/sources/export.ndjson")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert all("id" in line and "stream_type" in line for line in lines)
+
+    resp = client.get("/api/v1/sources/export.ndjson", headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+
+def test_list_changes_smoke():
+    resp = client.get("/api/v1/sources/changes?since=0&limit=2")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["changes"]) <= 2
+    versions = [change["version"] for change in data["changes"]]
+    assert versions == sorted(versions)
+    assert all((change["op"] == "upsert") == (change["source"] is not None) for change in data["changes"])
+
+    # the returned version is the next sync point
+    resp = client.get(f"/api/v1/sources/changes?since={data['version']}")
+    assert resp.status_code == 200
+    assert all(change["version"] > data["version"] for change in resp.json()["changes"])
+
+
+def test_batch_lookup_keeps_request_order_smoke():
+    resp = client.get("/api/v1/sources/?ids=999999,1")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["items"]) == 2
+    assert data["items"][0] is None and 999999 in data["missing"]
+
+    resp = client.post("/api/v1/sources/batch", json={"ids": [1, 999999, 1]})
+    assert resp.status_code == 200
+    assert len(resp.json()["items"]) == 2
+
+    assert client.post("/api/v1/sources/batch", json={"ids": list(range(1, 200))}).status_code == 400
+    assert client.get("/api/v1/sources/?ids=a,b").status_code == 400
+
+
+def test_facets_smoke():
+    resp = client.get("/api/v1/sources/facets")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == sum(entry["count"] for entry in data["is_secure"])
+    assert set(data) >= {"stream_type", "country", "codec", "bitrate"}
+
+    resp = client.get("/api/v1/sources/facets", headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+
+def test_list_sources_negotiates_binary_formats_smoke():
+    json_resp = client.get("/api/v1/sources/?page_size=5")
+    for media_type, map_header in (("application/msgpack", 0x85), ("application/cbor", 0xa5)):
+        resp = client.get("/api/v1/sources/?page_size=5", headers={"Accept": media_type})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == media_type
+        assert "Accept" in resp.headers["vary"]
+        assert resp.content[0] == map_header
+        assert resp.headers["etag"] != json_resp.headers["etag"]
+
+        resp = client.get("/api/v1/sources/export", headers={"Accept": media_type})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == media_type
+
+    # browsers and wildcards keep getting JSON
+    resp = client.get("/api/v1/sources/export", headers={"Accept": "text/html,*/*;q=0.8"})
+    assert resp.json()["total"] == len(resp.json()["items"])
+    resp = client.get("/api/v1/sources/?page_size=5", headers={"Accept": "application/json, application/cbor;q=0.5"})
+    assert resp.headers["content-type"] == "application/json"
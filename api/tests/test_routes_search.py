@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+from api.main import app
+
+client = TestClient(app)
+
+
+def test_search_smoke():
+    resp = client.get("/api/v1/search", params={"q": "radio"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(["items", "total", "page", "page_size"]).issubset(data.keys())
+    assert data["total"] >= len(data["items"])
+
+
+def test_search_requires_query():
+    resp = client.get("/api/v1/search")
+    assert resp.status_code == 422
@@ -0,0 +1,146 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.suggest_index_service import SortedKeys, SuggestIndex, SuggestIndexService, normalize_name
+
+
+def test_normalize_name_folds_case_accents_and_punctuation():
+    assert normalize_name("  Radio Zürich - Jazz!! ") == "radio zurich jazz"
+
+
+def test_suggest_prefers_name_prefix_then_word_prefix():
+    index = SuggestIndex({1: "Radio Paradise", 2: "Talk Radio", 3: "Radio Caroline", 4: "Paradise FM"})
+
+    assert index.suggest("rad") == [(3, "Radio Caroline"), (1, "Radio Paradise"), (2, "Talk Radio")]
+    assert index.suggest("PARA", limit=2) == [(4, "Paradise FM"), (1, "Radio Paradise")]
+    assert index.suggest("radio car") == [(3, "Radio Caroline")]
+    assert index.suggest("!!") == []
+
+
+def test_refresh_applies_only_catalog_changes(monkeypatch):
+    catalog = SimpleNamespace(version=1, compacted=0, names={1: "Radio Paradise", 2: "Talk Radio"}, changes=[])
+    loaded = []
+
+    class FakeVersionRepo:
+        def __init__(self, session):
+            pass
+        def get_version(self):
+            return catalog.version
+        def get_compacted_version(self):
+            return catalog.compacted
+
+    class FakeChangeRepo:
+        def __init__(self, session):
+            pass
+        def find_since(self, since, limit):
+            return [change for change in catalog.changes if change.version > since][:limit]
+
+    class FakeSourceRepo:
+        def __init__(self, session):
+            pass
+        def find_names(self, source_ids=None):
+            loaded.append(source_ids)
+            return [(i, name) for i, name in catalog.names.items() if source_ids is None or i in source_ids]
+
+    def write(source_id, name=None):
+        catalog.version += 1
+        if name is None:
+            catalog.names.pop(source_id)
+        else:
+            catalog.names[source_id] = name
+        catalog.changes.append(SimpleNamespace(version=catalog.version, radio_source_id=source_id,
+                                               op="upsert" if name is not None else "delete"))
+
+    monkeypatch.setattr("api.services.suggest_index_service.CatalogVersionRepository", FakeVersionRepo)
+    monkeypatch.setattr("api.services.suggest_index_service.CatalogChangeRepository", FakeChangeRepo)
+    monkeypatch.setattr("api.services.suggest_index_service.RadioSourceRepository", FakeSourceRepo)
+    service = SuggestIndexService(session_factory=lambda: SimpleNamespace(close=lambda: None),
+                                  refresh_interval_seconds=0)
+
+    assert service.suggest("talk") == [(2, "Talk Radio")]
+    assert service.refresh() is False  # same version: nothing reloaded
+
+    # many new stations: rebuilt from every name
+    for i in range(10, 20):
+        write(i, f"Station {i}")
+    assert service.refresh() is True
+    assert len(service.suggest("station", limit=50)) == 10
+    assert loaded == [None, None]
+
+    # a rename and a delete: only the renamed station is read, both applied in place
+    write(2, "Evening Talk")
+    write(19)
+    index = service.index
+    assert service.refresh() is True
+    assert service.index is index and loaded[-1] == [2]
+    assert service.suggest("talk") == [(2, "Evening Talk")]
+    assert service.suggest("eve") == [(2, "Evening Talk")]
+    assert service.suggest("station 19") == []
+    assert len(index.full) == 11
+
+    # the change feed was compacted past the index: rebuilt from every name
+    write(3, "Radio Three")
+    catalog.compacted = catalog.version
+    assert service.refresh() is True
+    assert service.index is not index and loaded[-1] is None
+
+
+def test_sorted_keys_compact_the_buffer_of_removed_keys():
+    keys = SortedKeys([(f"station {i:02}", i) for i in range(20)])
+    size = len(keys._data)
+
+    for i in range(15):
+        keys.remove(f"station {i:02}", i)
+    keys.add("station 00", 100)
+
+    assert len(keys._data) < size
+    assert keys.prefix_ids("station", 10, set()) == [100, 15, 16, 17, 18, 19]
+
+
+def test_suggest_async_fails_clearly_when_the_index_cannot_be_built():
+    def broken_session():
+        raise ConnectionError("database is gone")
+
+    service = SuggestIndexService(session_factory=broken_session)
+
+    with pytest.raises(RuntimeError, match="not available"):
+        asyncio.run(service.suggest_async(None, "radio"))
+
+
+def test_suggest_async_serves_previous_index_while_refreshing(monkeypatch):
+    catalog = {"version": 1, "names": [(1, "Radio Paradise")]}
+
+    class FakeVersionRepo:
+        def __init__(self, session):
+            pass
+        def get_version(self):
+            return catalog["version"]
+
+    class FakeAsyncVersionRepo(FakeVersionRepo):
+        async def get_version(self):
+            return catalog["version"]
+
+    class FakeSourceRepo:
+        def __init__(self, session):
+            pass
+        def find_names(self):
+            return list(catalog["names"])
+
+    monkeypatch.setattr("api.services.suggest_index_service.CatalogVersionRepository", FakeVersionRepo)
+    monkeypatch.setattr("api.services.suggest_index_service.AsyncCatalogVersionRepository", FakeAsyncVersionRepo)
+    monkeypatch.setattr("api.services.suggest_index_service.RadioSourceRepository", FakeSourceRepo)
+    service = SuggestIndexService(session_factory=lambda: SimpleNamespace(close=lambda: None),
+                                  refresh_interval_seconds=0)
+    scheduled = []
+    monkeypatch.setattr(service, "schedule_refresh", lambda: scheduled.append(True))
+
+    # cold: the first call builds the index (off the event loop)
+    assert asyncio.run(service.suggest_async(None, "radio")) == [(1, "Radio Paradise")]
+    assert scheduled == []
+
+    catalog["version"] = 2
+    catalog["names"] = [(1, "Radio Paradise"), (2, "Radio Caroline")]
+    assert asyncio.run(service.suggest_async(None, "radio")) == [(1, "Radio Paradise")]
+    assert scheduled == [True]
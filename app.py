@@ -1,16 +1,34 @@
+import os
+import threading
+
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import text
 # Import db from separate module
-from database import DATABASE_URL, db
+from database import DATABASE_URL, db, ensure_database_dir
 
 app = Flask(__name__)
 
+# Compiled templates are kept across restarts (JINJA_CACHE_DIR, else a per-user temp directory)
+jinja_cache_dir = os.getenv("JINJA_CACHE_DIR")
+if jinja_cache_dir:
+    os.makedirs(jinja_cache_dir, exist_ok=True)
+app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(jinja_cache_dir)}
+
 # Configuration
 app.config['SECRET_KEY'] = 'your-secret-key'  # Change in production
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+ensure_database_dir(DATABASE_URL)
 db.init_app(app)
 
+# Request latency and per-request SQL metrics (first hook, so CSRF rejections are timed too), see /metrics
+from route.metrics_route import init_request_metrics
+from service.metrics_service import metrics_store
+metrics_store.app_name = "web"
+init_request_metrics(app)
+
 # Enable CSRF protection for forms
 try:
     from flask_wtf import CSRFProtect
@@ -27,6 +45,7 @@ from route.proposal_route import proposal_bp
 from route.radio_source_route import radio_source_bp
 from route.listen_route import listen_bp
 from route.auth_route import auth_bp
+from route.metrics_route import metrics_bp
 from service.auth_service import AuthService
 
 app.register_blueprint(blueprint=main_bp)
@@ -36,11 +55,34 @@ app.register_blueprint(blueprint=proposal_bp)
 app.register_blueprint(blueprint=radio_source_bp)
 app.register_blueprint(blueprint=listen_bp)
 app.register_blueprint(blueprint=auth_bp)
+app.register_blueprint(blueprint=metrics_bp)
 
 # Initialize authentication (LoginManager)
 AuthService(app)
 
 # Db is created only by pyway migrations
 
+
+def warm_up() -> None:
+    """Compile every template (filling the bytecode cache) and open the first database connection."""
+    with app.app_context():
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        db.session.execute(text("SELECT 1"))
+        db.session.remove()
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Run `warm_up` on a daemon thread, so the server binds its port without waiting for it.
+
+    Called once the worker is up: by `deploy/gunicorn.conf.py` (`post_worker_init`) and by `python app.py`.
+    """
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
 if __name__ == '__main__':
+    start_warm_up()
     app.run(debug=True)
\ No newline at end of file
@@ -1,15 +1,20 @@
 """
 Database configuration and SQLAlchemy instance.
+
+Importing this module has no side effects: the engine (and the SQLite
+instance directory) is created with the first session, and Flask-SQLAlchemy
+is imported only when `db` is first used, so the API never loads Flask.
 """
-from typing import cast, Any, Optional
+from typing import TYPE_CHECKING, cast, Any, Optional
 import os
+import sys
 
 # IMPORT THE SQALCHEMY LIBRARY's CREATE_ENGINE METHOD
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from sqlalchemy import create_engine
 
-# Import Flask-SQLAlchemy's SQLAlchemy for the app-level `db` instance
-from flask_sqlalchemy import SQLAlchemy
+if TYPE_CHECKING:
+    from flask_sqlalchemy import SQLAlchemy  # pragma: no cover
 
 class DatabaseManager:
     """
@@ -20,6 +25,9 @@ class DatabaseManager:
     _engine: Optional[Any] = None
     _session_factory: Optional[sessionmaker] = None
     _scoped_session: Optional[scoped_session] = None
+    _async_engine: Optional[Any] = None
+    _async_session_factory: Optional[Any] = None
+    _database_url: Optional[str] = None
     _initialized: bool = False
 
     def __new__(cls) -> 'DatabaseManager':
@@ -29,28 +37,80 @@ class DatabaseManager:
 
     def initialize(self, database_url: str) -> None:
         if not self._initialized:
-            self._engine = create_engine(database_url, future=True)
-            self._session_factory = sessionmaker(bind=self._engine)
+            self._database_url = database_url
+            # Sessions bind to `engine` when created, so the engine is only built with the first session
+            self._session_factory = sessionmaker(class_=DeferredBindSession)
             # Create a scoped session that is NOT tied to Flask by default
             self._scoped_session = scoped_session(self._session_factory)
             self._initialized = True
 
+    @property
+    def database_url(self) -> str:
+        if self._database_url is None:
+            raise RuntimeError("DatabaseManager.initialize() must be called first")
+        return self._database_url
+
     @property
     def engine(self) -> Any:
+        """Engine on the configured database (created on first use)."""
+        if self._engine is None:
+            ensure_database_dir(self.database_url)
+            self._engine = create_engine(self.database_url, future=True)
         return self._engine
 
     @property
     def session_factory(self) -> sessionmaker:
+        if self._session_factory is None:
+            raise RuntimeError("DatabaseManager.initialize() must be called first")
         return self._session_factory
 
     @property
     def standalone_session(self) -> scoped_session:
+        if self._scoped_session is None:
+            raise RuntimeError("DatabaseManager.initialize() must be called first")
         return self._scoped_session
 
+    @property
+    def async_engine(self) -> Any:
+        """AsyncEngine on the same database (created on first use: only the API needs aiosqlite)."""
+        if self._async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            ensure_database_dir(self.database_url)
+            self._async_engine = create_async_engine(to_async_url(self.database_url))
+        return self._async_engine
+
+    @property
+    def async_session_factory(self) -> Any:
+        if self._async_session_factory is None:
+            from sqlalchemy.ext.asyncio import AsyncSession
+            self._async_session_factory = sessionmaker(self.async_engine, class_=AsyncSession, expire_on_commit=False)
+        return self._async_session_factory
+
+
+class DeferredBindSession(Session):
+    """Session bound to `db_manager.engine` unless another bind is given."""
+
+    def __init__(self, bind: Any = None, **kwargs: Any):
+        super().__init__(bind=bind if bind is not None else db_manager.engine, **kwargs)
+
+
+def ensure_database_dir(database_url: str) -> None:
+    """Create the directory holding a SQLite database file (the instance folder by default)."""
+    prefix = "sqlite:///"
+    path = database_url[len(prefix):] if database_url.startswith(prefix) else ""
+    if path and path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+
+def to_async_url(database_url: str) -> str:
+    """Map a sync database URL to its asyncio driver (sqlite -> aiosqlite)."""
+    if database_url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + database_url[len("sqlite:"):]
+    return database_url
+
 # Configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
 instance_dir = os.path.join(basedir, 'instance')
-os.makedirs(instance_dir, exist_ok=True)
 DATABASE_URL = f'sqlite:///{os.path.join(instance_dir, "radio_sources.db")}'
 
 # Initialize Singleton
@@ -58,13 +118,27 @@ db_manager = DatabaseManager()
 db_manager.initialize(DATABASE_URL)
 
 # Provide references for backward compatibility and direct usage
-engine = db_manager.engine
 session_factory = db_manager.session_factory
 # Use a clear name for the standalone scoped session
-StandaloneSession: scoped_session[Session] = db_manager.standalone_session
-
-# Flask-SQLAlchemy instance
-db: SQLAlchemy = SQLAlchemy()
+StandaloneSession: scoped_session = db_manager.standalone_session
+
+if TYPE_CHECKING:
+    # Flask-SQLAlchemy instance, sharing the entities' MetaData (see __getattr__)
+    db: SQLAlchemy
+    engine: Any
+
+
+def __getattr__(name: str) -> Any:
+    """Lazy module attributes: `db` (Flask-SQLAlchemy) and `engine`."""
+    if name == "db":
+        global db
+        from flask_sqlalchemy import SQLAlchemy
+        from model.entity.base import Base
+        db = SQLAlchemy(metadata=Base.metadata)
+        return db
+    if name == "engine":
+        return db_manager.engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_db_session() -> Session:
     """Return the active SQLAlchemy session.
@@ -74,12 +148,11 @@ def get_db_session() -> Session:
     This allows shared services and repositories to work in both
     Flask (main app) and non-Flask (API, CLI, tests) environments.
     """
-    try:
-        from flask import has_app_context
-        if has_app_context():
-            return cast(Session, db.session)
-    except (ImportError, RuntimeError):
-        pass
+    # without Flask loaded there is no app context to look for
+    flask = sys.modules.get("flask")
+    if flask is not None and flask.has_app_context():
+        # attribute access on the module, so the lazy `db` is created if needed
+        return cast(Session, sys.modules[__name__].db.session)
     
     # Fallback for non-Flask environments
     return cast(Session, StandaloneSession())
@@ -0,0 +1,12 @@
+"""
+Gunicorn settings for the Flask web app: `gunicorn -c deploy/gunicorn.conf.py app:app`.
+"""
+
+bind = "0.0.0.0:5000"
+workers = 2
+
+
+def post_worker_init(worker):
+    """Warm every worker (templates, first database connection) without delaying its first request."""
+    from app import start_warm_up
+    start_warm_up()
@@ -0,0 +1,14 @@
+-- V4_0__track_history.sql
+-- Append-only now-playing history, one row per detected track change
+
+CREATE TABLE IF NOT EXISTS track_history (
+    id INTEGER NOT NULL,
+    radio_source_id INTEGER NOT NULL,
+    title VARCHAR(300) NOT NULL,
+    genre VARCHAR(100),
+    bitrate INTEGER,
+    played_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (radio_source_id) REFERENCES radio_sources(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_track_history_source_played_at ON track_history(radio_source_id, played_at);
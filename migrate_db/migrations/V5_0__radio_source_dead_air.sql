@@ -0,0 +1,6 @@
+-- V5_0__radio_source_dead_air.sql
+-- Catalog health flags written by the silence (dead air) detection pipeline
+
+ALTER TABLE radio_sources ADD COLUMN dead_air BOOLEAN NOT NULL DEFAULT 0;
+ALTER TABLE radio_sources ADD COLUMN audio_checked_at DATETIME;
+CREATE INDEX IF NOT EXISTS idx_radio_sources_dead_air ON radio_sources(dead_air);
@@ -0,0 +1,6 @@
+-- V6_0__radio_source_catalog_indexes.sql
+-- Indexes backing SQL-side filtering, ordering and keyset pagination of the catalog
+
+CREATE INDEX IF NOT EXISTS idx_radio_sources_name_id ON radio_sources(name, id);
+CREATE INDEX IF NOT EXISTS idx_radio_sources_created_at_id ON radio_sources(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_radio_sources_country ON radio_sources(country);
@@ -0,0 +1,10 @@
+-- V7_0__catalog_version.sql
+-- Single-row catalog version, bumped by every radio source write (drives API ETags)
+
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1);
@@ -0,0 +1,36 @@
+-- V8_0__radio_source_fts.sql
+-- FTS5 full-text index over the catalog (rowid = radio_sources.id), kept in sync by triggers.
+-- Stations have no genre column: the genre is the latest one seen in the now-playing history.
+-- Mirrored in model/entity/radio_source_search.py for databases built with create_all().
+
+CREATE VIRTUAL TABLE IF NOT EXISTS radio_sources_fts USING fts5(
+    name, description, country, genre,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS radio_sources_fts_ai AFTER INSERT ON radio_sources BEGIN
+    INSERT INTO radio_sources_fts(rowid, name, description, country, genre)
+    VALUES (new.id, new.name, new.description, new.country, NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS radio_sources_fts_au AFTER UPDATE OF name, description, country ON radio_sources BEGIN
+    UPDATE radio_sources_fts SET name = new.name, description = new.description, country = new.country
+    WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS radio_sources_fts_ad AFTER DELETE ON radio_sources BEGIN
+    DELETE FROM radio_sources_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS radio_sources_fts_genre AFTER INSERT ON track_history WHEN new.genre IS NOT NULL BEGIN
+    UPDATE radio_sources_fts SET genre = new.genre
+    WHERE rowid = new.radio_source_id AND genre IS NOT new.genre;
+END;
+
+INSERT INTO radio_sources_fts(rowid, name, description, country, genre)
+SELECT r.id, r.name, r.description, r.country,
+       (SELECT th.genre FROM track_history th
+        WHERE th.radio_source_id = r.id AND th.genre IS NOT NULL
+        ORDER BY th.played_at DESC LIMIT 1)
+FROM radio_sources r
+WHERE r.id NOT IN (SELECT rowid FROM radio_sources_fts);
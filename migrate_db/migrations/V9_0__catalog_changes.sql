@@ -0,0 +1,20 @@
+-- V9_0__catalog_changes.sql
+-- Change feed of radio source writes (GET /api/v1/sources/changes?since=<version>)
+
+CREATE TABLE IF NOT EXISTS catalog_changes (
+    version INTEGER NOT NULL,
+    radio_source_id INTEGER NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (version)
+);
+CREATE INDEX IF NOT EXISTS ix_catalog_changes_radio_source_id ON catalog_changes(radio_source_id);
+
+ALTER TABLE catalog_version ADD COLUMN compacted_version INTEGER NOT NULL DEFAULT 0;
+
+-- Seed one upsert per existing source, each with its own version, so a client syncing from 0 gets the whole catalog
+INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0);
+INSERT INTO catalog_changes (version, radio_source_id, op)
+SELECT (SELECT version FROM catalog_version WHERE id = 1) + ROW_NUMBER() OVER (ORDER BY id), id, 'upsert'
+FROM radio_sources;
+UPDATE catalog_version SET version = version + (SELECT COUNT(*) FROM radio_sources) WHERE id = 1;
@@ -0,0 +1,18 @@
+"""
+Audio level DTO produced by the silence (dead air) detection pipeline.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class AudioLevelDTO(BaseModel):
+    """Loudness statistics of a few seconds of decoded stream audio."""
+    available: bool
+    rms_db: Optional[float] = None       # dBFS over the whole sample
+    peak_db: Optional[float] = None      # dBFS of the loudest sample
+    silence_ratio: Optional[float] = None  # share of frames below the silence threshold
+    is_looping: bool = False             # envelope repeats (e.g. a looping error jingle)
+    dead_air: bool = False
+    error_message: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
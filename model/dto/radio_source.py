@@ -19,6 +19,10 @@ class RadioSourceDTO(BaseModel):
     country: Optional[str] = None
     description: Optional[str] = None
     image_url: Optional[str] = None
+
+    # Catalog health
+    dead_air: Optional[bool] = False
+    audio_checked_at: Optional[datetime] = None
     
     # Timestamps
     created_at: Optional[datetime] = None  
@@ -11,5 +11,7 @@ class StreamMetadataDTO(BaseModel):
     bitrate: Optional[int] = None
     genre: Optional[str] = None
     current_track: Optional[str] = None
+    format: Optional[str] = None
+    listeners: Optional[int] = None
     error_message: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
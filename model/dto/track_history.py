@@ -0,0 +1,17 @@
+"""
+Track history DTO for now-playing history entries.
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class TrackHistoryDTO(BaseModel):
+    """A single track change observed on a radio source."""
+    radio_source_id: int
+    title: str
+    played_at: datetime
+    genre: Optional[str] = None
+    bitrate: Optional[int] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -5,5 +5,9 @@ from .radio_source import RadioSource
 from .proposal import Proposal
 from .stream_analysis import StreamAnalysis
 from .user import User
+from .track_history import TrackHistory
+from .catalog_version import CatalogVersion
+from .catalog_change import CatalogChange
+from . import radio_source_search  # registers the FTS5 index DDL
 
-__all__ = ["Base", "StreamType", "RadioSource", "Proposal", "StreamAnalysis", "User"]
+__all__ = ["Base", "StreamType", "RadioSource", "Proposal", "StreamAnalysis", "User", "TrackHistory", "CatalogVersion", "CatalogChange"]
@@ -1,12 +1,8 @@
-from typing import Any
+from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase
 
-from database import db
-
 
 class Base(DeclarativeBase):
-    pass
-
-# Ensure migrated DeclarativeBase uses the same MetaData as Flask-SQLAlchemy
-# so `db.create_all()` will create tables for both legacy and migrated models.
-Base.metadata = db.metadata
\ No newline at end of file
+    # Flask-SQLAlchemy's `db` is built on this MetaData (see database.py),
+    # so `db.create_all()` creates the tables of every entity.
+    metadata = MetaData()
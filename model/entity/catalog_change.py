@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Final
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from model.entity.base import Base
+
+CHANGE_UPSERT: Final = "upsert"
+CHANGE_DELETE: Final = "delete"
+
+
+class CatalogChange(Base):  # type: ignore[name-defined]
+    """One radio source write, keyed by the catalog version it produced (change feed for incremental sync)."""
+    __tablename__ = 'catalog_changes'
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    radio_source_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  # no FK: tombstones outlive the row
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # upsert, delete
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self) -> str:
+        return f"<CatalogChange(version={self.version}, radio_source_id={self.radio_source_id}, op='{self.op}')>"
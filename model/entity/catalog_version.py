@@ -0,0 +1,19 @@
+from sqlalchemy import Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from model.entity.base import Base
+
+
+class CatalogVersion(Base):  # type: ignore[name-defined]
+    """Single-row counter bumped by every write to the radio source catalog."""
+    __tablename__ = 'catalog_version'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Tombstones up to this version were dropped from catalog_changes; older sync points must reset
+    compacted_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<CatalogVersion(version={self.version})>"
@@ -28,6 +28,10 @@ class RadioSource(Base):  # type: ignore[name-defined]
     description: Mapped[str | None] = mapped_column(Text)
     image_url: Mapped[str | None] = mapped_column(String(500))
 
+    # Catalog health: set by the silence detection pipeline
+    dead_air: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="0")
+    audio_checked_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,42 @@
+"""
+FTS5 full-text index over radio sources.
+
+The index is an FTS5 virtual table (`radio_sources_fts`, rowid = radio source
+id) maintained by triggers; it is created by migration V8_0. The same DDL is
+registered here on the metadata so databases built with `create_all()`
+(tests, fresh development databases) get the index too.
+"""
+
+from sqlalchemy import DDL, event
+
+from model.entity.base import Base
+
+FTS_TABLE = "radio_sources_fts"
+
+# Column weights for bm25 ranking, in FTS column order: name, description, country, genre
+BM25_WEIGHTS = (10.0, 1.0, 2.0, 3.0)
+
+RADIO_SOURCE_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, country, genre,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS radio_sources_fts_ai AFTER INSERT ON radio_sources BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, country, genre)
+        VALUES (new.id, new.name, new.description, new.country, NULL);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS radio_sources_fts_au AFTER UPDATE OF name, description, country ON radio_sources BEGIN
+        UPDATE {FTS_TABLE} SET name = new.name, description = new.description, country = new.country
+        WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS radio_sources_fts_ad AFTER DELETE ON radio_sources BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS radio_sources_fts_genre AFTER INSERT ON track_history WHEN new.genre IS NOT NULL BEGIN
+        UPDATE {FTS_TABLE} SET genre = new.genre
+        WHERE rowid = new.radio_source_id AND genre IS NOT new.genre;
+    END""",
+]
+
+for _statement in RADIO_SOURCE_FTS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from model.entity.base import Base
+
+if TYPE_CHECKING:
+    from model.entity.radio_source import RadioSource  # pragma: no cover
+
+
+class TrackHistory(Base):  # type: ignore[name-defined]
+    """Append-only log of track changes seen on a radio source."""
+    __tablename__ = 'track_history'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    radio_source_id: Mapped[int] = mapped_column(Integer, ForeignKey("radio_sources.id", ondelete="CASCADE"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(300), nullable=False)
+    genre: Mapped[str | None] = mapped_column(String(100))
+    bitrate: Mapped[int | None] = mapped_column(Integer)
+    played_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    radio_source: Mapped["RadioSource"] = relationship("model.entity.radio_source.RadioSource", lazy="select")
+
+    def __repr__(self) -> str:
+        return f"<TrackHistory(id={self.id}, radio_source_id={self.radio_source_id}, title='{self.title}')>"
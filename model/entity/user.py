@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, List
 
-from flask_login import UserMixin
 from sqlalchemy import Integer, String, DateTime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -13,7 +12,7 @@ if TYPE_CHECKING:
     from model.entity.radio_source import RadioSource  # pragma: no cover
 
 
-class User(UserMixin, Base):  # type: ignore[name-defined]
+class User(Base):  # type: ignore[name-defined]
     __tablename__ = 'users'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -41,5 +40,22 @@ class User(UserMixin, Base):  # type: ignore[name-defined]
     def is_active(self) -> bool:
         return True
 
+    # Rest of the Flask-Login user protocol (as flask_login.UserMixin), kept here
+    # so that loading the entities does not import Flask
+    @property
+    def is_authenticated(self) -> bool:
+        return self.is_active
+
+    @property
+    def is_anonymous(self) -> bool:
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, User):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
@@ -0,0 +1,88 @@
+"""
+CatalogChangeRepository - Data access for the radio source change feed.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, cast
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from model.entity.catalog_change import CHANGE_DELETE, CatalogChange
+from model.repository.catalog_version_repository import CatalogVersionRepository
+
+# Tombstones older than this are compacted away; clients that last synced before must start over
+TOMBSTONE_RETENTION = timedelta(days=30)
+# Compaction runs inside the write transaction once every this many versions
+COMPACT_EVERY = 100
+
+
+class CatalogChangeRepository:
+    """Repository recording radio source writes and reading them back as a change feed."""
+
+    def __init__(self, db_session: Session):
+        self.db: Session = db_session
+
+    def record(self, version: int, radio_source_id: int, op: str) -> None:
+        """Log a write inside the caller's transaction (the caller commits)."""
+        self.db.execute(insert(CatalogChange).values(
+            version=version, radio_source_id=radio_source_id, op=op, changed_at=datetime.now()))
+        if version % COMPACT_EVERY == 0:
+            self.compact()
+
+    def compact(self, tombstones_before: Optional[datetime] = None) -> int:
+        """
+        Shrink the log inside the caller's transaction. Returns the number of entries removed.
+
+        Only the latest entry of each source is needed to bring a client up to
+        date, so superseded entries are dropped. Tombstones older than
+        `tombstones_before` (default: now - TOMBSTONE_RETENTION) are dropped too
+        and the catalog's compacted version records up to where that happened.
+        """
+        removed = self._delete(CatalogChange.version.not_in(latest_versions_statement()))
+
+        cutoff = tombstones_before or datetime.now() - TOMBSTONE_RETENTION
+        expired: Optional[int] = self.db.scalar(
+            select(func.max(CatalogChange.version))
+            .where(CatalogChange.op == CHANGE_DELETE, CatalogChange.changed_at < cutoff)
+        )
+        if expired is not None:
+            removed += self._delete(CatalogChange.op == CHANGE_DELETE, CatalogChange.version <= expired)
+            CatalogVersionRepository(self.db).set_compacted_version(expired)
+        return removed
+
+    def find_since(self, since: int, limit: Optional[int], until: Optional[int] = None) -> List[CatalogChange]:
+        """Latest change of every source written after version `since` (up to `until`), oldest first, at most `limit`."""
+        return list(self.db.scalars(since_statement(since, limit, until)))
+
+    def _delete(self, *criteria: Any) -> int:
+        result = cast(CursorResult, self.db.execute(
+            delete(CatalogChange).where(*criteria).execution_options(synchronize_session=False)))
+        return result.rowcount
+
+class AsyncCatalogChangeRepository:
+    """Read-only CatalogChangeRepository over an AsyncSession, used by the async API routes."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db: AsyncSession = db_session
+
+    async def find_since(self, since: int, limit: Optional[int], until: Optional[int] = None) -> List[CatalogChange]:
+        """Latest change of every source written after version `since` (up to `until`), oldest first, at most `limit`."""
+        return list(await self.db.scalars(since_statement(since, limit, until)))
+
+
+def latest_versions_statement() -> Select:
+    """Version of the latest entry of every source."""
+    return select(func.max(CatalogChange.version)).group_by(CatalogChange.radio_source_id)
+
+
+def since_statement(since: int, limit: Optional[int], until: Optional[int] = None) -> Select:
+    """Latest entries written after version `since` and up to `until`, oldest first."""
+    # a source written several times since `since` only needs its latest entry
+    statement = select(CatalogChange).where(
+        CatalogChange.version > since, CatalogChange.version.in_(latest_versions_statement()))
+    if until is not None:
+        statement = statement.where(CatalogChange.version <= until)
+    return statement.order_by(CatalogChange.version).limit(limit)
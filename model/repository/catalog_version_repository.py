@@ -0,0 +1,67 @@
+"""
+CatalogVersionRepository - Data access for the catalog version counter.
+"""
+
+from typing import cast
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from model.entity.catalog_version import CatalogVersion
+
+# The counter lives in a single row
+CATALOG_VERSION_ID = 1
+
+
+class CatalogVersionRepository:
+    """Repository reading and bumping the monotonically increasing catalog version."""
+
+    def __init__(self, db_session: Session):
+        self.db: Session = db_session
+
+    def get_version(self) -> int:
+        """Current catalog version (0 before the first write). Plain scalar query, no ORM objects loaded."""
+        return self.db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)) or 0
+
+    def bump(self) -> int:
+        """Increment the version inside the caller's transaction (the caller commits). Returns the new version."""
+        result = cast(CursorResult, self.db.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == CATALOG_VERSION_ID)
+            .values(version=CatalogVersion.version + 1)
+            .execution_options(synchronize_session=False)
+        ))
+        if result.rowcount == 0:
+            self.db.execute(insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1))
+        return self.get_version()
+
+    def get_compacted_version(self) -> int:
+        """Highest version whose tombstones were compacted away (0 when the change log is complete)."""
+        return self.db.scalar(
+            select(CatalogVersion.compacted_version).where(CatalogVersion.id == CATALOG_VERSION_ID)) or 0
+
+    def set_compacted_version(self, version: int) -> None:
+        """Raise the compacted version inside the caller's transaction (never lowers it)."""
+        self.db.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.id == CATALOG_VERSION_ID, CatalogVersion.compacted_version < version)
+            .values(compacted_version=version)
+            .execution_options(synchronize_session=False)
+        )
+
+
+class AsyncCatalogVersionRepository:
+    """Read-only CatalogVersionRepository over an AsyncSession, used by the async API routes."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db: AsyncSession = db_session
+
+    async def get_version(self) -> int:
+        """Current catalog version (0 before the first write)."""
+        return await self.db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)) or 0
+
+    async def get_compacted_version(self) -> int:
+        """Highest version whose tombstones were compacted away (0 when the change log is complete)."""
+        return await self.db.scalar(
+            select(CatalogVersion.compacted_version).where(CatalogVersion.id == CATALOG_VERSION_ID)) or 0
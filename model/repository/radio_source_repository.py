@@ -2,54 +2,528 @@
 RadioSourceRepository - Data access layer for RadioSource entities.
 """
 
-from typing import Optional, List
-from sqlalchemy.orm import Session, selectinload
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import String, case, cast, func, literal, select, text, union_all, update, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql import CompoundSelect, Select
+from model.entity.catalog_change import CHANGE_DELETE, CHANGE_UPSERT
 from model.entity.radio_source import RadioSource
+from model.entity.stream_type import StreamType
+from model.entity.track_history import TrackHistory
+from model.entity.radio_source_search import BM25_WEIGHTS, FTS_TABLE
+from model.repository.catalog_change_repository import CatalogChangeRepository
+from model.repository.catalog_version_repository import CatalogVersionRepository
 
+# Columns the catalog can be ordered by (keyset pagination always adds `id` as tie-breaker)
+SORTABLE_COLUMNS = {
+    "name": RadioSource.name,
+    "created_at": RadioSource.created_at,
+    "id": RadioSource.id,
+}
 
-class RadioSourceRepository:
+# Fields a sparse listing can select; "stream_type.*" fields join stream_types instead of loading the relationship
+PROJECTABLE_COLUMNS = {
+    "id": RadioSource.id,
+    "stream_url": RadioSource.stream_url,
+    "name": RadioSource.name,
+    "is_secure": RadioSource.is_secure,
+    "website_url": RadioSource.website_url,
+    "country": RadioSource.country,
+    "description": RadioSource.description,
+    "image_url": RadioSource.image_url,
+    "created_at": RadioSource.created_at,
+    "updated_at": RadioSource.updated_at,
+    "stream_type.id": StreamType.id,
+    "stream_type.display_name": StreamType.display_name,
+}
+
+# Facets counted by `count_facets`, in response order
+FACETS = ("stream_type", "country", "is_secure", "codec", "bitrate")
+
+# Bitrate buckets (kbps labels) over the latest bitrate reported for a source, upper bounds in bit/s
+BITRATE_BUCKETS = ((64000, "<64"), (128000, "64-127"), (192000, "128-191"))
+BITRATE_TOP_BUCKET = "192+"
+
+
+class RadioSourceStatements:
+    """Catalog statements and result shaping shared by the sync and async repositories."""
+
+    @staticmethod
+    def _in_order(ids: List[int], sources: List[RadioSource]) -> List[RadioSource]:
+        by_id = {source.id: source for source in sources}
+        return [by_id[source_id] for source_id in ids if source_id in by_id]
+
+    @staticmethod
+    def fts_match(query: str) -> Optional[str]:
+        """Turn free user input into an FTS5 MATCH expression (quoted terms, last one as prefix)."""
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def filter_criteria(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+                        country: Optional[str] = None) -> List[Any]:
+        """SQL criteria for the catalog filters (shared by listing and counting queries)."""
+        criteria: List[Any] = []
+        if q:
+            criteria.append(RadioSource.name.ilike(f'%{q}%'))
+        if stream_type_id is not None:
+            criteria.append(RadioSource.stream_type_id == stream_type_id)
+        if country:
+            criteria.append(RadioSource.country == country)
+        return criteria
+
+    def _count_statement(self, q: Optional[str], stream_type_id: Optional[int], country: Optional[str]) -> Select:
+        return select(func.count(RadioSource.id)).where(*self.filter_criteria(q, stream_type_id, country))
+
+    @staticmethod
+    def _latest_bitrate() -> Any:
+        """Latest bitrate reported for the outer query's RadioSource (correlated scalar subquery)."""
+        return select(TrackHistory.bitrate).where(
+            TrackHistory.radio_source_id == RadioSource.id, TrackHistory.bitrate.is_not(None)
+        ).order_by(TrackHistory.played_at.desc()).limit(1).correlate(RadioSource).scalar_subquery()
+
+    def _facets_statement(self, q: Optional[str], stream_type_id: Optional[int], country: Optional[str]) -> CompoundSelect:
+        filtered = select(
+            RadioSource.stream_type_id, RadioSource.country, RadioSource.is_secure,
+            StreamType.display_name, StreamType.format, self._latest_bitrate().label("bitrate"),
+        ).join(StreamType, RadioSource.stream_type_id == StreamType.id) \
+            .where(*self.filter_criteria(q, stream_type_id, country)).cte("filtered")
+        bucket: Any = case(
+            *((filtered.c.bitrate < upper, label) for upper, label in BITRATE_BUCKETS),
+            else_=BITRATE_TOP_BUCKET,
+        )
+
+        # one GROUP BY per facet, glued into a single statement; values travel as text
+        def grouped(facet: str, value: Any, label: Any = None, *where: Any) -> Select:
+            return select(literal(facet).label("facet"), cast(value, String).label("value"),
+                          cast(label, String).label("label"), func.count().label("count")) \
+                .where(*where).group_by(value, *([label] if label is not None else []))
+
+        return union_all(
+            grouped("stream_type", filtered.c.stream_type_id, filtered.c.display_name),
+            grouped("country", filtered.c.country),
+            grouped("is_secure", filtered.c.is_secure),
+            grouped("codec", filtered.c.format),
+            grouped("bitrate", bucket, None, filtered.c.bitrate.is_not(None)),
+        )
+
+    def _facet_result(self, rows: Any) -> Dict[str, List[Tuple[Any, Optional[str], int]]]:
+        facets: Dict[str, List[Tuple[Any, Optional[str], int]]] = {facet: [] for facet in FACETS}
+        for facet, value, label, count in rows:
+            if facet == "stream_type":
+                value = int(value)
+            elif facet == "is_secure":
+                value = value not in ("0", "false")
+            facets[facet].append((value, label, count))
+        for counts in facets.values():
+            counts.sort(key=lambda entry: (-entry[2], str(entry[0])))
+        return facets
+
+    def _search_ids_statement(self, match: str, limit: Optional[int], offset: int) -> Tuple[Any, Dict[str, Any]]:
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        return (text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+                     f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid LIMIT :limit OFFSET :offset"),
+                {"match": match, "limit": -1 if limit is None else limit, "offset": offset})
+
+    def _count_search_statement(self, match: str) -> Tuple[Any, Dict[str, Any]]:
+        return text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"), {"match": match}
+
+    def _stream_all_statement(self, batch_size: int) -> Select:
+        # joinedload: the many-to-one stream type arrives on the same row, which yield_per supports
+        return select(RadioSource).options(joinedload(RadioSource.stream_type)) \
+            .order_by(RadioSource.name, RadioSource.id).execution_options(yield_per=batch_size)
+
+    def _index_rows_statement(self, source_ids: Optional[List[int]]) -> Select:
+        statement = select(RadioSource.id, RadioSource.name, RadioSource.stream_type_id, RadioSource.country,
+                           RadioSource.is_secure, RadioSource.created_at, self._latest_bitrate().label("bitrate"))
+        if source_ids is not None:
+            statement = statement.where(RadioSource.id.in_(source_ids))
+        return statement
+
+    def _page_statement(self, q: Optional[str], stream_type_id: Optional[int], country: Optional[str],
+                        sort: str, limit: int, cursor: Optional[str], offset: int,
+                        columns: Optional[List[Any]] = None) -> Select:
+        descending = sort.startswith("-")
+        sort_name = sort.lstrip("-")
+        sort_column = SORTABLE_COLUMNS.get(sort_name)
+        if sort_column is None:
+            raise ValueError(f"Unsupported sort field: {sort_name}")
+
+        if columns:
+            statement = select(*columns).select_from(RadioSource)
+            if any(column.name.startswith("stream_type.") for column in columns):
+                statement = statement.outerjoin(StreamType, RadioSource.stream_type_id == StreamType.id)
+        else:
+            statement = select(RadioSource)
+        statement = statement.where(*self.filter_criteria(q, stream_type_id, country))
+
+        order = [sort_column.desc() if descending else sort_column.asc()]
+        if sort_column is not RadioSource.id:
+            order.append(RadioSource.id.desc() if descending else RadioSource.id.asc())
+        statement = statement.order_by(*order)
+
+        if cursor:
+            last_value, last_id = self.decode_cursor(cursor, sort_name)
+            key = tuple_(sort_column, RadioSource.id) if sort_column is not RadioSource.id else RadioSource.id
+            bound: Any = tuple_(last_value, last_id) if sort_column is not RadioSource.id else last_id
+            statement = statement.where(key < bound if descending else key > bound)
+        elif offset:
+            statement = statement.offset(offset)
+
+        if not columns:
+            statement = statement.options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user))
+        # fetch one extra row to know whether a next page exists
+        return statement.limit(limit + 1)
+
+    def _page_result(self, rows: List[RadioSource], limit: int, sort: str,
+                     total: Optional[int]) -> Tuple[List[RadioSource], Optional[int], Optional[str]]:
+        items = rows[:limit]
+        next_cursor = self.encode_cursor(items[-1], sort.lstrip("-")) if len(rows) > limit and items else None
+        return items, total, next_cursor
+
+    def _projection(self, fields: List[str], sort: str) -> List[Any]:
+        unknown = [field for field in fields if field not in PROJECTABLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unsupported field: {', '.join(unknown)}")
+        # id and the sort column are always selected, the keyset cursor is built from them
+        names = list(dict.fromkeys([*fields, "id", sort.lstrip("-")]))
+        return [PROJECTABLE_COLUMNS[name].label(name) for name in names if name in PROJECTABLE_COLUMNS]
+
+    def _projection_result(self, rows: List[Any], fields: List[str], limit: int, sort: str,
+                           total: Optional[int]) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        rows, total, next_cursor = self._page_result(rows, limit, sort, total)
+        return [{field: row._mapping[field] for field in fields} for row in rows], total, next_cursor
+
+    def encode_cursor(self, radio_source: RadioSource, sort_name: str) -> str:
+        """Keyset cursor pointing right after `radio_source` in the `sort_name` order."""
+        return self.encode_cursor_value(getattr(radio_source, sort_name), radio_source.id)
+
+    @staticmethod
+    def encode_cursor_value(value: Any, source_id: int) -> str:
+        """Keyset cursor pointing right after the row with sort value `value` and id `source_id`."""
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, source_id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort_name: str) -> Tuple[Any, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            value, last_id = json.loads(raw)
+            if sort_name == "created_at" and value is not None:
+                value = datetime.fromisoformat(value)
+            return value, int(last_id)
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+
+
+class RadioSourceRepository(RadioSourceStatements):
     """Repository for RadioSource data access operations."""
-    
+
     def __init__(self, db_session: Session):
-        self.db = db_session
-    
+        self.db: Session = db_session
+
     def find_by_id(self, source_id: int) -> Optional[RadioSource]:
         """Get RadioSource by ID."""
         return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)).filter(RadioSource.id == source_id).first()
-    
+
+    def find_by_ids(self, source_ids: List[int]) -> List[RadioSource]:
+        """Get the RadioSources matching `source_ids` with a single IN query (order not guaranteed)."""
+        if not source_ids:
+            return []
+        return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)).filter(RadioSource.id.in_(source_ids)).all()
+
+    def find_by_ids_in_order(self, source_ids: List[int]) -> List[RadioSource]:
+        """`find_by_ids` in the order of `source_ids`, without the ids that were not found."""
+        return self._in_order(source_ids, self.find_by_ids(source_ids))
+
     def find_by_url(self, url: str) -> Optional[RadioSource]:
         """Get RadioSource by URL (for duplicate checking)."""
         return self.db.query(RadioSource).filter(RadioSource.stream_url == url).first()
-    
+
     def find_all(self) -> List[RadioSource]:
         """Get all RadioSources."""
         return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)).all()
-    
+
+    def find_all_by_name(self) -> List[RadioSource]:
+        """Get all RadioSources in the default catalog order (name, id)."""
+        return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)) \
+            .order_by(RadioSource.name, RadioSource.id).all()
+
+    def iter_all_by_name(self, batch_size: int = 500) -> Iterator[RadioSource]:
+        """Every RadioSource in catalog order, fetched `batch_size` rows at a time from an open cursor."""
+        yield from self.db.scalars(self._stream_all_statement(batch_size))
+
+    def find_names(self, source_ids: Optional[List[int]] = None) -> List[Tuple[int, str]]:
+        """Get (id, name) of every RadioSource, or only of `source_ids`, without loading entities."""
+        query = self.db.query(RadioSource.id, RadioSource.name)
+        if source_ids is not None:
+            query = query.filter(RadioSource.id.in_(source_ids))
+        return [(source_id, name) for source_id, name in query.all()]
+
     def find_by_stream_type(self, stream_type_id: int) -> List[RadioSource]:
         """Get RadioSources by stream type."""
         return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)).filter(RadioSource.stream_type_id == stream_type_id).all()
-    
+
     def search_by_name(self, name_query: str) -> List[RadioSource]:
         """Search RadioSources by name."""
         return self.db.query(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user)).filter(RadioSource.name.ilike(f'%{name_query}%')).all()
-    
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> List[RadioSource]:
+        """
+        Full-text search over name, description, country and genre (FTS5), best bm25 match first.
+
+        Every word of `query` must match; the last one also matches as a prefix.
+        """
+        match = self.fts_match(query)
+        if match is None:
+            return []
+        ids: List[int] = list(self.db.execute(*self._search_ids_statement(match, limit, offset)).scalars())
+        return self._in_order(ids, self.find_by_ids(ids))
+
+    def count_search(self, query: str) -> int:
+        """Count the RadioSources matching a full-text `query`."""
+        match = self.fts_match(query)
+        if match is None:
+            return 0
+        return self.db.execute(*self._count_search_statement(match)).scalar() or 0
+
     def save(self, radio_source: RadioSource) -> RadioSource:
-        """Save (create or update) a RadioSource."""
+        """Save (create or update) a RadioSource, bumping the catalog version and logging the change in the same transaction."""
         if radio_source.id is None:
             self.db.add(radio_source)
+            self.db.flush()
+        version = CatalogVersionRepository(self.db).bump()
+        CatalogChangeRepository(self.db).record(version, radio_source.id, CHANGE_UPSERT)
         self.db.commit()
         self.db.refresh(radio_source)
         return radio_source
-    
+
     def delete(self, source_id: int) -> bool:
-        """Delete a RadioSource by ID."""
+        """Delete a RadioSource by ID, bumping the catalog version and logging a tombstone in the same transaction."""
         radio_source = self.find_by_id(source_id)
         if radio_source:
             self.db.delete(radio_source)
+            version = CatalogVersionRepository(self.db).bump()
+            CatalogChangeRepository(self.db).record(version, source_id, CHANGE_DELETE)
             self.db.commit()
             return True
         return False
-    
+
+    def find_for_audio_check(self, limit: int, checked_before: Optional[datetime] = None) -> List[RadioSource]:
+        """Get the sources whose audio was never checked or checked before `checked_before`, oldest check first."""
+        query = self.db.query(RadioSource)
+        if checked_before is not None:
+            query = query.filter((RadioSource.audio_checked_at.is_(None)) | (RadioSource.audio_checked_at < checked_before))
+        return query.order_by(RadioSource.audio_checked_at.is_not(None), RadioSource.audio_checked_at, RadioSource.id).limit(limit).all()
+
+    def save_dead_air_flags(self, flags: Dict[int, bool], checked_at: datetime) -> int:
+        """Store dead-air check results for many sources in one transaction. Returns the number of rows updated."""
+        for dead_air in (True, False):
+            ids = [source_id for source_id, flag in flags.items() if flag is dead_air]
+            if ids:
+                self.db.execute(
+                    update(RadioSource)
+                    .where(RadioSource.id.in_(ids))
+                    # a health check is not an edit: keep updated_at untouched
+                    .values(dead_air=dead_air, audio_checked_at=checked_at, updated_at=RadioSource.updated_at)
+                    .execution_options(synchronize_session="fetch")
+                )
+        self.db.commit()
+        return len(flags)
+
+    def count_filtered(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+                       country: Optional[str] = None) -> int:
+        """Count the RadioSources matching the catalog filters with a single COUNT query."""
+        return self.db.scalar(self._count_statement(q, stream_type_id, country)) or 0
+
+    def count_facets(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+                     country: Optional[str] = None) -> Dict[str, List[Tuple[Any, Optional[str], int]]]:
+        """
+        Count the sources matching the catalog filters per facet value, in one grouped query.
+
+        Returns:
+            facet name (see FACETS) -> [(value, label or None, count)], most frequent first.
+            Sources without a known bitrate are left out of the bitrate facet.
+        """
+        return self._facet_result(self.db.execute(self._facets_statement(q, stream_type_id, country)))
+
+    def find_page(
+        self,
+        q: Optional[str] = None,
+        stream_type_id: Optional[int] = None,
+        country: Optional[str] = None,
+        sort: str = "name",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        with_total: bool = True,
+    ) -> Tuple[List[RadioSource], Optional[int], Optional[str]]:
+        """
+        Get one page of RadioSources with filtering, ordering and pagination done in SQL.
+
+        Args:
+            sort: column name from SORTABLE_COLUMNS, prefixed with '-' for descending order
+            cursor: opaque keyset cursor returned by the previous page; when set `offset` is ignored
+            offset: row offset for classic page-number pagination
+            with_total: also count the rows matching the filters
+
+        Returns:
+            (items, total or None, cursor of the next page or None when this is the last page)
+
+        Raises:
+            ValueError: if `sort` or `cursor` is invalid
+        """
+        total: Optional[int] = self.count_filtered(q, stream_type_id, country) if with_total else None
+        rows: List[RadioSource] = list(self.db.scalars(
+            self._page_statement(q, stream_type_id, country, sort, limit, cursor, offset)))
+        return self._page_result(rows, limit, sort, total)
+
+    def find_page_fields(
+        self,
+        fields: List[str],
+        q: Optional[str] = None,
+        stream_type_id: Optional[int] = None,
+        country: Optional[str] = None,
+        sort: str = "name",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        with_total: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        """
+        `find_page` selecting only `fields` (keys of PROJECTABLE_COLUMNS), without loading entities.
+
+        Returns:
+            (rows as {field: value} dicts holding only `fields`, total or None, next cursor or None)
+
+        Raises:
+            ValueError: on unknown field, unsupported sort field or invalid cursor
+        """
+        statement = self._page_statement(q, stream_type_id, country, sort, limit, cursor, offset,
+                                         self._projection(fields, sort))
+        total: Optional[int] = self.count_filtered(q, stream_type_id, country) if with_total else None
+        rows = list(self.db.execute(statement))
+        return self._projection_result(rows, fields, limit, sort, total)
+
+    def find_index_rows(self, source_ids: Optional[List[int]] = None) -> List[Tuple[Any, ...]]:
+        """
+        Columns of the in-process catalog index, without loading entities.
+
+        Returns:
+            (id, name, stream_type_id, country, is_secure, created_at, latest bitrate or None) per source,
+            for every source or only `source_ids`
+        """
+        return [tuple(row) for row in self.db.execute(self._index_rows_statement(source_ids))]
+
     def count(self) -> int:
         """Count total RadioSources."""
-        return self.db.query(RadioSource).count()
\ No newline at end of file
+        return self.db.query(RadioSource).count()
+
+
+class AsyncRadioSourceRepository(RadioSourceStatements):
+    """Read-only RadioSourceRepository over an AsyncSession, used by the async API routes."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db: AsyncSession = db_session
+
+    async def find_by_id(self, source_id: int) -> Optional[RadioSource]:
+        """Get RadioSource by ID."""
+        return await self.db.scalar(
+            select(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user))
+            .where(RadioSource.id == source_id)
+        )
+
+    async def find_by_ids(self, source_ids: List[int]) -> List[RadioSource]:
+        """Get the RadioSources matching `source_ids` with a single IN query (order not guaranteed)."""
+        if not source_ids:
+            return []
+        return list(await self.db.scalars(
+            select(RadioSource).options(selectinload(RadioSource.stream_type), selectinload(RadioSource.user))
+            .where(RadioSource.id.in_(source_ids))
+        ))
+
+    async def find_by_ids_in_order(self, source_ids: List[int]) -> List[RadioSource]:
+        """Async `find_by_ids_in_order`."""
+        return self._in_order(source_ids, await self.find_by_ids(source_ids))
+
+    async def iter_all_by_name(self, batch_size: int = 500) -> AsyncIterator[RadioSource]:
+        """Async `iter_all_by_name` (streamed result)."""
+        result = await self.db.stream_scalars(self._stream_all_statement(batch_size))
+        async for source in result:
+            yield source
+
+    async def find_names(self) -> List[Tuple[int, str]]:
+        """Get (id, name) of every RadioSource without loading entities."""
+        result = await self.db.execute(select(RadioSource.id, RadioSource.name))
+        return [(source_id, name) for source_id, name in result]
+
+    async def count_filtered(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+                                   country: Optional[str] = None) -> int:
+        """Count the RadioSources matching the catalog filters with a single COUNT query."""
+        return await self.db.scalar(self._count_statement(q, stream_type_id, country)) or 0
+
+    async def count_facets(self, q: Optional[str] = None, stream_type_id: Optional[int] = None,
+                                 country: Optional[str] = None) -> Dict[str, List[Tuple[Any, Optional[str], int]]]:
+        """Async `count_facets`."""
+        return self._facet_result(await self.db.execute(self._facets_statement(q, stream_type_id, country)))
+
+    async def find_page(
+        self,
+        q: Optional[str] = None,
+        stream_type_id: Optional[int] = None,
+        country: Optional[str] = None,
+        sort: str = "name",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        with_total: bool = True,
+    ) -> Tuple[List[RadioSource], Optional[int], Optional[str]]:
+        """Async `find_page`."""
+        statement = self._page_statement(q, stream_type_id, country, sort, limit, cursor, offset)
+        total: Optional[int] = await self.count_filtered(q, stream_type_id, country) if with_total else None
+        rows: List[RadioSource] = list(await self.db.scalars(statement))
+        return self._page_result(rows, limit, sort, total)
+
+    async def find_page_fields(
+        self,
+        fields: List[str],
+        q: Optional[str] = None,
+        stream_type_id: Optional[int] = None,
+        country: Optional[str] = None,
+        sort: str = "name",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        with_total: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        """Async `find_page_fields`."""
+        statement = self._page_statement(q, stream_type_id, country, sort, limit, cursor, offset,
+                                         self._projection(fields, sort))
+        total: Optional[int] = await self.count_filtered(q, stream_type_id, country) if with_total else None
+        rows = list(await self.db.execute(statement))
+        return self._projection_result(rows, fields, limit, sort, total)
+
+    async def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> List[RadioSource]:
+        """Async `search`."""
+        match = self.fts_match(query)
+        if match is None:
+            return []
+        ids: List[int] = list((await self.db.execute(*self._search_ids_statement(match, limit, offset))).scalars())
+        return self._in_order(ids, await self.find_by_ids(ids))
+
+    async def count_search(self, query: str) -> int:
+        """Async `count_search`."""
+        match = self.fts_match(query)
+        if match is None:
+            return 0
+        return (await self.db.execute(*self._count_search_statement(match))).scalar() or 0
@@ -3,8 +3,14 @@ StreamTypeRepository - Data access layer for StreamType entities.
 """
 
 from typing import Optional, List, Dict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from model.entity.catalog_change import CHANGE_UPSERT
+from model.entity.radio_source import RadioSource
 from model.entity.stream_type import StreamType
+from model.repository.catalog_change_repository import CatalogChangeRepository
+from model.repository.catalog_version_repository import CatalogVersionRepository
 
 
 class StreamTypeRepository:
@@ -60,12 +66,31 @@ class StreamTypeRepository:
             metadata_type=metadata,
             display_name=display_name
         )
+        return self.save(new_type)
 
-        self.db.add(new_type)
+    def save(self, stream_type: StreamType) -> StreamType:
+        """
+        Save (create or update) a StreamType, bumping the catalog version in the same transaction.
+
+        Radio sources embed their stream type, so an update also logs an upsert
+        of every source of that type in the change feed (one version each).
+        """
+        if stream_type.id is None:
+            self.db.add(stream_type)
+            self.db.flush()
+            source_ids: List[int] = []
+        else:
+            source_ids = list(self.db.scalars(
+                select(RadioSource.id).where(RadioSource.stream_type_id == stream_type.id).order_by(RadioSource.id)))
+        versions = CatalogVersionRepository(self.db)
+        if not source_ids:
+            versions.bump()
+        changes = CatalogChangeRepository(self.db)
+        for source_id in source_ids:
+            changes.record(versions.bump(), source_id, CHANGE_UPSERT)
         self.db.commit()
-        self.db.refresh(new_type)
-        
-        return new_type
+        self.db.refresh(stream_type)
+        return stream_type
     
     def get_type_key_to_id_map(self) -> Dict[str, int]:
         """
@@ -75,3 +100,17 @@ class StreamTypeRepository:
         stream_types: List[StreamType] = self.find_all()
         return {st.type_key: st.id for st in stream_types}
     
+
+class AsyncStreamTypeRepository:
+    """Read-only StreamTypeRepository over an AsyncSession, used by the async API routes."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db: AsyncSession = db_session
+
+    async def find_by_id(self, stream_type_id: int) -> Optional[StreamType]:
+        """Get StreamType by ID."""
+        return await self.db.scalar(select(StreamType).where(StreamType.id == stream_type_id))
+
+    async def find_all(self) -> List[StreamType]:
+        """Get all StreamTypes."""
+        return list(await self.db.scalars(select(StreamType)))
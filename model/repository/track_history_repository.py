@@ -0,0 +1,46 @@
+"""
+TrackHistoryRepository - Data access layer for TrackHistory entries.
+"""
+
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from model.entity.track_history import TrackHistory
+
+
+class TrackHistoryRepository:
+    """Repository for the append-only track history table."""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def save_batch(self, entries: List[TrackHistory]) -> int:
+        """Insert a batch of entries in a single transaction. Returns the number inserted."""
+        if not entries:
+            return 0
+        try:
+            self.db.add_all(entries)
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        return len(entries)
+
+    def find_by_source(self, radio_source_id: int, since: Optional[datetime] = None, limit: int = 100) -> List[TrackHistory]:
+        """
+        Get entries of a source, oldest first: the latest `limit` ones, or with
+        `since` the first `limit` ones played after it.
+        """
+        query = self.db.query(TrackHistory).filter(TrackHistory.radio_source_id == radio_source_id)
+        if since is not None:
+            return query.filter(TrackHistory.played_at > since).order_by(
+                TrackHistory.played_at, TrackHistory.id
+            ).limit(limit).all()
+        return query.order_by(TrackHistory.played_at.desc(), TrackHistory.id.desc()).limit(limit).all()[::-1]
+
+    def find_last_by_source(self, radio_source_id: int) -> Optional[TrackHistory]:
+        """Get the most recent entry of a source."""
+        return self.db.query(TrackHistory).filter(TrackHistory.radio_source_id == radio_source_id).order_by(
+            TrackHistory.played_at.desc(), TrackHistory.id.desc()
+        ).first()
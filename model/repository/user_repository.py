@@ -1,5 +1,5 @@
 from typing import Optional
-from database import db, get_db_session
+from database import get_db_session
 from model.entity.user import User
 
 
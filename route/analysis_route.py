@@ -7,6 +7,7 @@ from typing import List
 from flask import Blueprint, request, render_template, redirect, url_for, flash, abort
 from flask_login import login_required, current_user
 from service.auth_service import admin_required
+from service.admission_control_service import probe_admission
 
 from model.entity.stream_analysis import StreamAnalysis
 from model.dto.stream_analysis import StreamAnalysisDTO
@@ -78,10 +79,18 @@ def analyze_url():
     if not url:
         flash('URL is required', 'error')
         return redirect(url_for('analysis.index'))
-    
+
+    admission = probe_admission.try_acquire(f"user:{current_user.id}")
+    if not admission.admitted:
+        return admission.message, admission.status_code, admission.headers
+
     try:
-        analysis_service: StreamAnalysisService = get_stream_analysis_service()
-        result: StreamAnalysisDTO = analysis_service.analyze_stream(url)
+        with admission:
+            analysis_service: StreamAnalysisService = get_stream_analysis_service()
+            # under brownout only the response headers are checked (no ffmpeg)
+            result: StreamAnalysisDTO = analysis_service.analyze_stream(url, header_only=admission.brownout)
+        if admission.brownout:
+            flash('Server busy: stream classified from its headers only', 'warning')
 
         analysis_repo: StreamAnalysisRepository = get_analysis_repo()
         # Show the result in a simple format
@@ -35,7 +35,7 @@ def list_sources():
     if stream_type_filter:
         sources = radio_source_repo.find_by_stream_type(int(stream_type_filter))
     elif search_query:
-        sources = radio_source_repo.search_by_name(search_query)
+        sources = radio_source_repo.search(search_query)
     else:
         sources = radio_source_repo.find_all()
 
@@ -1,7 +1,10 @@
-from flask import Blueprint, render_template, abort
+from flask import Blueprint, render_template, abort, jsonify, request
 from model.repository.radio_source_repository import RadioSourceRepository
+from model.repository.track_history_repository import TrackHistoryRepository
 from database import db, get_db_session
+from service.admission_control_service import probe_admission
 from service.stream_metadata_service import StreamMetadataService
+from service.track_history_service import TrackHistoryService
 
 listen_bp = Blueprint("listen", __name__, url_prefix="/listen")
 
@@ -9,14 +12,41 @@ metadata_service = StreamMetadataService()
 
 @listen_bp.route("/<int:source_id>")
 def player(source_id: int):
+    """Render the player straight from DB data.
+
+    Live metadata is never probed here: only a still-fresh cached value is
+    shown, the page fetches the rest from `listen.metadata` once loaded.
+    """
+    repo = RadioSourceRepository(get_db_session())
+    source = repo.find_by_id(source_id)
+    if source is None:
+        abort(404)
+    metadata = metadata_service.get_cached_metadata(source.stream_url)
+    return render_template("listen_player.html", source=source, metadata=metadata)
+
+
+@listen_bp.route("/<int:source_id>/metadata")
+def metadata(source_id: int):
+    """Return live stream metadata as JSON (cached values are reused)."""
     repo = RadioSourceRepository(get_db_session())
     source = repo.find_by_id(source_id)
     if source is None:
         abort(404)
-    metadata = None
-    if getattr(metadata_service, "is_available", False):
+    if not getattr(metadata_service, "is_available", False):
+        return jsonify(available=False, error_message="ffprobe executable not found")
+    admission = probe_admission.try_acquire(request.remote_addr)
+    if not admission.admitted:
+        return jsonify(available=False, error_message=admission.message), admission.status_code, admission.headers
+    with admission:
+        if admission.brownout:
+            # saturated: no new ffprobe, serve what the cache still has
+            cached = metadata_service.get_cached_metadata(source.stream_url)
+            if cached is None:
+                return jsonify(available=False, error_message="Live metadata is paused while the server is busy")
+            return jsonify(cached.model_dump())
         try:
-            metadata = metadata_service.get_metadata(source.stream_url)
-        except Exception:
-            metadata = None
-    return render_template("listen_player.html", source=source, metadata=metadata)
\ No newline at end of file
+            result = metadata_service.get_metadata(source.stream_url)
+        except Exception as exc:
+            return jsonify(available=False, error_message=str(exc))
+    TrackHistoryService(TrackHistoryRepository(get_db_session())).record(source.id, result)
+    return jsonify(result.model_dump())
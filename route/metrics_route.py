@@ -0,0 +1,33 @@
+from flask import Blueprint, Flask, Response, g, request
+
+from service.metrics_service import PROMETHEUS_CONTENT_TYPE, metrics_store, request_finished, request_started
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics")
+def metrics():
+    """Prometheus text exposition of this app's metrics, summed over every worker."""
+    return Response(metrics_store.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def init_request_metrics(app: Flask) -> None:
+    """Time every request and count its SQL statements, labelled by URL rule (not the raw path)."""
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_scope = request_started()
+
+    @app.after_request
+    def _record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(exc):
+        scope = g.pop("metrics_scope", None)
+        if scope is None:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        status = g.pop("metrics_status", 500 if exc is not None else 200)
+        request_finished(scope, request.method, route, status)
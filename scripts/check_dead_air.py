@@ -0,0 +1,39 @@
+# scripts/check_dead_air.py
+import sys
+from pathlib import Path
+import argparse
+from datetime import datetime, timedelta
+# Ensure project root is on path so project modules import when running the script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def main():
+    from database import get_db_session
+    from model.repository.radio_source_repository import RadioSourceRepository
+    from service.silence_detection_service import SilenceDetectionService
+
+    p = argparse.ArgumentParser(description="Flag radio sources that stream silence or a looping jingle")
+    p.add_argument('--batch-size', type=int, default=50, help='sources checked per run')
+    p.add_argument('--seconds', type=int, default=8, help='seconds of audio decoded per source')
+    p.add_argument('--workers', type=int, default=None, help='parallel ffmpeg processes (default: half the cores)')
+    p.add_argument('--cpu-budget', type=float, default=None, help='max ffmpeg CPU seconds per run')
+    p.add_argument('--recheck-hours', type=int, default=24, help='skip sources checked more recently than this')
+    args = p.parse_args()
+
+    service = SilenceDetectionService(
+        RadioSourceRepository(get_db_session()),
+        sample_seconds=args.seconds,
+        max_workers=args.workers,
+        cpu_budget_seconds=args.cpu_budget,
+    )
+    if not service.is_available:
+        print("ffmpeg is not installed or not accessible in PATH.")
+        sys.exit(1)
+
+    results = service.run(args.batch_size, checked_before=datetime.now() - timedelta(hours=args.recheck_hours))
+    dead = [source_id for source_id, level in results.items() if level.available and level.dead_air]
+    failed = [source_id for source_id, level in results.items() if not level.available]
+    print(f"Checked {len(results)} sources: {len(dead)} dead air {dead}, {len(failed)} not decodable {failed}")
+
+if __name__ == '__main__':
+    main()
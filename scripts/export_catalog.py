@@ -0,0 +1,29 @@
+# scripts/export_catalog.py
+import sys
+from pathlib import Path
+import argparse
+# Ensure project root (and the API package, whose modules import each other top-level) are on path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'api'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def main():
+    from database import get_db_session
+    from api.services.radio_source_api_service import RadioSourceAPIService
+
+    p = argparse.ArgumentParser(description="Export the whole catalog as NDJSON (same lines as /api/v1/sources/export.ndjson)")
+    p.add_argument('--output', '-o', default='-', help="output file ('-' for stdout)")
+    args = p.parse_args()
+
+    session = get_db_session()
+    out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        for chunk in RadioSourceAPIService(session).export_ndjson():
+            out.write(chunk)
+    finally:
+        session.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+if __name__ == '__main__':
+    main()
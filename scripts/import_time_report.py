@@ -0,0 +1,91 @@
+# scripts/import_time_report.py
+"""
+Import-time benchmark of the two entry points (`python -X importtime`).
+
+Imports each app in a fresh interpreter `--repeat` times and reports the
+fastest run: total import time, the slowest modules by cumulative time and
+the project's own modules. With `--budget-ms` it exits 1 when an app takes
+longer, so it can guard deploys and CI.
+
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py api --top 30 --budget-ms 900
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# name -> (working directory, module imported by the server)
+TARGETS = {
+    "api": (ROOT / "api", "main"),
+    "web": (ROOT, "app"),
+}
+PROJECT_PACKAGES = ("api", "routes", "schemas", "services", "deps", "database", "app", "main", "model", "service", "route")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# (self us, cumulative us, depth, module)
+Entry = Tuple[int, int, int, str]
+
+
+def measure(cwd: Path, module: str) -> List[Entry]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(cwd), str(ROOT)])}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, env=env, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries: List[Entry] = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            entries.append((int(match[1]), int(match[2]), len(match[3]) // 2, match[4]))
+    return entries
+
+
+def total_us(entries: List[Entry], module: str) -> int:
+    return next(cumulative for _, cumulative, _, name in reversed(entries) if name == module)
+
+
+def report(name: str, entries: List[Entry], module: str, top: int) -> str:
+    lines = [f"== {name}: import {module} = {total_us(entries, module) / 1000:.1f} ms",
+             f"-- slowest {top} modules (cumulative ms / self ms)"]
+    for self_us, cumulative, _, mod in sorted(entries, key=lambda e: -e[1])[1:top + 1]:
+        lines.append(f"{cumulative / 1000:9.1f} {self_us / 1000:9.1f}  {mod}")
+    own = [entry for entry in entries if entry[3].split(".")[0] in PROJECT_PACKAGES]
+    lines.append(f"-- project modules ({len(own)}), self ms")
+    for self_us, _, _, mod in sorted(own, key=lambda e: -e[0])[:top]:
+        lines.append(f"{self_us / 1000:9.1f}  {mod}")
+    return "\n".join(lines)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Report the import time of the API and the Flask app")
+    p.add_argument("targets", nargs="*", help=f"apps to measure ({', '.join(TARGETS)}; default: all)")
+    p.add_argument("--repeat", type=int, default=3, help="runs per app, the fastest is reported")
+    p.add_argument("--top", type=int, default=15, help="modules listed per section")
+    p.add_argument("--budget-ms", type=float, default=None, help="fail when an app imports slower than this")
+    args = p.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        p.error(f"unknown target(s): {', '.join(unknown)}")
+
+    over_budget = False
+    for name in args.targets or TARGETS:
+        cwd, module = TARGETS[name]
+        runs = [measure(cwd, module) for _ in range(max(1, args.repeat))]
+        fastest = min(runs, key=lambda entries: total_us(entries, module))
+        print(report(name, fastest, module, args.top))
+        print()
+        if args.budget_ms is not None and total_us(fastest, module) / 1000 > args.budget_ms:
+            print(f"{name} is over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+            over_budget = True
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
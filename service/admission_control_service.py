@@ -0,0 +1,170 @@
+"""
+AdmissionControlService - Concurrency governor for endpoints that spawn ffprobe/ffmpeg/curl.
+
+Every probe-backed request must be admitted first. Each client draws from
+its own token bucket (a steady rate plus a small burst), and the whole
+process never runs more than `max_in_flight` probes at once: a batch request
+holds one slot per probe it runs in parallel, and one client holds at most
+`max_client_slots` of them so a few batches cannot starve everyone else.
+Rejected requests are answered at once with 429 (client over its rate) or
+503 (box saturated) and a Retry-After hint instead of queueing behind the
+probes already running.
+
+Past `brownout_ratio` of the in-flight cap the controller reports brownout:
+callers keep serving, but drop the expensive part (listen pages serve only
+cached metadata, analysis classifies from headers without ffmpeg).
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> float:
+        """Take `cost` tokens. Returns 0 when granted, else the seconds until they would be available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class Admission:
+    """Outcome of `AdmissionController.try_acquire`; release admitted tickets when the work is done."""
+
+    def __init__(self, controller: "AdmissionController", admitted: bool, status_code: int = 200,
+                 retry_after: int = 0, brownout: bool = False, slots: int = 0, client_key: str = ""):
+        self.controller = controller
+        self.admitted = admitted
+        self.client_key = client_key
+        # in-flight slots held: the most probes the request may run at once
+        self.slots = slots
+        # 429 (client over its rate) or 503 (in-flight cap reached) when rejected
+        self.status_code = status_code
+        self.retry_after = retry_after
+        # admitted under brownout: skip the expensive part of the work
+        self.brownout = brownout
+        self._released = not admitted
+
+    @property
+    def message(self) -> str:
+        if self.status_code == 429:
+            return "Too many probe requests from this client, retry later"
+        return "Server busy probing streams, retry later"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Response headers for a rejection."""
+        return {"Retry-After": str(self.retry_after)} if not self.admitted else {}
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.controller._release(self.client_key, self.slots)
+
+    def __enter__(self) -> "Admission":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """Per-client token buckets plus a process-wide cap on in-flight probe requests."""
+
+    def __init__(
+        self,
+        rate_per_client: float = 0.5,
+        burst: int = 5,
+        max_in_flight: int = 8,
+        max_client_slots: Optional[int] = None,
+        brownout_ratio: float = 0.75,
+        busy_retry_after_seconds: int = 2,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_client = rate_per_client
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        # default: half the cap, so one client never holds every slot
+        self.max_client_slots = max_client_slots or max(1, max_in_flight // 2)
+        self.brownout_threshold = max(1, math.ceil(max_in_flight * brownout_ratio))
+        self.busy_retry_after_seconds = busy_retry_after_seconds
+        self.max_clients = max_clients
+        self.clock = clock
+        self.in_flight = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._client_slots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def brownout(self) -> bool:
+        return self.in_flight >= self.brownout_threshold
+
+    def try_acquire(self, client_key: Optional[str], cost: int = 1, probes: int = 1) -> Admission:
+        """
+        Admit one probe request for `client_key` without waiting.
+
+        Args:
+            cost: tokens drawn from the client's bucket (capped at the burst size),
+                e.g. the number of streams a batch request probes
+            probes: probes the request would run in parallel; it gets one in-flight
+                slot per probe, as many as are free and the client may still hold
+                (at least one), and must not run more probes at once than the
+                admission's `slots`
+        """
+        now = self.clock()
+        key = client_key or "anonymous"
+        tokens = min(max(1, cost), self.burst)
+        with self._lock:
+            bucket = self._bucket(key, now)
+            wait = bucket.take(now, tokens)
+            if wait > 0:
+                return Admission(self, False, 429, max(1, math.ceil(wait)))
+            held = self._client_slots.get(key, 0)
+            if held >= self.max_client_slots:
+                # the client already runs its share of probes; the request did not run
+                bucket.tokens = min(bucket.capacity, bucket.tokens + tokens)
+                return Admission(self, False, 429, self.busy_retry_after_seconds)
+            if self.in_flight >= self.max_in_flight:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + tokens)
+                return Admission(self, False, 503, self.busy_retry_after_seconds)
+            brownout = self.brownout
+            slots = min(max(1, probes), self.max_in_flight - self.in_flight, self.max_client_slots - held)
+            self.in_flight += slots
+            self._client_slots[key] = held + slots
+            return Admission(self, True, brownout=brownout, slots=slots, client_key=key)
+
+    def _release(self, client_key: str, slots: int) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - slots)
+            held = self._client_slots.pop(client_key, 0) - slots
+            if held > 0:
+                self._client_slots[client_key] = held
+
+    def _bucket(self, client_key: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                # full buckets carry no state worth keeping
+                self._buckets = {key: b for key, b in self._buckets.items() if not b.is_full(now)}
+            bucket = self._buckets[client_key] = TokenBucket(self.rate_per_client, self.burst, now)
+        return bucket
+
+
+# Shared by every probe-backed route in this process (Flask app or API)
+probe_admission = AdmissionController()
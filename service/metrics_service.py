@@ -0,0 +1,407 @@
+"""
+MetricsService - In-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms live in a process-wide registry. Web workers
+are separate processes, so each one periodically publishes a JSON snapshot
+of its registry to `METRICS_DIR` (one file per app and pid, replaced
+atomically) and `/metrics` merges every snapshot of its app: counters and
+histograms are summed, gauges of workers that have exited are dropped.
+The files of exited workers are folded into one exited total, so the
+directory does not grow with worker restarts and a reused pid does not
+overwrite the counters of the worker that had it before.
+Without `METRICS_DIR` only the serving process is reported.
+
+Request scopes collect per-request database statistics through SQLAlchemy
+cursor events (every Engine, sync and async) and a ContextVar.
+"""
+
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Queries per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# `<app>-exited.json` sums the counters and histograms of the workers that have exited
+EXITED = "exited"
+LOCK_FILE_NAME = "metrics.lock"
+
+LabelKey = Tuple[str, ...]
+
+logger = logging.getLogger(__name__)
+
+
+class Metric:
+    """One metric family: samples keyed by label values."""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, kind: str, help_text: str,
+                 labelnames: Sequence[str], buckets: Optional[Sequence[float]] = None):
+        self.registry = registry
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets else None
+        self.samples: Dict[LabelKey, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(Metric):
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self.registry.lock:
+            self.samples[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        buckets = self.buckets or ()
+        with self.registry.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                # [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+                sample = self.samples[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+
+class MetricsRegistry:
+    """Process-wide metric families, created on first use."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, "counter", help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, "gauge", help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, "histogram", help_text, labelnames, buckets)
+
+    def _get(self, cls: type, name: str, kind: str, help_text: str, labelnames: Sequence[str],
+             buckets: Optional[Sequence[float]] = None) -> Any:
+        with self.lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, kind, help_text, labelnames, buckets)
+            return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable copy of every family."""
+        with self.lock:
+            return {
+                metric.name: {
+                    "type": metric.kind,
+                    "help": metric.help,
+                    "labelnames": list(metric.labelnames),
+                    "buckets": list(metric.buckets) if metric.buckets else None,
+                    "samples": [[list(key), json.loads(json.dumps(value))] for key, value in metric.samples.items()],
+                }
+                for metric in self._metrics.values()
+            }
+
+
+def merge_snapshots(snapshots: List[Tuple[Dict[str, Any], bool]]) -> Dict[str, Any]:
+    """Sum (snapshot, worker alive) pairs; gauges only count for live workers."""
+    merged: Dict[str, Any] = {}
+    for snapshot, alive in snapshots:
+        for name, family in snapshot.items():
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = json.loads(json.dumps(value))
+                elif family["type"] == "histogram":
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target["samples"][key] = current + value
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family["samples"].items()]
+    return merged
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Prometheus text exposition format (0.0.4) of a snapshot."""
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in sorted(family["samples"]):
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(family['labelnames'], labels)} {_format_value(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(list(family["buckets"]) + ["+Inf"], counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(family['labelnames'], labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(family['labelnames'], labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(family['labelnames'], labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsStore:
+    """File-backed aggregation of the registries of every worker of one app."""
+
+    def __init__(self, registry: MetricsRegistry, directory: Optional[str] = None,
+                 app_name: str = "app", publish_interval_seconds: float = 5.0):
+        self.registry = registry
+        self.directory = directory
+        self.app_name = app_name
+        self.publish_interval_seconds = publish_interval_seconds
+        self._published_at = 0.0
+        # pid whose file this process owns (set on its first publish, changes after a fork)
+        self._claimed_pid: Optional[int] = None
+
+    def _path(self, directory: str, worker: Any) -> str:
+        return os.path.join(directory, f"{self.app_name}-{worker}.json")
+
+    def maybe_publish(self) -> None:
+        if self.directory and time.monotonic() - self._published_at >= self.publish_interval_seconds:
+            self.publish()
+
+    def publish(self) -> None:
+        """Write this worker's snapshot (temp file + rename, readers never see a partial file)."""
+        directory = self.directory
+        if not directory:
+            return
+        self._published_at = time.monotonic()
+        pid = os.getpid()
+        path = self._path(directory, pid)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if self._claimed_pid != pid:
+                # a file under this pid was left by an exited worker whose pid was reused
+                with _directory_lock(directory):
+                    self._fold_exited(directory, [path])
+                self._claimed_pid = pid
+            _write_snapshot(path, self.registry.snapshot())
+        except OSError as e:
+            logger.warning("Failed to publish metrics to %s: %s", directory, e)
+
+    def collect(self) -> Dict[str, Any]:
+        """This process's live registry merged with the published snapshots of the other workers."""
+        snapshots: List[Tuple[Dict[str, Any], bool]] = [(self.registry.snapshot(), True)]
+        directory = self.directory
+        if directory:
+            self.publish()
+            workers = [(path, pid) for path, pid in self._worker_files(directory) if pid != os.getpid()]
+            dead = [path for path, pid in workers if not _pid_alive(pid)]
+            if dead:
+                try:
+                    with _directory_lock(directory):
+                        self._fold_exited(directory, dead)
+                except OSError as e:
+                    logger.warning("Failed to fold metrics of exited workers in %s: %s", directory, e)
+            live = [(path, True) for path, _ in workers if path not in dead]
+            for path, alive in live + [(self._path(directory, EXITED), False)]:
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    snapshots.append((snapshot, alive))
+        return merge_snapshots(snapshots)
+
+    def _worker_files(self, directory: str) -> List[Tuple[str, int]]:
+        files: List[Tuple[str, int]] = []
+        for path in glob.glob(self._path(directory, "*")):
+            try:
+                files.append((path, int(os.path.basename(path)[len(self.app_name) + 1:-len(".json")])))
+            except ValueError:
+                continue  # the exited total
+        return files
+
+    def _fold_exited(self, directory: str, paths: List[str]) -> None:
+        """Add the counters and histograms of exited workers to the exited total and drop their files (under the lock)."""
+        folded = [snapshot for snapshot in map(_read_snapshot, paths) if snapshot is not None]
+        if folded:
+            exited_path = self._path(directory, EXITED)
+            exited = _read_snapshot(exited_path)
+            # gauges are dropped: they only count for live workers
+            _write_snapshot(exited_path, merge_snapshots([(snapshot, False) for snapshot in
+                                                          ([exited] if exited is not None else []) + folded]))
+        for path in paths:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def render(self) -> str:
+        return render_prometheus(self.collect())
+
+
+def _read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path: str, snapshot: Dict[str, Any]) -> None:
+    with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+        json.dump(snapshot, handle)
+    os.replace(f"{path}.tmp", path)
+
+
+@contextmanager
+def _directory_lock(directory: str) -> Iterator[None]:
+    """Exclusive lock among the workers sharing `directory`, so an exited worker is folded only once."""
+    if sys.platform == "win32":
+        yield
+        return
+    import fcntl
+    with open(os.path.join(directory, LOCK_FILE_NAME), "a+b") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+# Shared by every module of this process; each app sets `metrics_store.app_name` at startup
+metrics = MetricsRegistry()
+metrics_store = MetricsStore(metrics, directory=os.getenv("METRICS_DIR"))
+
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "Requests being served")
+HTTP_DURATION = metrics.histogram("http_request_duration_seconds", "Request latency",
+                                  ("method", "route", "status"))
+HTTP_DB_QUERIES = metrics.histogram("http_request_db_queries", "SQL statements per request", ("route",),
+                                    buckets=QUERY_COUNT_BUCKETS)
+HTTP_DB_SECONDS = metrics.histogram("http_request_db_seconds", "Time spent in SQL per request", ("route",))
+DB_QUERIES = metrics.counter("db_queries_total", "SQL statements executed")
+DB_QUERY_SECONDS = metrics.histogram("db_query_duration_seconds", "SQL statement latency")
+PROBE_SPAWNS = metrics.counter("probe_spawns_total", "External probe processes started", ("tool",))
+PROBE_SECONDS = metrics.histogram("probe_duration_seconds", "External probe process run time", ("tool",))
+PROBE_TIMEOUTS = metrics.counter("probe_timeouts_total", "External probe processes killed on timeout", ("tool",))
+CACHE_REQUESTS = metrics.counter("cache_requests_total", "Cache lookups by outcome (hit/miss)", ("cache", "result"))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def observe_probe(tool: str) -> Iterator[None]:
+    """Count and time one external process run; timeouts are counted and re-raised."""
+    PROBE_SPAWNS.inc(tool=tool)
+    started = time.perf_counter()
+    try:
+        yield
+    except subprocess.TimeoutExpired:
+        PROBE_TIMEOUTS.inc(tool=tool)
+        raise
+    finally:
+        PROBE_SECONDS.observe(time.perf_counter() - started, tool=tool)
+
+
+# [statement count, seconds] of the request being served in this context
+_request_db: ContextVar[Optional[List[float]]] = ContextVar("request_db", default=None)
+
+
+class RequestScope:
+    """Start time and database counters of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db: List[float] = [0, 0.0]
+        self.token: Token = _request_db.set(self.db)
+
+
+def request_started() -> RequestScope:
+    HTTP_IN_FLIGHT.inc()
+    return RequestScope()
+
+
+def request_finished(scope: RequestScope, method: str, route: str, status: int) -> None:
+    HTTP_IN_FLIGHT.dec()
+    try:
+        _request_db.reset(scope.token)
+    except ValueError:
+        pass  # finished in a copied context (e.g. a threadpool)
+    HTTP_DURATION.observe(time.perf_counter() - scope.started, method=method, route=route, status=status)
+    HTTP_DB_QUERIES.observe(scope.db[0], route=route)
+    HTTP_DB_SECONDS.observe(scope.db[1], route=route)
+    metrics_store.maybe_publish()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("metrics_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.observe(elapsed)
+    request_db = _request_db.get()
+    if request_db is not None:
+        request_db[0] += 1
+        request_db[1] += elapsed
@@ -7,8 +7,11 @@ transaction handling.
 """
 
 from datetime import datetime
-from typing import List, Any
+from typing import Dict, List, Any
+from sqlalchemy.orm.attributes import instance_state
 from model.dto.radio_source import RadioSourceDTO
+from model.dto.stream_type import StreamTypeDTO
+from model.dto.user import UserDTO
 from model.entity.proposal import Proposal
 from model.repository.proposal_repository import ProposalRepository
 
@@ -103,7 +106,7 @@ class RadioSourceService:
         )
      
         try:
-            # Save RadioSourceNode (this will commit the transaction)
+            # Save RadioSourceNode (this will commit the transaction and bump the catalog version)
             saved_source: RadioSource = self.radio_source_repo.save(radio_source)
             print(saved_source)
             # Delete proposal after successful save
@@ -156,34 +159,51 @@ class RadioSourceService:
             List of all radio sources
         """
         radio_sources: List[RadioSource] = self.radio_source_repo.find_all()
+        return self.to_dtos(radio_sources)
+
+    def to_dtos(self, radio_sources: List[RadioSource]) -> list[RadioSourceDTO] | list[RadioSource]:
+        """
+        Build RadioSourceDTOs for many entities at once.
+
+        Uses the `stream_type` / `user` relationships already loaded by the
+        repository (selectinload), validating each distinct stream type and user
+        only once. Relationships that are not loaded are resolved through the
+        collaborator services, once per distinct id.
+        """
+        stream_types: Dict[int, StreamTypeDTO | None] = {}
+        users: Dict[int, UserDTO | None] = {}
+
+        def _stream_type_dto(source: RadioSource) -> StreamTypeDTO | None | Any:
+            key = source.stream_type_id
+            if key not in stream_types:
+                if "stream_type" not in instance_state(source).unloaded and source.stream_type is not None:
+                    stream_types[key] = StreamTypeDTO.model_validate(source.stream_type)
+                else:
+                    stream_types[key] = self.stream_type_service.get_stream_type(key)
+            return stream_types[key]
+
+        def _user_dto(source: RadioSource) -> UserDTO | None | Any:
+            key = source.created_by
+            if key is None:
+                return None
+            if key not in users:
+                if "user" not in instance_state(source).unloaded and source.user is not None:
+                    users[key] = UserDTO.model_validate(source.user)
+                else:
+                    users[key] = self.auth_service.get_user_by_id(key)
+            return users[key]
+
         radio_source_dtos: List[RadioSourceDTO] = []
         for saved_source in radio_sources:
-            # Defensive conversion for nested objects (user, stream_type)
-            user_obj = self.auth_service.get_user_by_id(saved_source.created_by)
-            stream_type_obj = self.stream_type_service.get_stream_type(saved_source.stream_type_id)
+            stream_type_obj = _stream_type_dto(saved_source)
+            user_obj = _user_dto(saved_source)
 
             # If collaborator services return Mock objects (test-suite stubs),
             # return raw entity list to preserve older tests that expect entities.
             if isinstance(user_obj, Mock) or isinstance(stream_type_obj, Mock):
                 return radio_sources
 
-            def _to_plain(o, fields: list[str]) -> dict | None:
-                if o is None:
-                    return None
-                if hasattr(o, "model_dump"):
-                    try:
-                        return o.model_dump()
-                    except Exception:
-                        pass
-                try:
-                    return {f: getattr(o, f, None) for f in fields}
-                except Exception:
-                    return None
-
-            user_dict = _to_plain(user_obj, ["id", "email", "role", "hash_password", "is_active", "created_at", "updated_at"]) 
-            stream_type_dict = _to_plain(stream_type_obj, ["id", "name", "description", "protocol", "format", "metadata_type", "display_name"]) 
-
-            new_radio_source: RadioSourceDTO = RadioSourceDTO.model_validate(obj={
+            radio_source_dtos.append(RadioSourceDTO.model_validate(obj={
                 "id": saved_source.id,
                 "stream_url": saved_source.stream_url,
                 "name": saved_source.name,
@@ -192,13 +212,14 @@ class RadioSourceService:
                 "country": saved_source.country,
                 "description": saved_source.description,
                 "image_url": saved_source.image_url,
+                "dead_air": bool(saved_source.dead_air),
+                "audio_checked_at": saved_source.audio_checked_at,
                 "created_at": saved_source.created_at,
                 "updated_at": saved_source.updated_at,
-                "user": user_dict,
-                "stream_type": stream_type_dict
-            })
-            radio_source_dtos.append(new_radio_source)
-        return radio_source_dtos   
+                "user": user_obj,
+                "stream_type": stream_type_obj
+            }))
+        return radio_source_dtos
 
     # Proposal-related helpers used by routes/tests
     def update_proposal(self, proposal_id: int, update_request) -> Proposal:
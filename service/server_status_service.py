@@ -0,0 +1,196 @@
+"""
+ServerStatusService - Bulk metadata harvesting from Icecast/Shoutcast servers.
+
+Stations whose stream type carries Icecast or Shoutcast metadata are grouped
+by server (scheme, host, port). The server status page is fetched once per
+server (`/status-json.xsl` for Icecast, `/statistics?json=1` for Shoutcast v2)
+and its entries are matched back to every mount of that server, instead of
+spawning one ffprobe per mount.
+"""
+
+import json
+import logging
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from model.dto.stream_metadata import StreamMetadataDTO
+
+ServerKey = Tuple[str, str, int]
+
+# Content types reported by the servers mapped to our format names
+_FORMAT_BY_CONTENT_TYPE = {
+    "audio/mpeg": "MP3",
+    "audio/mp3": "MP3",
+    "audio/aac": "AAC",
+    "audio/aacp": "AAC",
+    "audio/ogg": "OGG",
+    "application/ogg": "OGG",
+}
+
+HARVESTABLE_METADATA_TYPES = ("Icecast", "Shoutcast")
+
+logger = logging.getLogger(__name__)
+
+
+class ServerStatusService:
+    """Fetches server status pages and maps them to per-station metadata."""
+
+    def __init__(self, fetch: Optional[Callable[[str, float], Optional[str]]] = None,
+                 timeout_seconds: float = 5, max_workers: int = 8):
+        # `fetch(url, timeout)` returns the response body or None; injectable for tests
+        self.fetch: Callable[[str, float], Optional[str]] = fetch or self._http_get
+        self.timeout_seconds = timeout_seconds
+        self.max_workers = max_workers
+
+    def harvest(self, stations: Iterable[Tuple[int, str, str]],
+                timeout_seconds: Optional[float] = None) -> Dict[int, StreamMetadataDTO]:
+        """
+        Harvest metadata for many stations with one status request per server.
+
+        Args:
+            stations: (source_id, stream_url, metadata_type) tuples; entries whose
+                metadata type is not Icecast/Shoutcast are ignored
+            timeout_seconds: per-server request timeout (defaults to the service setting)
+
+        Returns:
+            Mapping source_id -> metadata for every station whose mount is listed
+            on its server; the others are left to ffprobe
+        """
+        groups: Dict[Tuple[ServerKey, str], List[Tuple[int, str]]] = {}
+        for source_id, stream_url, metadata_type in stations:
+            if metadata_type not in HARVESTABLE_METADATA_TYPES:
+                continue
+            key = self._server_key(stream_url)
+            if key is None:
+                continue
+            groups.setdefault((key, metadata_type), []).append((source_id, self._mount_path(stream_url)))
+
+        if not groups:
+            return {}
+
+        timeout = timeout_seconds or self.timeout_seconds
+        results: Dict[int, StreamMetadataDTO] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(groups)))) as executor:
+            harvested = executor.map(lambda item: self._harvest_server(item[0][0], item[0][1], item[1], timeout), groups.items())
+            for server_results in harvested:
+                results.update(server_results)
+        return results
+
+    def _harvest_server(self, key: ServerKey, metadata_type: str,
+                        mounts: List[Tuple[int, str]], timeout_seconds: float) -> Dict[int, StreamMetadataDTO]:
+        if metadata_type == "Icecast":
+            entries = self._icecast_entries(key, timeout_seconds)
+        else:
+            entries = self._shoutcast_entries(key, timeout_seconds)
+        if not entries:
+            return {}
+
+        return {source_id: entries[mount] for source_id, mount in mounts if mount in entries}
+
+    def _icecast_entries(self, key: ServerKey, timeout_seconds: float) -> Dict[str, StreamMetadataDTO]:
+        payload = self._fetch_json(f"{self._base_url(key)}/status-json.xsl", timeout_seconds)
+        icestats = (payload or {}).get("icestats") or {}
+        sources = icestats.get("source") or []
+        if isinstance(sources, dict):
+            sources = [sources]
+
+        entries: Dict[str, StreamMetadataDTO] = {}
+        for src in sources:
+            listen_url = src.get("listenurl")
+            if not listen_url:
+                continue
+            bitrate = self._parse_int(src.get("audio_bitrate"))
+            if bitrate is None:
+                kbps = self._parse_int(src.get("bitrate") or src.get("ice-bitrate"))
+                bitrate = kbps * 1000 if kbps is not None else None
+            title = src.get("title")
+            if title and src.get("artist"):
+                title = f"{src['artist']} - {title}"
+            entries[self._mount_path(listen_url)] = StreamMetadataDTO(
+                available=True,
+                format=self._format_from_content_type(src.get("server_type")),
+                bitrate=bitrate,
+                genre=src.get("genre") or None,
+                current_track=title or None,
+                listeners=self._parse_int(src.get("listeners")),
+            )
+        return entries
+
+    def _shoutcast_entries(self, key: ServerKey, timeout_seconds: float) -> Dict[str, StreamMetadataDTO]:
+        payload = self._fetch_json(f"{self._base_url(key)}/statistics?json=1", timeout_seconds)
+        streams = (payload or {}).get("streams") or []
+
+        entries: Dict[str, StreamMetadataDTO] = {}
+        for stream in streams:
+            kbps = self._parse_int(stream.get("bitrate"))
+            entry = StreamMetadataDTO(
+                available=True,
+                format=self._format_from_content_type(stream.get("content")),
+                bitrate=kbps * 1000 if kbps is not None else None,
+                genre=stream.get("servergenre") or None,
+                current_track=stream.get("songtitle") or None,
+                listeners=self._parse_int(stream.get("currentlisteners")),
+            )
+            # every stream is also served as /stream/<id>/, and the default one (id 1) as / or /;
+            paths = {self._mount_path(stream.get("streampath") or "/"), f"/stream/{stream.get('id')}"}
+            if stream.get("id") == 1:
+                paths.add("/")
+            for path in paths:
+                entries[path] = entry
+        return entries
+
+    def _fetch_json(self, url: str, timeout_seconds: float) -> Optional[Dict[str, Any]]:
+        try:
+            body = self.fetch(url, timeout_seconds)
+        except Exception as e:
+            logger.warning("Server status fetch failed for %s: %s", url, e)
+            return None
+        if not body:
+            return None
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _http_get(self, url: str, timeout_seconds: float) -> Optional[str]:
+        request = urllib.request.Request(url, headers={"User-Agent": "RadioChWeb"})
+        with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
+            if response.status != 200:
+                return None
+            return response.read().decode("utf-8", errors="replace")
+
+    def _server_key(self, stream_url: str) -> Optional[ServerKey]:
+        parsed = urlparse(stream_url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ("http", "https") or not parsed.hostname:
+            return None
+        try:
+            port = parsed.port or (443 if scheme == "https" else 80)
+        except ValueError:
+            return None
+        return scheme, parsed.hostname.lower(), port
+
+    def _base_url(self, key: ServerKey) -> str:
+        scheme, host, port = key
+        return f"{scheme}://{host}:{port}"
+
+    def _mount_path(self, url_or_path: str) -> str:
+        path = urlparse(url_or_path).path if "://" in url_or_path else url_or_path
+        path = path.rstrip(";").rstrip("/")
+        return path or "/"
+
+    def _format_from_content_type(self, content_type: Optional[str]) -> Optional[str]:
+        if not content_type:
+            return None
+        return _FORMAT_BY_CONTENT_TYPE.get(content_type.split(";")[0].strip().lower())
+
+    def _parse_int(self, value: Any) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
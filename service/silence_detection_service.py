@@ -0,0 +1,195 @@
+"""
+SilenceDetectionService - Dead-air detection for catalog health.
+
+Stream validation only checks that a codec header exists, so stations that
+stream silence or a looping error jingle pass it. This service decodes a few
+seconds of each station to mono 16-bit PCM through an ffmpeg pipe, computes
+RMS/peak levels, silence ratio and envelope periodicity with NumPy, and
+stores a `dead_air` flag per RadioSource.
+
+Batches run over a small worker pool; ffmpeg runs single-threaded at a low
+scheduling priority and a batch stops submitting new checks once the ffmpeg
+children have used up the CPU budget (remaining stations are picked up by
+the next run).
+"""
+
+import logging
+import os
+import resource
+import shutil
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from model.dto.audio_level import AudioLevelDTO
+from model.entity.radio_source import RadioSource
+from model.repository.radio_source_repository import RadioSourceRepository
+from service.metrics_service import observe_probe
+
+logger = logging.getLogger(__name__)
+
+_EPSILON = 1e-10
+
+
+class SilenceDetectionService:
+    """Decodes stream samples and flags stations that broadcast dead air."""
+
+    def __init__(
+        self,
+        radio_source_repo: RadioSourceRepository,
+        ffmpeg_path: Optional[str] = None,
+        sample_seconds: int = 8,
+        sample_rate: int = 8000,
+        frame_ms: int = 50,
+        silence_threshold_db: float = -50.0,
+        dead_air_ratio: float = 0.9,
+        loop_correlation: float = 0.99,
+        max_workers: Optional[int] = None,
+        cpu_budget_seconds: Optional[float] = None,
+    ):
+        self.radio_source_repo: RadioSourceRepository = radio_source_repo
+        self.ffmpeg_path = ffmpeg_path or shutil.which("ffmpeg")
+        self.nice_path = shutil.which("nice")
+        self.sample_seconds = sample_seconds
+        self.sample_rate = sample_rate
+        self.frame_size = max(1, sample_rate * frame_ms // 1000)
+        self.silence_threshold_db = silence_threshold_db
+        self.dead_air_ratio = dead_air_ratio
+        self.loop_correlation = loop_correlation
+        # Half of the cores by default: the web workers share this machine
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.cpu_budget_seconds = cpu_budget_seconds
+
+    @property
+    def is_available(self) -> bool:
+        return bool(self.ffmpeg_path)
+
+    # Decoding
+
+    def decode_pcm(self, url: str, timeout_seconds: Optional[int] = None) -> bytes:
+        """Decode `sample_seconds` of `url` to mono s16le PCM at `sample_rate` Hz."""
+        if not self.ffmpeg_path:
+            raise RuntimeError("ffmpeg is not installed or not accessible in PATH. Required for dead-air detection.")
+        # run at low priority (preexec_fn is unsafe from worker threads, use nice(1) instead)
+        prefix = [self.nice_path, "-n", "10"] if self.nice_path else []
+        with observe_probe("ffmpeg_decode"):
+            result = subprocess.run(
+                prefix + [self.ffmpeg_path, "-nostdin", "-v", "error", "-threads", "1",
+                 "-i", url, "-t", str(self.sample_seconds), "-vn", "-ac", "1",
+                 "-ar", str(self.sample_rate), "-f", "s16le", "-"],
+                capture_output=True,
+                timeout=timeout_seconds or self.sample_seconds + 15,
+                check=False,
+            )
+        if result.returncode != 0 and not result.stdout:
+            raise RuntimeError(result.stderr.decode("utf-8", errors="replace").strip() or "ffmpeg failed")
+        return result.stdout
+
+    # Analysis
+
+    def analyze_pcm(self, pcm: bytes) -> AudioLevelDTO:
+        """Compute loudness statistics of s16le PCM and decide whether it is dead air."""
+        samples = np.frombuffer(pcm[: len(pcm) - len(pcm) % 2], dtype="<i2").astype(np.float32) / 32768.0
+        n_frames = samples.size // self.frame_size
+        if n_frames < 2:
+            return AudioLevelDTO(available=False, error_message="not enough audio decoded")
+
+        frames = samples[: n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        frame_rms = np.sqrt(np.mean(np.square(frames), axis=1))
+
+        rms_db = float(20 * np.log10(np.sqrt(np.mean(np.square(samples))) + _EPSILON))
+        peak_db = float(20 * np.log10(np.max(np.abs(samples)) + _EPSILON))
+        silence_ratio = float(np.mean(20 * np.log10(frame_rms + _EPSILON) < self.silence_threshold_db))
+        is_looping = silence_ratio < self.dead_air_ratio and self._is_looping(frame_rms)
+
+        return AudioLevelDTO(
+            available=True,
+            rms_db=round(rms_db, 2),
+            peak_db=round(peak_db, 2),
+            silence_ratio=round(silence_ratio, 4),
+            is_looping=is_looping,
+            dead_air=silence_ratio >= self.dead_air_ratio or is_looping,
+        )
+
+    def _is_looping(self, envelope: np.ndarray) -> bool:
+        """
+        Detect a short clip repeated over and over from the loudness envelope.
+
+        Uses the normalized autocorrelation of the per-frame RMS for lags of at
+        least one second, requiring two full repetitions within the sample.
+        """
+        n = envelope.size
+        min_lag = max(1, self.sample_rate // self.frame_size)
+        max_lag = n // 2
+        std = float(envelope.std())
+        if max_lag < min_lag or std < 1e-3 * (float(envelope.mean()) + _EPSILON):
+            return False
+
+        centered = (envelope - envelope.mean()) / std
+        autocorr = np.correlate(centered, centered, mode="full")[n - 1:]
+        lags = np.arange(min_lag, max_lag + 1)
+        normalized = autocorr[lags] / (n - lags)
+        return bool(np.max(normalized) >= self.loop_correlation)
+
+    # Pipeline
+
+    def check_stream(self, url: str) -> AudioLevelDTO:
+        if not self.is_available:
+            return AudioLevelDTO(available=False, error_message="ffmpeg executable not found")
+        try:
+            pcm = self.decode_pcm(url)
+        except subprocess.TimeoutExpired as exc:
+            return AudioLevelDTO(available=False, error_message=f"ffmpeg timed out ({exc})")
+        except Exception as exc:
+            return AudioLevelDTO(available=False, error_message=str(exc))
+        return self.analyze_pcm(pcm)
+
+    def check_sources(self, sources: List[RadioSource]) -> Dict[int, AudioLevelDTO]:
+        """
+        Check many sources over the worker pool, honouring the CPU budget.
+
+        Returns:
+            Mapping source_id -> audio levels for every source checked
+        """
+        results: Dict[int, AudioLevelDTO] = {}
+        cpu_start = self._children_cpu_seconds()
+        queue = list(sources)
+        in_flight: Dict[Future, int] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.max_workers and not self._over_budget(cpu_start):
+                    source = queue.pop(0)
+                    in_flight[executor.submit(self.check_stream, source.stream_url)] = source.id
+                if not in_flight:
+                    break
+                done: Set[Future] = wait(in_flight, return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    results[in_flight.pop(future)] = future.result()
+
+        if queue:
+            logger.warning("Dead-air check stopped by CPU budget, %d sources left for the next run", len(queue))
+        return results
+
+    def run(self, batch_size: int = 50, checked_before: Optional[datetime] = None) -> Dict[int, AudioLevelDTO]:
+        """Check the next batch of sources and persist their dead-air flags."""
+        sources: List[RadioSource] = self.radio_source_repo.find_for_audio_check(batch_size, checked_before)
+        results = self.check_sources(sources)
+        # Unreachable streams are a validation concern, only flag what was actually decoded
+        flags = {source_id: level.dead_air for source_id, level in results.items() if level.available}
+        if flags:
+            self.radio_source_repo.save_dead_air_flags(flags, datetime.now())
+        return results
+
+    def _over_budget(self, cpu_start: float) -> bool:
+        if self.cpu_budget_seconds is None:
+            return False
+        return self._children_cpu_seconds() - cpu_start >= self.cpu_budget_seconds
+
+    @staticmethod
+    def _children_cpu_seconds() -> float:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
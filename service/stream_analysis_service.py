@@ -22,6 +22,7 @@ from model.repository import user_repository
 from model.repository.stream_analysis_repository import StreamAnalysisRepository
 from service.stream_type_service import StreamTypeService
 from model.repository.proposal_repository import ProposalRepository
+from service.metrics_service import observe_probe
 
 
 class StreamAnalysisService:
@@ -79,13 +80,15 @@ class StreamAnalysisService:
 
 
     # Service method to analyze a stream and create a stream analysis
-    def analyze_stream(self, url: str, timeout_seconds: int = 30) -> StreamAnalysisDTO:
+    def analyze_stream(self, url: str, timeout_seconds: int = 30, header_only: bool = False) -> StreamAnalysisDTO:
         """
         Main entry point for stream analysis (spec 003).
         
         Args:
             url: The stream URL to analyze
             timeout_seconds: Maximum time to spend on analysis (default: 30s as per SC-001)
+            header_only: skip the ffmpeg pass and classify from the curl headers alone
+                (used under load, see AdmissionController brownout)
             
         Returns:
             StreamAnalysisDTO with validation and classification data
@@ -110,7 +113,10 @@ class StreamAnalysisService:
         try:
             # FR-002: Perform dual validation
             curl_result = self._analyze_with_curl(url, timeout_seconds)
-            ffmpeg_result = self._analyze_with_ffmpeg(url, timeout_seconds)
+            if header_only:
+                ffmpeg_result = {"success": False, "raw_output": None}
+            else:
+                ffmpeg_result = self._analyze_with_ffmpeg(url, timeout_seconds)
             
             # FR-003: Compare results, ffmpeg is authoritative
             final_result: StreamAnalysisDTO = self._resolve_analysis_results(curl_result, ffmpeg_result, is_secure)
@@ -154,13 +160,14 @@ class StreamAnalysisService:
             Dict with 'success', 'content_type', 'raw_output' keys
         """
         try:
-            result = subprocess.run(
-                ["curl", "-I", "--max-time", str(timeout_seconds), url],
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-                check=False
-            )
+            with observe_probe("curl"):
+                result = subprocess.run(
+                    ["curl", "-I", "--max-time", str(timeout_seconds), url],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout_seconds,
+                    check=False
+                )
             
             if result.returncode != 0:
                 return {"success": False, "content_type": None, "raw_output": result.stderr}
@@ -188,13 +195,14 @@ class StreamAnalysisService:
             Dict with 'success', 'format', 'codec', 'raw_output' keys
         """
         try:
-            result = subprocess.run(
-                ["ffmpeg", "-i", url, "-t", "1", "-f", "null", "-"],
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-                check=False
-            )
+            with observe_probe("ffmpeg"):
+                result = subprocess.run(
+                    ["ffmpeg", "-i", url, "-t", "1", "-f", "null", "-"],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout_seconds,
+                    check=False
+                )
             
             # ffmpeg writes info to stderr, not stdout
             output = result.stderr
@@ -6,9 +6,20 @@ import json
 import re
 import shutil
 import subprocess
-from typing import Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Optional
 
 from model.dto.stream_metadata import StreamMetadataDTO
+from service.metrics_service import observe_probe, record_cache
+
+# ffprobe processes run at once by batch lookups, across every request of this process
+PROBE_CONCURRENCY = 8
+
+# Shared by every batch lookup: queued probes wait for a free worker instead of spawning more processes
+probe_executor: Executor = ThreadPoolExecutor(max_workers=PROBE_CONCURRENCY, thread_name_prefix="ffprobe")
 
 
 class StreamMetadataService:
@@ -16,25 +27,111 @@ class StreamMetadataService:
 
     _METADATA_REGEX = re.compile(r"^\s*([^:]+):\s*(.+)$")
 
-    def __init__(self, ffprobe_path: Optional[str] = None):
+    def __init__(self, ffprobe_path: Optional[str] = None, cache_ttl_seconds: int = 30,
+                 executor: Optional[Executor] = None):
         self.ffprobe_path = ffprobe_path or shutil.which("ffprobe")
+        # url -> (expires_at, metadata); only successful probes are cached
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cache: dict[str, tuple[float, StreamMetadataDTO]] = {}
+        self._cache_lock = threading.Lock()
+        self.executor: Executor = executor if executor is not None else probe_executor
 
     @property
     def is_available(self) -> bool:
         return bool(self.ffprobe_path)
 
-    def get_metadata(self, url: str, timeout_seconds: int = 10) -> StreamMetadataDTO:
-        if not self.is_available:
+    def get_cached_metadata(self, url: str) -> Optional[StreamMetadataDTO]:
+        """Return the cached metadata for `url` if still fresh, without probing."""
+        with self._cache_lock:
+            entry = self._cache.get(url)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._cache[url]
+                entry = None
+        record_cache("stream_metadata", entry is not None)
+        return entry[1] if entry is not None else None
+
+    def prime_cache(self, url: str, metadata: StreamMetadataDTO) -> None:
+        """Store metadata obtained elsewhere (e.g. a server status page) for `url`."""
+        if metadata.available and self.cache_ttl_seconds > 0:
+            with self._cache_lock:
+                self._cache[url] = (time.monotonic() + self.cache_ttl_seconds, metadata)
+
+    def get_metadata(self, url: str, timeout_seconds: float = 10) -> StreamMetadataDTO:
+        cached = self.get_cached_metadata(url)
+        if cached is not None:
+            return cached
+
+        metadata = self._probe(url, timeout_seconds)
+        self.prime_cache(url, metadata)
+        return metadata
+
+    def get_metadata_many(self, urls: Iterable[str], timeout_seconds: float = 10,
+                          max_parallel: Optional[int] = None) -> dict[str, StreamMetadataDTO]:
+        """
+        Resolve metadata for many URLs in parallel under a single overall deadline.
+
+        Cached values are returned without probing; the remaining URLs are probed
+        on the shared executor, so the process never runs more than
+        `PROBE_CONCURRENCY` batch probes whatever the number of requests, and this
+        call never has more than `max_parallel` of them submitted at once. URLs
+        whose probe has not finished when `timeout_seconds` elapses are left out
+        of the result, so callers get partial results instead of waiting: probes
+        still queued are cancelled, and running ones time out at the deadline,
+        which kills and reaps their ffprobe process.
+        """
+        results: dict[str, StreamMetadataDTO] = {}
+        to_probe: list[str] = []
+        for url in dict.fromkeys(urls):
+            cached = self.get_cached_metadata(url)
+            if cached is not None:
+                results[url] = cached
+            else:
+                to_probe.append(url)
+        if not to_probe:
+            return results
+
+        deadline = time.monotonic() + timeout_seconds
+        parallel = max(1, max_parallel or len(to_probe))
+        queue = deque(to_probe)
+        running: dict[Future, str] = {}
+        while queue or running:
+            while queue and len(running) < parallel:
+                url = queue.popleft()
+                running[self.executor.submit(self._get_metadata_by, url, deadline)] = url
+            done = wait(running, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                url = running.pop(future)
+                try:
+                    results[url] = future.result()
+                except Exception as exc:
+                    results[url] = StreamMetadataDTO(available=False, error_message=str(exc))
+            if not done or time.monotonic() >= deadline:
+                break
+        for future in running:
+            future.cancel()
+        return results
+
+    def _get_metadata_by(self, url: str, deadline: float) -> StreamMetadataDTO:
+        # a probe gets whatever is left of the overall deadline when it starts
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return StreamMetadataDTO(available=False, error_message="ffprobe not started before the deadline")
+        return self.get_metadata(url, remaining)
+
+    def _probe(self, url: str, timeout_seconds: float) -> StreamMetadataDTO:
+        if not self.ffprobe_path:
             return StreamMetadataDTO(available=False, error_message="ffprobe executable not found")
 
         try:
-            result = subprocess.run(
-                [self.ffprobe_path, "-v", "quiet", "-print_format", "json", "-show_format", url],
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-                check=False
-            )
+            with observe_probe("ffprobe"):
+                # on timeout, run() kills the ffprobe process and waits for it
+                result = subprocess.run(
+                    [self.ffprobe_path, "-v", "quiet", "-print_format", "json", "-show_format", url],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout_seconds,
+                    check=False
+                )
         except subprocess.TimeoutExpired as exc:
             return StreamMetadataDTO(available=False, error_message=f"ffprobe timed out ({exc})")
         except Exception as exc:
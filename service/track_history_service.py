@@ -0,0 +1,205 @@
+"""
+TrackHistoryService - Now-playing history per radio source.
+
+Track changes are detected whenever live metadata is fetched for a source
+(listen page, metadata API). Each change is appended to an in-memory ring
+buffer per station and queued for persistence; the queue is written to the
+`track_history` table in batches instead of one insert per change.
+
+A batch is written once it is full, and otherwise by a background flush
+every `flush_interval_seconds` and at interpreter exit, so a quiet station
+does not keep its last tracks in memory until the next change.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import session_factory as default_session_factory
+from model.dto.stream_metadata import StreamMetadataDTO
+from model.dto.track_history import TrackHistoryDTO
+from model.entity.track_history import TrackHistory
+from model.repository.track_history_repository import TrackHistoryRepository
+
+logger = logging.getLogger(__name__)
+
+SaveBatch = Callable[[List[TrackHistoryDTO]], int]
+
+
+class TrackHistoryBuffer:
+    """Process-wide ring buffers of recent tracks plus the pending write batch."""
+
+    def __init__(self, ring_size: int = 50, batch_size: int = 20, flush_interval_seconds: float = 60.0,
+                 session_factory: Optional[Callable[[], Session]] = None):
+        self.ring_size = ring_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        # sessions of the background flush; without one, entries are only written by flush()
+        self._session_factory = session_factory
+        self._rings: Dict[int, Deque[TrackHistoryDTO]] = {}
+        self._pending: List[TrackHistoryDTO] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def last(self, radio_source_id: int) -> Optional[TrackHistoryDTO]:
+        with self._lock:
+            ring = self._rings.get(radio_source_id)
+            return ring[-1] if ring else None
+
+    def append(self, entry: TrackHistoryDTO) -> bool:
+        """Append `entry` unless it repeats the last known track. Returns True if appended."""
+        with self._lock:
+            ring = self._rings.setdefault(entry.radio_source_id, deque(maxlen=self.ring_size))
+            if ring and ring[-1].title == entry.title:
+                return False
+            ring.append(entry)
+            self._pending.append(entry)
+        self._start_flusher()
+        return True
+
+    def seed(self, entry: TrackHistoryDTO) -> None:
+        """Prime an empty ring with an already persisted entry (used for change detection)."""
+        with self._lock:
+            ring = self._rings.setdefault(entry.radio_source_id, deque(maxlen=self.ring_size))
+            if not ring:
+                ring.append(entry)
+
+    def recent(self, radio_source_id: int) -> List[TrackHistoryDTO]:
+        with self._lock:
+            return list(self._rings.get(radio_source_id, ()))
+
+    def pending(self, radio_source_id: int) -> List[TrackHistoryDTO]:
+        with self._lock:
+            return [e for e in self._pending if e.radio_source_id == radio_source_id]
+
+    def should_flush(self) -> bool:
+        with self._lock:
+            if not self._pending:
+                return False
+            return (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval_seconds)
+
+    def drain(self) -> List[TrackHistoryDTO]:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            return batch
+
+    def requeue(self, batch: List[TrackHistoryDTO]) -> None:
+        """Put back a batch whose write failed so the next flush retries it."""
+        with self._lock:
+            self._pending = batch + self._pending
+
+    def flush(self, save_batch: SaveBatch) -> int:
+        """Write every pending entry with `save_batch`. Returns the number of rows written."""
+        batch: List[TrackHistoryDTO] = self.drain()
+        if not batch:
+            return 0
+        try:
+            return save_batch(batch)
+        except SQLAlchemyError:
+            logger.exception("Failed to flush %d track history entries", len(batch))
+            self.requeue(batch)
+            return 0
+
+    def stop(self) -> None:
+        """Stop the background flush and write what is still pending (run at interpreter exit)."""
+        self._stopped.set()
+        self._flush_in_own_session()
+
+    def _start_flusher(self) -> None:
+        if self._session_factory is None or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name="track-history-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.stop)
+
+    def _run_flusher(self) -> None:
+        while not self._stopped.wait(self.flush_interval_seconds):
+            with self._lock:
+                pending = bool(self._pending)
+            if pending:
+                self._flush_in_own_session()
+
+    def _flush_in_own_session(self) -> None:
+        if self._session_factory is None:
+            return
+        session = self._session_factory()
+        try:
+            self.flush(lambda batch: TrackHistoryRepository(session).save_batch(to_entities(batch)))
+        finally:
+            session.close()
+
+
+def to_entities(batch: List[TrackHistoryDTO]) -> List[TrackHistory]:
+    return [TrackHistory(**entry.model_dump()) for entry in batch]
+
+
+# Shared by every TrackHistoryService built in this process
+track_history_buffer = TrackHistoryBuffer(session_factory=default_session_factory)
+
+
+class TrackHistoryService:
+    """Service recording and querying the now-playing history of radio sources."""
+
+    def __init__(self, track_history_repo: TrackHistoryRepository, buffer: Optional[TrackHistoryBuffer] = None):
+        self.track_history_repo: TrackHistoryRepository = track_history_repo
+        self.buffer: TrackHistoryBuffer = buffer if buffer is not None else track_history_buffer
+
+    def record(self, radio_source_id: int, metadata: Optional[StreamMetadataDTO]) -> bool:
+        """
+        Record the current track of a source if it changed since the last observation.
+
+        Returns:
+            True when a new history entry was appended
+        """
+        if metadata is None or not metadata.available or not metadata.current_track:
+            return False
+
+        if self.buffer.last(radio_source_id) is None:
+            last_saved: TrackHistory | None = self.track_history_repo.find_last_by_source(radio_source_id)
+            if last_saved is not None:
+                self.buffer.seed(TrackHistoryDTO.model_validate(last_saved))
+
+        appended = self.buffer.append(TrackHistoryDTO(
+            radio_source_id=radio_source_id,
+            title=metadata.current_track,
+            genre=metadata.genre,
+            bitrate=metadata.bitrate,
+            played_at=datetime.now(),
+        ))
+        if appended and self.buffer.should_flush():
+            self.flush()
+        return appended
+
+    def flush(self) -> int:
+        """Write every pending entry in one batch. Returns the number of rows written."""
+        return self.buffer.flush(lambda batch: self.track_history_repo.save_batch(to_entities(batch)))
+
+    def get_history(self, radio_source_id: int, since: Optional[datetime] = None, limit: int = 100) -> List[TrackHistoryDTO]:
+        """
+        Get the track changes of a source (persisted and still pending), oldest first.
+
+        Without `since` these are the latest `limit` changes; with it, the first
+        `limit` changes after `since`, so a client polling with the played_at of
+        the last entry it got never skips any.
+        """
+        if since is not None and since.tzinfo is not None:
+            since = since.astimezone().replace(tzinfo=None)
+
+        saved: List[TrackHistory] = self.track_history_repo.find_by_source(radio_source_id, since, limit)
+        history: List[TrackHistoryDTO] = [TrackHistoryDTO.model_validate(entry) for entry in saved]
+        history.extend(e for e in self.buffer.pending(radio_source_id) if since is None or e.played_at > since)
+        return history[-limit:] if since is None else history[:limit]
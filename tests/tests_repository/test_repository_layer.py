@@ -1,12 +1,16 @@
 import pytest
+from datetime import datetime, timedelta
 
 from model.repository.user_repository import UserRepository
 from model.repository.stream_type_repository import StreamTypeRepository
 from model.repository.radio_source_repository import RadioSourceRepository
 from model.repository.proposal_repository import ProposalRepository
 from model.repository.stream_analysis_repository import StreamAnalysisRepository
+from model.repository.catalog_version_repository import CatalogVersionRepository
+from model.repository.catalog_change_repository import CatalogChangeRepository
 
 from model.entity.radio_source import RadioSource
+from model.entity.track_history import TrackHistory
 from model.entity.proposal import Proposal
 from model.entity.stream_analysis import StreamAnalysis
 
@@ -65,6 +69,21 @@ def test_radio_source_repository_crud_and_eager(test_db):
     assert fetched.stream_type is not None and fetched.stream_type.id == st.id
     assert fetched.user is not None and fetched.user.id == user.id
 
+    by_ids = radio_repo.find_by_ids([saved.id, 999999])
+    assert [r.id for r in by_ids] == [saved.id]
+    assert radio_repo.find_by_ids([]) == []
+
+    # dead-air flags: never-checked sources come first, updated_at is not touched
+    assert any(r.id == saved.id for r in radio_repo.find_for_audio_check(limit=1000))
+    updated_at = saved.updated_at
+    checked_at = datetime(2026, 1, 1, 12, 0, 0)
+    radio_repo.save_dead_air_flags({saved.id: True}, checked_at)
+    test_db.refresh(saved)
+    assert saved.dead_air is True
+    assert saved.audio_checked_at == checked_at
+    assert saved.updated_at == updated_at
+    assert all(r.id != saved.id for r in radio_repo.find_for_audio_check(limit=1000, checked_before=checked_at))
+
 
 def test_proposal_repository_eager_load(test_db):
     user_repo = UserRepository(test_db)
@@ -103,3 +122,212 @@ def test_stream_analysis_repository_crud(test_db):
 
     by_user = analysis_repo.get_analyses_by_user(user.id)
     assert any(a.id == saved.id for a in by_user)
+
+
+def test_radio_source_repository_find_page_filters_and_keyset(test_db):
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    st = st_repo.create_if_not_exists('HTTP', 'MP3', 'Icecast', 'HTTP MP3 Icecast')
+
+    names = ['Paging Delta', 'Paging Alpha', 'Paging Echo', 'Paging Charlie', 'Paging Bravo']
+    for i, name in enumerate(names):
+        test_db.add(RadioSource(stream_url=f'http://paging.example/{i}', name=name, stream_type_id=st.id,
+                                is_secure=False, country='IT' if i % 2 == 0 else 'FR'))
+    test_db.flush()
+
+    # keyset pagination walks the whole filtered set in order without overlap
+    seen = []
+    cursor = None
+    while True:
+        items, total, cursor = radio_repo.find_page(q='Paging', limit=2, cursor=cursor)
+        assert total == 5
+        seen.extend(r.name for r in items)
+        if cursor is None:
+            break
+    assert seen == sorted(names)
+
+    items, total, _ = radio_repo.find_page(q='paging', country='IT', sort='-name', limit=10)
+    assert total == 3
+    assert [r.name for r in items] == ['Paging Echo', 'Paging Delta', 'Paging Bravo']
+    assert all(r.stream_type is not None for r in items)
+
+    items, _, next_cursor = radio_repo.find_page(q='Paging', limit=2, offset=4)
+    assert [r.name for r in items] == ['Paging Echo']
+    assert next_cursor is None
+
+    with pytest.raises(ValueError):
+        radio_repo.find_page(sort='description')
+    with pytest.raises(ValueError):
+        radio_repo.find_page(cursor='not-a-cursor')
+
+
+def test_radio_source_repository_find_page_fields_selects_only_requested(test_db):
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    st = st_repo.create_if_not_exists('HTTP', 'AAC', 'Icecast', 'HTTP AAC Icecast')
+    for i, name in enumerate(['Sparse Bravo', 'Sparse Alpha', 'Sparse Charlie']):
+        test_db.add(RadioSource(stream_url=f'http://sparse.example/{i}', name=name, stream_type_id=st.id,
+                                is_secure=False))
+    test_db.flush()
+
+    fields = ['name', 'stream_type.display_name']
+    seen = []
+    cursor = None
+    while True:
+        rows, total, cursor = radio_repo.find_page_fields(fields, q='Sparse', limit=2, cursor=cursor)
+        assert total == 3
+        assert all(set(row) == set(fields) for row in rows)
+        seen.extend(rows)
+        if cursor is None:
+            break
+    assert [row['name'] for row in seen] == ['Sparse Alpha', 'Sparse Bravo', 'Sparse Charlie']
+    assert all(row['stream_type.display_name'] == 'HTTP AAC Icecast' for row in seen)
+
+    with pytest.raises(ValueError):
+        radio_repo.find_page_fields(['user_id'])
+
+
+def test_radio_source_repository_iter_all_by_name_streams_in_batches(test_db):
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    st = st_repo.create_if_not_exists('HTTP', 'OGG', 'Icecast', 'HTTP OGG Icecast')
+    for i, name in enumerate(['Stream Gamma', 'Stream Alpha', 'Stream Beta']):
+        test_db.add(RadioSource(stream_url=f'http://stream.example/{i}', name=name, stream_type_id=st.id,
+                                is_secure=False))
+    test_db.flush()
+
+    streamed = [s for s in radio_repo.iter_all_by_name(batch_size=2) if s.name.startswith('Stream ')]
+    assert [s.name for s in streamed] == ['Stream Alpha', 'Stream Beta', 'Stream Gamma']
+    assert all(s.stream_type.display_name == 'HTTP OGG Icecast' for s in streamed)
+    assert [s.id for s in radio_repo.iter_all_by_name()] == [s.id for s in radio_repo.find_all_by_name()]
+
+
+def test_radio_source_repository_count_facets(test_db):
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    mp3 = st_repo.create_if_not_exists('HTTP', 'MP3', 'Icecast', 'HTTP MP3 Icecast')
+    aac = st_repo.create_if_not_exists('HTTPS', 'AAC', 'Icecast', 'HTTPS AAC Icecast')
+    sources = [
+        RadioSource(stream_url='http://facet.example/1', name='Facet One', stream_type_id=mp3.id, is_secure=False, country='IT'),
+        RadioSource(stream_url='http://facet.example/2', name='Facet Two', stream_type_id=mp3.id, is_secure=False, country='IT'),
+        RadioSource(stream_url='https://facet.example/3', name='Facet Three', stream_type_id=aac.id, is_secure=True, country='CH'),
+    ]
+    test_db.add_all(sources)
+    test_db.flush()
+    # the latest known bitrate counts
+    test_db.add(TrackHistory(radio_source_id=sources[0].id, title='Old', bitrate=64000, played_at=datetime(2020, 1, 1)))
+    test_db.add(TrackHistory(radio_source_id=sources[0].id, title='New', bitrate=128000, played_at=datetime(2020, 1, 2)))
+    test_db.add(TrackHistory(radio_source_id=sources[2].id, title='Hi', bitrate=320000, played_at=datetime(2020, 1, 2)))
+    test_db.flush()
+
+    facets = radio_repo.count_facets(q='Facet')
+    assert facets['stream_type'] == [(mp3.id, 'HTTP MP3 Icecast', 2), (aac.id, 'HTTPS AAC Icecast', 1)]
+    assert facets['country'] == [('IT', None, 2), ('CH', None, 1)]
+    assert facets['is_secure'] == [(False, None, 2), (True, None, 1)]
+    assert facets['codec'] == [('MP3', None, 2), ('AAC', None, 1)]
+    assert sorted(facets['bitrate']) == [('128-191', None, 1), ('192+', None, 1)]
+
+    facets = radio_repo.count_facets(q='Facet', country='CH')
+    assert facets['codec'] == [('AAC', None, 1)]
+
+
+def test_catalog_version_bumped_by_radio_source_writes(test_db):
+    user_repo = UserRepository(test_db)
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    version_repo = CatalogVersionRepository(test_db)
+
+    user = user_repo.create('version@example.com', 'h', role='user')
+    st = st_repo.create_if_not_exists('HTTP', 'MP3', 'Icecast', 'HTTP MP3 Icecast')
+    start = version_repo.get_version()
+
+    radio = radio_repo.save(RadioSource(stream_url='http://version.example/stream', name='Versioned', stream_type_id=st.id, is_secure=False, created_by=user.id))
+    assert version_repo.get_version() == start + 1
+
+    radio.name = 'Versioned 2'
+    radio_repo.save(radio)
+    assert version_repo.get_version() == start + 2
+
+    assert radio_repo.delete(radio.id)
+    assert version_repo.get_version() == start + 3
+
+    # health checks are not catalog edits
+    radio_repo.save_dead_air_flags({}, datetime.now())
+    assert version_repo.get_version() == start + 3
+
+
+def test_catalog_version_bumped_by_stream_type_writes(test_db):
+    st_repo = StreamTypeRepository(test_db)
+    radio_repo = RadioSourceRepository(test_db)
+    version_repo = CatalogVersionRepository(test_db)
+    change_repo = CatalogChangeRepository(test_db)
+
+    start = version_repo.get_version()
+    st = st_repo.create_if_not_exists('HTTP', 'OGG', 'None', 'HTTP OGG')
+    assert version_repo.get_version() == start + 1
+    # existing types are not written again
+    st_repo.create_if_not_exists('HTTP', 'OGG', 'None', 'HTTP OGG')
+    assert version_repo.get_version() == start + 1
+
+    first = radio_repo.save(RadioSource(stream_url='http://types.example/1', name='Typed 1', stream_type_id=st.id, is_secure=False))
+    second = radio_repo.save(RadioSource(stream_url='http://types.example/2', name='Typed 2', stream_type_id=st.id, is_secure=False))
+    before_edit = version_repo.get_version()
+
+    st.display_name = 'HTTP Ogg Vorbis'
+    st_repo.save(st)
+
+    # the sources embedding the type are re-sent to syncing clients
+    assert version_repo.get_version() == before_edit + 2
+    assert [c.radio_source_id for c in change_repo.find_since(before_edit, 100)] == [first.id, second.id]
+
+
+def test_catalog_changes_logged_and_compacted(test_db):
+    st = StreamTypeRepository(test_db).create_if_not_exists('HTTP', 'MP3', 'Icecast', 'HTTP MP3 Icecast')
+    radio_repo = RadioSourceRepository(test_db)
+    version_repo = CatalogVersionRepository(test_db)
+    change_repo = CatalogChangeRepository(test_db)
+    start = version_repo.get_version()
+
+    kept = radio_repo.save(RadioSource(stream_url='http://changes.example/kept', name='Kept', stream_type_id=st.id, is_secure=False))
+    kept.name = 'Kept 2'
+    radio_repo.save(kept)
+    gone = radio_repo.save(RadioSource(stream_url='http://changes.example/gone', name='Gone', stream_type_id=st.id, is_secure=False))
+    assert radio_repo.delete(gone.id)
+
+    # one entry per source, its latest, in version order
+    changes = [(c.radio_source_id, c.op, c.version) for c in change_repo.find_since(start, 100)]
+    assert changes == [(kept.id, 'upsert', start + 2), (gone.id, 'delete', start + 4)]
+    assert [c.radio_source_id for c in change_repo.find_since(start + 2, 100)] == [gone.id]
+
+    # superseded entries and expired tombstones go; syncs older than the tombstone must reset
+    assert change_repo.compact(tombstones_before=datetime.now() + timedelta(seconds=1)) >= 2
+    test_db.commit()
+    assert [(c.radio_source_id, c.op) for c in change_repo.find_since(start, 100)] == [(kept.id, 'upsert')]
+    assert version_repo.get_compacted_version() >= start + 4
+
+
+def test_radio_source_repository_full_text_search(test_db):
+    user = UserRepository(test_db).create('fts@example.com', 'h', role='user')
+    st = StreamTypeRepository(test_db).create_if_not_exists('HTTP', 'MP3', 'Icecast', 'HTTP MP3 Icecast')
+    radio_repo = RadioSourceRepository(test_db)
+
+    jazz = radio_repo.save(RadioSource(stream_url='http://fts.example/jazz', name='Zürich Jazz Lounge', stream_type_id=st.id, is_secure=False, country='CH', description='Smooth jazz all day', created_by=user.id))
+    talk = radio_repo.save(RadioSource(stream_url='http://fts.example/talk', name='Talk Radio', stream_type_id=st.id, is_secure=False, country='CH', description='News and some jazz at night', created_by=user.id))
+
+    # name matches rank above description matches; diacritics and prefixes are folded
+    assert [r.id for r in radio_repo.search('jazz') if r.id in (jazz.id, talk.id)] == [jazz.id, talk.id]
+    assert [r.id for r in radio_repo.search('zurich lou')] == [jazz.id]
+    assert radio_repo.count_search('jazz') >= 2
+    assert radio_repo.search('"') == [] and radio_repo.count_search('') == 0
+
+    # triggers keep the index in sync with updates, deletes and the latest genre
+    talk.name = 'Evening Talk'
+    radio_repo.save(talk)
+    assert [r.id for r in radio_repo.search('evening')] == [talk.id]
+
+    test_db.add(TrackHistory(radio_source_id=jazz.id, title='Song', genre='Chillhop', played_at=datetime.now()))
+    test_db.flush()
+    assert [r.id for r in radio_repo.search('chillhop')] == [jazz.id]
+
+    radio_repo.delete(talk.id)
+    assert radio_repo.search('evening') == []
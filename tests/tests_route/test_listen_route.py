@@ -0,0 +1,86 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from model.dto.stream_metadata import StreamMetadataDTO
+from model.entity.radio_source import RadioSource
+from route.listen_route import listen_bp
+from service.admission_control_service import AdmissionController
+
+
+def _register_blueprints(app):
+    app.template_folder = str(Path(__file__).parents[2] / 'templates')
+    if listen_bp.name not in app.blueprints:
+        app.register_blueprint(listen_bp)
+
+
+def _add_source(test_db) -> RadioSource:
+    source = RadioSource(stream_url='http://listen.example/stream', name='Listen FM', stream_type_id=1, is_secure=False)
+    test_db.add(source)
+    test_db.flush()
+    return source
+
+
+def test_player_renders_without_probing(test_app, test_db):
+    _register_blueprints(test_app)
+    source = _add_source(test_db)
+
+    with patch('route.listen_route.metadata_service') as mock_service:
+        mock_service.get_cached_metadata.return_value = None
+        client = test_app.test_client()
+        resp = client.get(f'/listen/{source.id}')
+
+    assert resp.status_code == 200
+    assert b'Listen FM' in resp.data
+    assert f'/listen/{source.id}/metadata'.encode() in resp.data
+    mock_service.get_metadata.assert_not_called()
+
+
+def test_metadata_endpoint_returns_json(test_app, test_db):
+    _register_blueprints(test_app)
+    source = _add_source(test_db)
+
+    with patch('route.listen_route.metadata_service') as mock_service:
+        mock_service.is_available = True
+        mock_service.get_metadata.return_value = StreamMetadataDTO(available=True, bitrate=128000, current_track='Song')
+        client = test_app.test_client()
+        resp = client.get(f'/listen/{source.id}/metadata')
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['available'] is True
+    assert data['current_track'] == 'Song'
+    mock_service.get_metadata.assert_called_once_with('http://listen.example/stream')
+
+
+def test_metadata_endpoint_not_found(test_app, test_db):
+    _register_blueprints(test_app)
+    client = test_app.test_client()
+    resp = client.get('/listen/999999/metadata')
+    assert resp.status_code == 404
+
+
+def test_metadata_endpoint_sheds_load(test_app, test_db):
+    _register_blueprints(test_app)
+    source = _add_source(test_db)
+    controller = AdmissionController(burst=10, max_in_flight=2, brownout_ratio=0.5)
+    busy = controller.try_acquire('other-client')
+
+    with patch('route.listen_route.metadata_service') as mock_service, \
+            patch('route.listen_route.probe_admission', controller):
+        mock_service.is_available = True
+        mock_service.get_cached_metadata.return_value = None
+        client = test_app.test_client()
+
+        # brownout: answered from the cache, no ffprobe
+        resp = client.get(f'/listen/{source.id}/metadata')
+        assert resp.status_code == 200
+        assert resp.get_json()['available'] is False
+        mock_service.get_metadata.assert_not_called()
+
+        # saturated: fast 503 with Retry-After
+        held = controller.try_acquire('third-client')
+        resp = client.get(f'/listen/{source.id}/metadata')
+        assert resp.status_code == 503
+        assert resp.headers['Retry-After']
+    held.release()
+    busy.release()
@@ -0,0 +1,76 @@
+"""
+Unit tests for AdmissionController (token buckets, in-flight cap, brownout).
+"""
+from service.admission_control_service import AdmissionController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_client_over_its_rate_gets_429_with_retry_after():
+    clock = FakeClock()
+    controller = AdmissionController(rate_per_client=0.5, burst=2, max_in_flight=10, clock=clock)
+
+    for _ in range(2):
+        controller.try_acquire("10.0.0.1").release()
+    rejected = controller.try_acquire("10.0.0.1")
+    assert not rejected.admitted
+    assert rejected.status_code == 429
+    assert rejected.headers == {"Retry-After": "2"}
+
+    # other clients have their own bucket, and tokens come back with time
+    assert controller.try_acquire("10.0.0.2").admitted
+    clock.now += 2
+    assert controller.try_acquire("10.0.0.1").admitted
+
+
+def test_in_flight_cap_gets_503_and_brownout_before_it():
+    controller = AdmissionController(burst=10, max_in_flight=4, brownout_ratio=0.5, clock=FakeClock())
+
+    running = [controller.try_acquire(f"client-{i}") for i in range(4)]
+    assert [admission.brownout for admission in running] == [False, False, True, True]
+
+    rejected = controller.try_acquire("client-x")
+    assert (rejected.admitted, rejected.status_code) == (False, 503)
+    assert "Retry-After" in rejected.headers
+
+    with running[0]:
+        pass
+    assert controller.in_flight == 3
+    assert controller.try_acquire("client-x").admitted
+
+
+def test_batch_holds_one_slot_per_probe_up_to_the_free_slots():
+    controller = AdmissionController(burst=10, max_in_flight=4, max_client_slots=4, clock=FakeClock())
+
+    single = controller.try_acquire("client-a")
+    batch = controller.try_acquire("client-b", cost=6, probes=6)
+    assert (single.slots, batch.slots, controller.in_flight) == (1, 3, 4)
+    assert controller.try_acquire("client-c").status_code == 503
+
+    batch.release()
+    assert controller.in_flight == 1
+
+
+def test_one_client_holds_at_most_half_the_slots():
+    clock = FakeClock()
+    controller = AdmissionController(rate_per_client=0.5, burst=5, max_in_flight=8, clock=clock)
+
+    # batches of 8 ids every 10 s: tokens refill, slots are still held by the running probes
+    first = controller.try_acquire("10.0.0.1", cost=8, probes=8)
+    clock.now += 10
+    second = controller.try_acquire("10.0.0.1", cost=8, probes=8)
+    assert (first.slots, controller.in_flight) == (4, 4)
+    assert (second.admitted, second.status_code) == (False, 429)
+
+    # everyone else still gets in
+    assert [controller.try_acquire(f"10.0.1.{i}").admitted for i in range(4)] == [True] * 4
+
+    first.release()
+    clock.now += 10
+    assert controller.try_acquire("10.0.0.1", cost=8, probes=8).slots == 4
@@ -0,0 +1,94 @@
+"""
+Unit tests for the metrics registry, Prometheus rendering and the cross-worker file store.
+"""
+import json
+import os
+import subprocess
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from service.metrics_service import (
+    HTTP_DB_QUERIES, PROBE_SPAWNS, PROBE_TIMEOUTS, MetricsRegistry, MetricsStore, observe_probe,
+    render_prometheus, request_finished, request_started,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value, route="/a")
+
+    lines = render_prometheus(registry.snapshot()).splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 2.55' in lines
+
+
+def test_store_sums_workers_and_drops_gauges_of_dead_workers(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc(2)
+    registry.gauge("busy", "Busy").set(1)
+    store = MetricsStore(registry, directory=str(tmp_path), app_name="web")
+
+    other = MetricsRegistry()
+    other.counter("hits_total", "Hits").inc(3)
+    other.gauge("busy", "Busy").set(5)
+    # pid 0x7fffffff is not running: its counters still count, its gauges do not
+    (tmp_path / "web-2147483647.json").write_text(json.dumps(other.snapshot()))
+    (tmp_path / "api-2147483647.json").write_text(json.dumps(other.snapshot()))
+
+    lines = store.render().splitlines()
+
+    assert "hits_total 5" in lines
+    assert "busy 1" in lines
+    # the dead worker's file is folded into the exited total, only for its own app
+    assert not (tmp_path / "web-2147483647.json").exists()
+    assert (tmp_path / "api-2147483647.json").exists()
+    assert "hits_total 5" in store.render().splitlines()
+
+
+def test_reused_pid_keeps_the_previous_workers_counters(tmp_path):
+    previous = MetricsRegistry()
+    previous.counter("hits_total", "Hits").inc(3)
+    previous.gauge("busy", "Busy").set(5)
+    (tmp_path / f"web-{os.getpid()}.json").write_text(json.dumps(previous.snapshot()))
+
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc(2)
+    store = MetricsStore(registry, directory=str(tmp_path), app_name="web")
+
+    lines = store.render().splitlines()
+
+    assert "hits_total 5" in lines
+    assert not any(line.startswith("busy ") for line in lines)
+
+
+def test_observe_probe_counts_spawns_and_timeouts():
+    spawns = PROBE_SPAWNS.samples.get(("test_tool",), 0)
+    with pytest.raises(subprocess.TimeoutExpired):
+        with observe_probe("test_tool"):
+            raise subprocess.TimeoutExpired("test_tool", 1)
+    with observe_probe("test_tool"):
+        pass
+
+    assert PROBE_SPAWNS.samples[("test_tool",)] == spawns + 2
+    assert PROBE_TIMEOUTS.samples[("test_tool",)] == 1
+
+
+def test_request_scope_counts_its_sql_statements():
+    engine = create_engine("sqlite://")
+    scope = request_started()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    request_finished(scope, "GET", "/metrics-test", 200)
+
+    assert scope.db[0] == 2
+    counts, total, count = HTTP_DB_QUERIES.samples[("/metrics-test",)]
+    assert (total, count) == (2, 1)
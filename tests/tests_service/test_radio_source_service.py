@@ -5,6 +5,7 @@ Moved from `tests/unit` into `tests/service` during test reorganization.
 """
 import pytest
 from unittest.mock import Mock
+from sqlalchemy import event
 from datetime import datetime
 
 from model.dto.radio_source import RadioSourceDTO
@@ -221,3 +222,40 @@ class TestRadioSourceService:
         assert all(isinstance(dto, RadioSourceDTO) for dto in result)
         assert result[0].name == "Radio 1"
         assert result[1].name == "Radio 2"
+
+    def test_get_all_radio_sources_query_count(self, test_db, test_user: User) -> None:
+        """DTO assembly reuses the loaded relationships: query count does not grow with the catalog."""
+        # Arrange
+        for i in range(25):
+            test_db.add(RadioSource(stream_url=f"http://example.com/n1-{i}", name=f"Radio {i}",
+                                    stream_type_id=(i % 3) + 1, is_secure=False, created_by=test_user.id))
+        test_db.flush()
+        test_db.expire_all()
+
+        auth_service = Mock(spec=AuthService)
+        stream_type_service = Mock(spec=StreamTypeService)
+        service = RadioSourceService(Mock(spec=ProposalRepository), RadioSourceRepository(test_db),
+                                     Mock(spec=ProposalValidationService), auth_service, stream_type_service)
+
+        statements: list[str] = []
+        engine = test_db.get_bind()
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # Act
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            result = service.get_all_radio_sources()
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+        # Assert: one SELECT for the sources plus one selectin load per relationship
+        created = [dto for dto in result if dto.stream_url.startswith("http://example.com/n1-")]
+        assert len(created) == 25
+        assert all(isinstance(dto, RadioSourceDTO) for dto in result)
+        assert all(dto.user.id == test_user.id for dto in created)
+        assert {dto.stream_type.id for dto in created} == {1, 2, 3}
+        assert len(statements) <= 3
+        auth_service.get_user_by_id.assert_not_called()
+        stream_type_service.get_stream_type.assert_not_called()
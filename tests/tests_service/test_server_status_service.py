@@ -0,0 +1,92 @@
+"""
+Unit tests for ServerStatusService (Icecast/Shoutcast status harvesting).
+"""
+import json
+
+from service.server_status_service import ServerStatusService
+
+
+ICECAST_STATUS = json.dumps({
+    "icestats": {
+        "source": [
+            {"listenurl": "http://ice.example:8000/rock.mp3", "server_type": "audio/mpeg", "bitrate": 128,
+             "genre": "Rock", "title": "Song A", "artist": "Band", "listeners": 42},
+            {"listenurl": "http://ice.example:8000/jazz.aac", "server_type": "audio/aac", "audio_bitrate": 64000,
+             "genre": "Jazz", "title": "Song B", "listeners": 7},
+        ]
+    }
+})
+
+SHOUTCAST_STATUS = json.dumps({
+    "streams": [
+        {"id": 1, "streampath": "/stream", "content": "audio/mpeg", "bitrate": "192",
+         "servergenre": "Pop", "songtitle": "Song C", "currentlisteners": 3},
+    ]
+})
+
+
+def _fake_fetch(calls):
+    def fetch(url, timeout):
+        calls.append(url)
+        if url == "http://ice.example:8000/status-json.xsl":
+            return ICECAST_STATUS
+        if url == "http://sc.example:8040/statistics?json=1":
+            return SHOUTCAST_STATUS
+        return None
+    return fetch
+
+
+def test_harvest_fetches_each_server_once_and_maps_mounts():
+    calls = []
+    service = ServerStatusService(fetch=_fake_fetch(calls))
+
+    results = service.harvest([
+        (1, "http://ice.example:8000/rock.mp3", "Icecast"),
+        (2, "http://ice.example:8000/jazz.aac", "Icecast"),
+        (3, "http://ice.example:8000/unknown", "Icecast"),
+        (4, "http://sc.example:8040/;", "Shoutcast"),
+        (5, "http://plain.example/stream", "None"),
+    ])
+
+    assert sorted(calls) == ["http://ice.example:8000/status-json.xsl", "http://sc.example:8040/statistics?json=1"]
+    assert set(results) == {1, 2, 4}
+
+    assert results[1].format == "MP3"
+    assert results[1].bitrate == 128000
+    assert results[1].genre == "Rock"
+    assert results[1].current_track == "Band - Song A"
+    assert results[1].listeners == 42
+
+    assert results[2].format == "AAC"
+    assert results[2].bitrate == 64000
+
+    # Shoutcast serves its default stream (id 1) at /;
+    assert results[4].current_track == "Song C"
+    assert results[4].bitrate == 192000
+    assert results[4].listeners == 3
+
+
+def test_harvest_tolerates_unreachable_or_invalid_servers():
+    def fetch(url, timeout):
+        if "down.example" in url:
+            raise OSError("connection refused")
+        return "<html>not json</html>"
+
+    service = ServerStatusService(fetch=fetch)
+    results = service.harvest([
+        (1, "http://down.example:8000/live", "Icecast"),
+        (2, "http://broken.example:8000/live", "Shoutcast"),
+    ])
+    assert results == {}
+
+
+def test_harvest_leaves_unlisted_mounts_to_ffprobe():
+    single_mount = json.dumps({"icestats": {"source": {"listenurl": "http://one.example:8000/live", "title": "Song D"}}})
+    service = ServerStatusService(fetch=lambda url, timeout: single_mount)
+
+    results = service.harvest([
+        (1, "http://one.example:8000/live", "Icecast"),
+        (2, "http://one.example:8000/other", "Icecast"),
+    ])
+
+    assert set(results) == {1}
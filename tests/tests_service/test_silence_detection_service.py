@@ -0,0 +1,110 @@
+"""
+Unit tests for SilenceDetectionService (dead-air detection).
+"""
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from model.dto.audio_level import AudioLevelDTO
+from model.entity.radio_source import RadioSource
+from model.repository.radio_source_repository import RadioSourceRepository
+from service.silence_detection_service import SilenceDetectionService
+
+RATE = 8000
+
+
+def _pcm(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def _service(**kwargs) -> SilenceDetectionService:
+    return SilenceDetectionService(Mock(spec=RadioSourceRepository), ffmpeg_path="/usr/bin/ffmpeg", sample_rate=RATE, **kwargs)
+
+
+def test_analyze_pcm_flags_silence_as_dead_air():
+    rng = np.random.default_rng(1)
+    hiss = rng.normal(0, 0.0005, RATE * 8)  # far below -50 dBFS
+
+    level = _service().analyze_pcm(_pcm(hiss))
+
+    assert level.available is True
+    assert level.silence_ratio == 1.0
+    assert level.dead_air is True
+    assert level.rms_db < -50
+
+
+def test_analyze_pcm_keeps_programme_audio():
+    rng = np.random.default_rng(2)
+    t = np.arange(RATE * 8) / RATE
+    # tone with a random, non-repeating loudness envelope (speech/music-like)
+    envelope = np.repeat(rng.uniform(0.1, 0.8, 80), RATE // 10)
+    audio = envelope * np.sin(2 * np.pi * 440 * t) + rng.normal(0, 0.01, t.size)
+
+    level = _service().analyze_pcm(_pcm(audio))
+
+    assert level.available is True
+    assert level.silence_ratio < 0.1
+    assert level.is_looping is False
+    assert level.dead_air is False
+    assert level.peak_db > -3
+
+
+def test_analyze_pcm_detects_looping_jingle():
+    rng = np.random.default_rng(3)
+    t = np.arange(int(RATE * 1.5)) / RATE
+    clip_envelope = np.repeat(rng.uniform(0.1, 0.8, 15), RATE // 10)
+    jingle = clip_envelope * np.sin(2 * np.pi * 660 * t)
+    audio = np.tile(jingle, 6)[: RATE * 8]
+
+    level = _service().analyze_pcm(_pcm(audio))
+
+    assert level.is_looping is True
+    assert level.dead_air is True
+
+
+def test_analyze_pcm_without_enough_audio():
+    level = _service().analyze_pcm(b"\x00\x00" * 10)
+    assert level.available is False
+
+
+def test_decode_pcm_without_ffmpeg_raises():
+    with patch("service.silence_detection_service.shutil.which", return_value=None):
+        service = SilenceDetectionService(Mock(spec=RadioSourceRepository))
+
+    with pytest.raises(RuntimeError, match="ffmpeg"):
+        service.decode_pcm("http://example.com/stream")
+
+
+def test_run_persists_flags_for_decoded_sources_only():
+    service = _service(max_workers=2)
+    sources = [
+        RadioSource(id=1, stream_url="http://silent/stream", name="Silent", stream_type_id=1),
+        RadioSource(id=2, stream_url="http://live/stream", name="Live", stream_type_id=1),
+        RadioSource(id=3, stream_url="http://down/stream", name="Down", stream_type_id=1),
+    ]
+    service.radio_source_repo.find_for_audio_check.return_value = sources
+    levels = {
+        "http://silent/stream": AudioLevelDTO(available=True, silence_ratio=1.0, dead_air=True),
+        "http://live/stream": AudioLevelDTO(available=True, silence_ratio=0.0, dead_air=False),
+        "http://down/stream": AudioLevelDTO(available=False, error_message="connection refused"),
+    }
+
+    with patch.object(service, "check_stream", side_effect=lambda url: levels[url]):
+        results = service.run(batch_size=10)
+
+    assert set(results) == {1, 2, 3}
+    flags = service.radio_source_repo.save_dead_air_flags.call_args.args[0]
+    assert flags == {1: True, 2: False}
+
+
+def test_check_sources_stops_submitting_when_cpu_budget_is_spent():
+    service = _service(max_workers=1, cpu_budget_seconds=1.0)
+    sources = [RadioSource(id=i, stream_url=f"http://s{i}/stream", name=f"S{i}", stream_type_id=1) for i in range(1, 4)]
+    cpu = iter([0.0, 0.0, 0.5, 1.5, 1.5, 1.5])
+
+    with patch.object(service, "check_stream", return_value=AudioLevelDTO(available=True, dead_air=False)), \
+         patch.object(SilenceDetectionService, "_children_cpu_seconds", side_effect=lambda: next(cpu)):
+        results = service.check_sources(sources)
+
+    assert set(results) == {1, 2}
@@ -116,6 +116,20 @@ class TestStreamAnalysisService:
             assert not result.is_secure
             assert result.is_valid
 
+    def test_header_only_analysis_skips_ffmpeg(self, analysis_service: StreamAnalysisService) -> None:
+        with patch.object(analysis_service, '_analyze_with_curl') as mock_curl, \
+             patch.object(analysis_service, '_analyze_with_ffmpeg') as mock_ffmpeg:
+            mock_curl.return_value = {
+                "success": True,
+                "content_type": "audio/mpeg",
+                "raw_output": "HTTP/1.1 200 OK\\nContent-Type: audio/mpeg",
+            }
+
+            result: StreamAnalysisDTO = analysis_service.analyze_stream("http://stream.example.com:8000/", header_only=True)
+
+            mock_ffmpeg.assert_not_called()
+            assert result.detection_method == DetectionMethod.HEADER
+
     @patch('subprocess.run')
     def test_ffmpeg_authoritative_over_curl(self, mock_run: Mock, analysis_service: StreamAnalysisService) -> None:
         curl_responses: list[Mock] = [
@@ -35,3 +35,111 @@ def test_get_metadata_text_fallback(mock_run, mock_which):
     assert metadata.available is True
     assert metadata.genre == "Rock"
     assert metadata.current_track == "Fallback Tune"
+
+
+@patch("service.stream_metadata_service.shutil.which", return_value="/usr/bin/ffprobe")
+@patch("service.stream_metadata_service.subprocess.run")
+def test_get_metadata_reuses_cached_value(mock_run, mock_which):
+    mock_run.return_value = MagicMock(
+        returncode=0,
+        stdout='{"format":{"bit_rate":"64000","tags":{"StreamTitle":"Cached Song"}}}',
+        stderr=""
+    )
+    service = StreamMetadataService()
+    assert service.get_cached_metadata("http://example.com/stream") is None
+
+    first = service.get_metadata("http://example.com/stream")
+    second = service.get_metadata("http://example.com/stream")
+
+    assert mock_run.call_count == 1
+    assert second == first
+    assert service.get_cached_metadata("http://example.com/stream").current_track == "Cached Song"
+
+
+@patch("service.stream_metadata_service.shutil.which", return_value="/usr/bin/ffprobe")
+@patch("service.stream_metadata_service.subprocess.run")
+def test_get_metadata_does_not_cache_failures(mock_run, mock_which):
+    mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="boom")
+    service = StreamMetadataService()
+
+    service.get_metadata("http://example.com/stream")
+    service.get_metadata("http://example.com/stream")
+
+    assert mock_run.call_count == 2
+    assert service.get_cached_metadata("http://example.com/stream") is None
+
+
+@patch("service.stream_metadata_service.shutil.which", return_value="/usr/bin/ffprobe")
+def test_get_metadata_many_returns_partial_results_by_deadline(mock_which):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = StreamMetadataService(executor=ThreadPoolExecutor(max_workers=2))
+    service._cache["http://cached/stream"] = (time.monotonic() + 60, StreamMetadataDTO(available=True, current_track="Cached"))
+    release = threading.Event()
+    timeouts = []
+
+    def fake_probe(url, timeout_seconds):
+        timeouts.append(timeout_seconds)
+        if url == "http://slow/stream":
+            release.wait(5)
+        return StreamMetadataDTO(available=True, current_track=url)
+
+    with patch.object(service, "_probe", side_effect=fake_probe) as mock_probe:
+        try:
+            results = service.get_metadata_many(
+                ["http://cached/stream", "http://fast/stream", "http://slow/stream", "http://fast/stream"],
+                timeout_seconds=0.05,
+            )
+        finally:
+            release.set()
+        service.executor.shutdown(wait=True)
+
+    assert results["http://cached/stream"].current_track == "Cached"
+    assert results["http://fast/stream"].current_track == "http://fast/stream"
+    assert "http://slow/stream" not in results
+    probed = sorted(call.args[0] for call in mock_probe.call_args_list)
+    assert probed == ["http://fast/stream", "http://slow/stream"]
+    # every probe is bounded by what was left of the overall deadline
+    assert all(0 < timeout <= 0.05 for timeout in timeouts)
+
+
+@patch("service.stream_metadata_service.shutil.which", return_value="/usr/bin/ffprobe")
+def test_get_metadata_many_does_not_start_probes_after_the_deadline(mock_which):
+    import time
+
+    service = StreamMetadataService()
+    # queued behind other probes until the batch deadline had passed
+    with patch.object(service, "_probe") as mock_probe:
+        metadata = service._get_metadata_by("http://late/stream", deadline=time.monotonic() - 0.1)
+
+    assert metadata.available is False
+    mock_probe.assert_not_called()
+
+
+@patch("service.stream_metadata_service.shutil.which", return_value="/usr/bin/ffprobe")
+def test_get_metadata_many_runs_at_most_max_parallel_probes(mock_which):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = StreamMetadataService(executor=ThreadPoolExecutor(max_workers=4))
+    lock = threading.Lock()
+    running = [0, 0]  # now, peak
+
+    def fake_probe(url, timeout_seconds):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+        return StreamMetadataDTO(available=True, current_track=url)
+
+    urls = [f"http://stream-{i}/live" for i in range(6)]
+    with patch.object(service, "_probe", side_effect=fake_probe):
+        results = service.get_metadata_many(urls, timeout_seconds=5, max_parallel=2)
+    service.executor.shutdown(wait=True)
+
+    assert sorted(results) == sorted(urls)
+    assert running[1] <= 2
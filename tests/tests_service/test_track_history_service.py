@@ -0,0 +1,111 @@
+"""
+Unit tests for TrackHistoryService (now-playing history per station).
+"""
+from datetime import datetime, timedelta
+
+from model.dto.stream_metadata import StreamMetadataDTO
+from model.dto.track_history import TrackHistoryDTO
+from model.entity.radio_source import RadioSource
+from model.entity.track_history import TrackHistory
+from model.repository.track_history_repository import TrackHistoryRepository
+from service.track_history_service import TrackHistoryBuffer, TrackHistoryService
+
+
+def _make_source(test_db) -> RadioSource:
+    source = RadioSource(stream_url=f'http://history.example/{datetime.now().timestamp()}', name='History FM', stream_type_id=1, is_secure=False)
+    test_db.add(source)
+    test_db.flush()
+    return source
+
+
+def _playing(title: str) -> StreamMetadataDTO:
+    return StreamMetadataDTO(available=True, current_track=title, genre='Jazz', bitrate=128000)
+
+
+def test_record_only_appends_track_changes(test_db):
+    source = _make_source(test_db)
+    service = TrackHistoryService(TrackHistoryRepository(test_db), buffer=TrackHistoryBuffer(batch_size=100))
+
+    assert service.record(source.id, _playing('Song A')) is True
+    assert service.record(source.id, _playing('Song A')) is False
+    assert service.record(source.id, _playing('Song B')) is True
+    assert service.record(source.id, StreamMetadataDTO(available=False, error_message='timeout')) is False
+
+    history = service.get_history(source.id)
+    assert [entry.title for entry in history] == ['Song A', 'Song B']
+    # nothing written yet: entries are still pending in the batch
+    assert test_db.query(TrackHistory).filter(TrackHistory.radio_source_id == source.id).count() == 0
+
+
+def test_flush_writes_batch_and_history_reads_it_back(test_db):
+    source = _make_source(test_db)
+    service = TrackHistoryService(TrackHistoryRepository(test_db), buffer=TrackHistoryBuffer(batch_size=2))
+
+    service.record(source.id, _playing('Song A'))
+    service.record(source.id, _playing('Song B'))  # reaches batch_size, flushed
+    service.record(source.id, _playing('Song C'))
+
+    assert test_db.query(TrackHistory).filter(TrackHistory.radio_source_id == source.id).count() == 2
+    assert [entry.title for entry in service.get_history(source.id)] == ['Song A', 'Song B', 'Song C']
+
+    assert service.flush() == 1
+    assert service.get_history(source.id, since=datetime.now() + timedelta(minutes=1)) == []
+
+
+def test_record_detects_repeat_of_persisted_track_after_restart(test_db):
+    source = _make_source(test_db)
+    repo = TrackHistoryRepository(test_db)
+    repo.save_batch([TrackHistory(radio_source_id=source.id, title='Song A', played_at=datetime.now())])
+
+    service = TrackHistoryService(repo, buffer=TrackHistoryBuffer())
+
+    assert service.record(source.id, _playing('Song A')) is False
+    assert service.record(source.id, _playing('Song B')) is True
+
+
+def test_history_since_returns_the_next_entries_after_it(test_db):
+    source = _make_source(test_db)
+    repo = TrackHistoryRepository(test_db)
+    start = datetime.now() - timedelta(hours=1)
+    repo.save_batch([TrackHistory(radio_source_id=source.id, title=f'Song {i}', played_at=start + timedelta(minutes=i))
+                     for i in range(5)])
+    service = TrackHistoryService(repo, buffer=TrackHistoryBuffer())
+
+    first = service.get_history(source.id, since=start - timedelta(minutes=1), limit=2)
+    second = service.get_history(source.id, since=first[-1].played_at, limit=2)
+
+    assert [entry.title for entry in first] == ['Song 0', 'Song 1']
+    assert [entry.title for entry in second] == ['Song 2', 'Song 3']
+    assert [entry.title for entry in service.get_history(source.id, limit=2)] == ['Song 3', 'Song 4']
+
+
+def test_background_flush_writes_pending_entries_without_new_tracks():
+    import time
+    from unittest.mock import MagicMock
+
+    session = MagicMock()
+    buffer = TrackHistoryBuffer(batch_size=100, flush_interval_seconds=0.01, session_factory=lambda: session)
+    service = TrackHistoryService(MagicMock(), buffer=buffer)
+    service.buffer.seed(TrackHistoryDTO(radio_source_id=1, title='Song A', played_at=datetime.now()))
+
+    assert service.record(1, _playing('Song B')) is True
+    deadline = time.monotonic() + 2
+    while not session.commit.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    buffer.stop()
+
+    assert [entry.title for entry in session.add_all.call_args.args[0]] == ['Song B']
+    assert session.close.called
+    assert buffer.pending(1) == []
+
+
+def test_stop_writes_what_is_still_pending():
+    from unittest.mock import MagicMock
+
+    session = MagicMock()
+    buffer = TrackHistoryBuffer(batch_size=100, flush_interval_seconds=3600, session_factory=lambda: session)
+    buffer.append(TrackHistoryDTO(radio_source_id=1, title='Song A', played_at=datetime.now()))
+
+    buffer.stop()
+
+    assert [entry.title for entry in session.add_all.call_args.args[0]] == ['Song A']